@@ -1,4 +1,5 @@
 from django.contrib.gis import admin
+from .aggregates import batched_signals
 from .models import FoodSpot, Review
 
 
@@ -7,10 +8,10 @@ class FoodSpotAdmin(admin.GISModelAdmin):
     """
     Admin interface for FoodSpot with map widget.
     """
-    list_display = ['name', 'cuisine_type', 'rating', 'price_range', 'address', 'is_active']
+    list_display = ['name', 'cuisine_type', 'rating', 'review_count', 'average_rating', 'price_range', 'address', 'is_active']
     list_filter = ['cuisine_type', 'rating', 'price_range', 'is_active']
     search_fields = ['name', 'address', 'description']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['review_count', 'average_rating', 'created_at', 'updated_at']
     
     fieldsets = (
         ('Basic Information', {
@@ -25,6 +26,9 @@ class FoodSpotAdmin(admin.GISModelAdmin):
         ('Details', {
             'fields': ('rating', 'price_range', 'opening_hours')
         }),
+        ('Reviews', {
+            'fields': ('review_count', 'average_rating')
+        }),
         ('Status', {
             'fields': ('is_active', 'created_at', 'updated_at')
         }),
@@ -35,6 +39,10 @@ class FoodSpotAdmin(admin.GISModelAdmin):
     default_lat = 53.349805
     default_zoom = 12
 
+    def delete_queryset(self, request, queryset):
+        with batched_signals():
+            super().delete_queryset(request, queryset)
+
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
@@ -61,4 +69,8 @@ class ReviewAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('foodspot')
\ No newline at end of file
+        return qs.select_related('foodspot')
+
+    def delete_queryset(self, request, queryset):
+        with batched_signals():
+            super().delete_queryset(request, queryset)
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class LocationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'foodspots.apps.locations'
\ No newline at end of file
+    name = 'foodspots.apps.locations'
+
+    def ready(self):
+        from . import signals  # noqa: F401
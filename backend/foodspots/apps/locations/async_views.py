@@ -0,0 +1,196 @@
+"""
+Async variants of the read-heavy spatial actions, mounted under /api/async/.
+
+DRF viewsets are synchronous, so these are plain Django async views with the
+same request and response formats as the FoodSpotViewSet actions. Served
+by an ASGI server (see README), each request's queries run through the
+async ORM off the event loop, so a slow polygon query no longer ties up a
+whole worker. Request bodies are parsed by the same helpers (params.py),
+and throttled by the viewset's throttle classes, rates and counters.
+"""
+import json
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.http import HttpResponse, HttpResponseNotAllowed
+
+from foodspots.db.timeouts import StatementTimeout
+
+from . import hours, params, projection, snapshot, spatial
+from .models import FoodSpot
+from .renderers import FastJSONRenderer
+from .views import FoodSpotViewSet
+
+logger = logging.getLogger(__name__)
+
+
+def _json(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def _throttled(request):
+    """
+    Run `request` past FoodSpotViewSet's throttles, as APIView.check_throttles
+    does. Returns (throttled, seconds to wait or None).
+    """
+    waits = [
+        throttle.wait()
+        for throttle in (throttle_class() for throttle_class in FoodSpotViewSet.throttle_classes)
+        if not throttle.allow_request(request, None)
+    ]
+    if not waits:
+        return False, None
+    return True, max((wait for wait in waits if wait is not None), default=None)
+
+
+def post_endpoint(view):
+    """Method check, throttling and JSON body parsing for an async POST view"""
+    @wraps(view)
+    async def wrapper(request):
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        # request.user (session lookup) and the throttle cache are sync-only
+        throttled, wait = await sync_to_async(_throttled)(request)
+        if throttled:
+            response = _json({'detail': 'Request was throttled.'}, status=429)
+            if wait is not None:
+                response['Retry-After'] = str(int(wait))
+            return response
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return _json({'error': 'Invalid JSON body'}, status=400)
+        if not isinstance(data, dict):
+            return _json({'error': 'Expected a JSON object'}, status=400)
+        return await view(request, data)
+    # Same as DRF's APIView for anonymous API clients (Django 4.2's csrf_exempt is sync-only)
+    wrapper.csrf_exempt = True
+    return wrapper
+
+
+@post_endpoint
+async def nearest(request, data):
+    """SPATIAL QUERY 1: Find nearest food spots"""
+    try:
+        lat, lng, limit, open_minute = params.nearest(data)
+    except hours.OpenAtError as e:
+        return _json({'error': str(e)}, status=400)
+    except (ValueError, TypeError) as e:
+        logger.error("Invalid parameters: %s", e)
+        return _json({'error': 'Invalid latitude or longitude'}, status=400)
+    try:
+        # The in-memory snapshot has no opening hours
+        if snapshot.enabled() and open_minute is None:
+            spatial_snapshot = await sync_to_async(snapshot.get_snapshot)()
+            return _json(spatial_snapshot.nearest(lat, lng, limit))
+        results = await projection.aspatial_results(
+            spatial.nearest(
+                hours.open_at(FoodSpot.objects.filter(is_active=True), open_minute),
+                Point(lng, lat, srid=4326),
+            ),
+            with_distance=True,
+            limit=limit,
+        )
+        return _json(results)
+    except Exception as e:
+        logger.error("Error in async nearest: %s", e)
+        return _json({'error': str(e)}, status=500)
+
+
+@post_endpoint
+async def nearest_batch(request, data):
+    """SPATIAL QUERY 1b: Nearest food spots for many origins in one request"""
+    try:
+        origins, parsed = params.nearest_batch(data)
+    except params.ParamError as e:
+        logger.error("Invalid parameters: %s", e)
+        return _json({'error': str(e)}, status=400)
+    try:
+        if snapshot.enabled():
+            spatial_snapshot = await sync_to_async(snapshot.get_snapshot)()
+            spots = [spatial_snapshot.nearest(*origin) for origin in parsed]
+        else:
+            rows = await sync_to_async(spatial.nearest_batch)(parsed)
+            spots = [
+                [projection.spatial_result(row, distance) for row, distance in origin_rows]
+                for origin_rows in rows
+            ]
+        results = [
+            {'key': origin.get('key', index), 'latitude': lat, 'longitude': lng, 'results': origin_spots}
+            for index, (origin, (lat, lng, _, _), origin_spots) in enumerate(zip(origins, parsed, spots))
+        ]
+        return _json({'results': results})
+    except Exception as e:
+        logger.error("Error in async nearest_batch: %s", e)
+        return _json({'error': str(e)}, status=500)
+
+
+@post_endpoint
+async def within_radius(request, data):
+    """SPATIAL QUERY 2: Find spots within radius"""
+    try:
+        lat, lng, radius, cuisine_type, open_minute = params.within_radius(data)
+    except hours.OpenAtError as e:
+        return _json({'error': str(e)}, status=400)
+    except (ValueError, TypeError) as e:
+        logger.error("Invalid parameters: %s", e)
+        return _json({'error': 'Invalid parameters'}, status=400)
+    try:
+        if snapshot.enabled() and open_minute is None:
+            spatial_snapshot = await sync_to_async(snapshot.get_snapshot)()
+            return _json(spatial_snapshot.within_radius(lat, lng, radius, cuisine_type))
+        queryset = FoodSpot.objects.filter(is_active=True)
+        if cuisine_type:
+            queryset = queryset.filter(cuisine_type=cuisine_type)
+        queryset = hours.open_at(queryset, open_minute)
+        results = await projection.aspatial_results(
+            spatial.within_radius(queryset, Point(lng, lat, srid=4326), radius),
+            with_distance=True,
+        )
+        return _json(results)
+    except Exception as e:
+        logger.error("Error in async within_radius: %s", e)
+        return _json({'error': str(e)}, status=500)
+
+
+@post_endpoint
+async def within_bounds(request, data):
+    """SPATIAL QUERY 3: Find spots within a drawn polygon or multipolygon"""
+    try:
+        area, _, open_minute = params.within_bounds(data)
+        rows = await sync_to_async(spatial.within_area)(area, settings.POLYGON_STATEMENT_TIMEOUT_MS, open_minute)
+        return _json([projection.spatial_result(row) for row in rows])
+    except StatementTimeout:
+        logger.warning("Async polygon search timed out after %s ms", settings.POLYGON_STATEMENT_TIMEOUT_MS)
+        return _json({'error': 'Search area too complex, draw a simpler or smaller area'}, status=400)
+    except Exception as e:
+        logger.error("Error in async within_bounds: %s", e)
+        return _json({'error': str(e)}, status=400)
+
+
+@post_endpoint
+async def along_route(request, data):
+    """SPATIAL QUERY 3b: Find spots along a route, in route order"""
+    try:
+        route, _, distance, cuisine_type, open_minute = params.along_route(data)
+    except ValueError as e:
+        return _json({'error': str(e)}, status=400)
+    try:
+        rows = await sync_to_async(spatial.along_route)(
+            route, distance, settings.ROUTE_STATEMENT_TIMEOUT_MS, cuisine_type, open_minute,
+        )
+        results = []
+        for row, along, offset in rows:
+            result = projection.spatial_result(row, offset)
+            result['along_meters'] = round(along, 2)
+            results.append(result)
+        return _json(results)
+    except StatementTimeout:
+        logger.warning("Async route search timed out after %s ms", settings.ROUTE_STATEMENT_TIMEOUT_MS)
+        return _json({'error': 'Route too long or complex, try a shorter route'}, status=400)
+    except Exception as e:
+        logger.error("Error in async along_route: %s", e)
+        return _json({'error': str(e)}, status=500)
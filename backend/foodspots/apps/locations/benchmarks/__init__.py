@@ -0,0 +1,20 @@
+"""
+Performance benchmarks for the locations app.
+
+Each suite module exposes `run(sizes, repeat, stdout)` and is registered in
+SUITES. Suites run inside a rolled-back transaction (see the `benchmark`
+management command), so synthetic data never reaches the real tables.
+"""
+from . import api, batch, log_overhead, polygons, reviews, routes, serialization, snapshot, spatial
+
+SUITES = {
+    'api': api,
+    'batch': batch,
+    'logging': log_overhead,
+    'polygons': polygons,
+    'reviews': reviews,
+    'routes': routes,
+    'serialization': serialization,
+    'snapshot': snapshot,
+    'spatial': spatial,
+}
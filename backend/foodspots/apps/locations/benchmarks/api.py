@@ -0,0 +1,238 @@
+"""
+Every FoodSpotViewSet and ReviewViewSet action through the full HTTP stack.
+
+At each size, synthetic spots (spread over `bbox`) and skewed reviews (see
+synthetic.populate_reviews) are loaded and each action is requested with
+the test Client. Every request is split into:
+
+- `query`: time spent executing SQL, plus the statement count
+- `serialization`: the rest of the view and response rendering, i.e.
+  building and encoding the response data
+- total: the whole request, middleware included
+
+FoodSpot `create` is not measured: FoodSpotListSerializer has no writable
+location, so the endpoint cannot create a spot.
+"""
+import json
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test import Client, override_settings
+
+from ..models import FoodSpot, Review
+from ..renderers import FastJSONRenderer
+from ..views import FoodSpotViewSet, ReviewViewSet
+from .synthetic import DUBLIN_BBOX, bbox_center, populate_reviews, populate_spots
+from .timing import summarize
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+REVIEWS_PER_SPOT = 3
+WARMUP = 2
+VIEWSETS = (FoodSpotViewSet, ReviewViewSet)
+
+
+class _Probe:
+    """Accumulates SQL time (as a connection execute wrapper) and view time"""
+
+    def __init__(self):
+        self.query_seconds = 0.0
+        self.queries = 0
+        self.view_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_seconds += time.perf_counter() - start
+            self.queries += 1
+
+    def timed(self, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.view_seconds += time.perf_counter() - start
+        return wrapper
+
+
+@contextmanager
+def _instrumented(probe):
+    # Rendering runs after dispatch returns, so both are timed
+    targets = [(viewset, 'dispatch') for viewset in VIEWSETS] + [(FastJSONRenderer, 'render')]
+    saved = [(owner, name, vars(owner).get(name)) for owner, name in targets]
+    for owner, name in targets:
+        setattr(owner, name, probe.timed(getattr(owner, name)))
+    try:
+        with connection.execute_wrapper(probe):
+            yield
+    finally:
+        for owner, name, original in saved:
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+
+
+def _send(client, probe, method, path, body):
+    if body is None:
+        response = client.generic(method, path)
+    else:
+        response = client.generic(method, path, json.dumps(body), content_type='application/json')
+    if response.streaming:
+        # Export bodies are produced while they are consumed
+        start = time.perf_counter()
+        content = b''.join(response.streaming_content)
+        probe.view_seconds += time.perf_counter() - start
+    else:
+        content = response.content
+    assert response.status_code < 400, f'{method} {path}: {response.status_code} {content[:200]!r}'
+
+
+def _measure(client, method, path, body, repeat):
+    """`path` may be a callable returning a fresh path per request"""
+    resolve = path if callable(path) else (lambda: path)
+    for _ in range(WARMUP):
+        _send(client, _Probe(), method, resolve(), body)
+    total, query, serialization, queries = [], [], [], 0
+    for _ in range(repeat):
+        probe = _Probe()
+        request_path = resolve()
+        with _instrumented(probe):
+            start = time.perf_counter()
+            _send(client, probe, method, request_path, body)
+            elapsed = time.perf_counter() - start
+        total.append(elapsed * 1000)
+        query.append(probe.query_seconds * 1000)
+        serialization.append(max(0.0, probe.view_seconds - probe.query_seconds) * 1000)
+        queries = probe.queries
+    query_stats = summarize(query)
+    serialization_stats = summarize(serialization)
+    return {
+        **summarize(total),
+        'query_median_ms': query_stats['median_ms'],
+        'query_p95_ms': query_stats['p95_ms'],
+        'serialization_median_ms': serialization_stats['median_ms'],
+        'serialization_p95_ms': serialization_stats['p95_ms'],
+        'queries': queries,
+    }
+
+
+def _disposable(model, count, bbox):
+    """Ids of `count` fresh rows for destroy requests (one per request)"""
+    if model is FoodSpot:
+        # In a corner of the box, away from the spatial queries' area
+        rows = [
+            FoodSpot(name=f'Disposable {i}', cuisine_type='other', address='Benchmark Street',
+                     location=Point(bbox[0], bbox[1], srid=4326))
+            for i in range(count)
+        ]
+    else:
+        spot = FoodSpot.objects.order_by('id').values_list('id', flat=True).first()
+        rows = [
+            Review(foodspot_id=spot, reviewer_name='Disposable', rating=4, comment='Benchmark')
+            for _ in range(count)
+        ]
+    return deque(obj.pk for obj in model.objects.bulk_create(rows))
+
+
+def _cases(bbox, repeat):
+    """(name, method, path, body) per action"""
+    rng = random.Random(0)
+    min_lng, min_lat, max_lng, max_lat = bbox
+    lng, lat = bbox_center(bbox)
+    width, height = max_lng - min_lng, max_lat - min_lat
+    # The most reviewed spot: worst case for the review feeds
+    popular = FoodSpot.objects.order_by('-review_count', 'id').values_list('id', flat=True).first()
+    review = Review.objects.filter(is_approved=True).order_by('id').values_list('id', flat=True).first()
+    spot_body = {
+        'name': 'Benchmark Spot', 'cuisine_type': 'italian', 'address': '1 Benchmark Street',
+        'rating': '4.0', 'price_range': '€€', 'description': 'Updated by the API benchmark',
+        'phone': '', 'opening_hours': '9:00 AM - 10:00 PM',
+    }
+    review_body = {'foodspot': popular, 'reviewer_name': 'Benchmark', 'rating': '4.5', 'comment': 'Great food'}
+    spots_to_delete = _disposable(FoodSpot, repeat + WARMUP, bbox)
+    reviews_to_delete = _disposable(Review, repeat + WARMUP, bbox)
+    # A quarter of the box around its centre
+    viewport = (lng - width / 8, lat - height / 8, lng + width / 8, lat + height / 8)
+    bounds = [
+        [viewport[1], viewport[0]], [viewport[1], viewport[2]],
+        [viewport[3], viewport[2]], [viewport[3], viewport[0]],
+    ]
+    origins = [
+        {'latitude': rng.uniform(min_lat, max_lat), 'longitude': rng.uniform(min_lng, max_lng), 'limit': 10}
+        for _ in range(10)
+    ]
+    bbox_param = ','.join(str(v) for v in viewport)
+    return [
+        ('foodspot/list', 'GET', '/api/foodspots/', None),
+        ('foodspot/retrieve', 'GET', f'/api/foodspots/{popular}/', None),
+        ('foodspot/update', 'PUT', f'/api/foodspots/{popular}/', spot_body),
+        ('foodspot/partial_update', 'PATCH', f'/api/foodspots/{popular}/', {'rating': '4.5'}),
+        ('foodspot/destroy', 'DELETE', lambda: f'/api/foodspots/{spots_to_delete.popleft()}/', None),
+        ('foodspot/categories', 'GET', '/api/foodspots/categories/', None),
+        ('foodspot/export/ndjson', 'GET', '/api/foodspots/export/?output=ndjson', None),
+        ('foodspot/export/geojson', 'GET', '/api/foodspots/export/?output=geojson', None),
+        ('foodspot/nearest', 'POST', '/api/foodspots/nearest/', {'latitude': lat, 'longitude': lng, 'limit': 10}),
+        ('foodspot/nearest_batch', 'POST', '/api/foodspots/nearest_batch/', {'origins': origins}),
+        ('foodspot/within_radius', 'POST', '/api/foodspots/within_radius/',
+         {'latitude': lat, 'longitude': lng, 'radius_meters': 1000}),
+        ('foodspot/within_bounds', 'POST', '/api/foodspots/within_bounds/', {'bounds': bounds}),
+        ('foodspot/clusters/z12', 'GET', f'/api/foodspots/clusters/?bbox={bbox_param}&zoom=12', None),
+        ('foodspot/clusters/z17', 'GET', f'/api/foodspots/clusters/?bbox={bbox_param}&zoom=17', None),
+        ('foodspot/heatmap/z12', 'GET', f'/api/foodspots/heatmap/?bbox={bbox_param}&zoom=12', None),
+        ('foodspot/heatmap/z15', 'GET', f'/api/foodspots/heatmap/?bbox={bbox_param}&zoom=15', None),
+        ('foodspot/search', 'GET', '/api/foodspots/search/?q=italian', None),
+        ('foodspot/search/nearby', 'GET', f'/api/foodspots/search/?q=italian&latitude={lat}&longitude={lng}', None),
+        ('foodspot/statistics', 'GET', '/api/foodspots/statistics/', None),
+        ('foodspot/statistics/breakdown', 'GET', '/api/foodspots/statistics/?breakdown=1', None),
+        ('foodspot/reviews/get', 'GET', f'/api/foodspots/{popular}/reviews/', None),
+        ('foodspot/reviews/post', 'POST', f'/api/foodspots/{popular}/reviews/', review_body),
+        ('review/list', 'GET', '/api/reviews/', None),
+        ('review/retrieve', 'GET', f'/api/reviews/{review}/', None),
+        ('review/create', 'POST', '/api/reviews/', review_body),
+        ('review/update', 'PUT', f'/api/reviews/{review}/', review_body),
+        ('review/partial_update', 'PATCH', f'/api/reviews/{review}/', {'rating': '3.5'}),
+        ('review/destroy', 'DELETE', lambda: f'/api/reviews/{reviews_to_delete.popleft()}/', None),
+        ('review/by_foodspot', 'GET', f'/api/reviews/by_foodspot/?foodspot_id={popular}', None),
+    ]
+
+
+def run(sizes=None, repeat=20, stdout=None, bbox=DUBLIN_BBOX, reviews_per_spot=REVIEWS_PER_SPOT):
+    sizes = sizes or DEFAULT_SIZES
+    client = Client()
+    results = []
+    loaded = 0
+    throttles = [(viewset, viewset.throttle_classes) for viewset in VIEWSETS]
+    for viewset in VIEWSETS:
+        viewset.throttle_classes = []
+    try:
+        # Synthetic rows exist only in this transaction, so never read from replicas
+        with override_settings(ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False, DATABASE_REPLICAS=[]):
+            for size in sorted(sizes):
+                populate_spots(size - loaded, bbox=bbox, start=loaded)
+                populate_reviews((size - loaded) * reviews_per_spot, start=loaded * reviews_per_spot)
+                loaded = size
+                for name, method, path, body in _cases(bbox, repeat):
+                    stats = _measure(client, method, path, body, repeat)
+                    results.append({
+                        'suite': 'api', 'action': name, 'size': size,
+                        'reviews': size * reviews_per_spot, **stats,
+                    })
+                    if stdout:
+                        stdout.write(
+                            f"{size:>9} {name:<30} total {stats['median_ms']:>9.3f} ms"
+                            f"  query {stats['query_median_ms']:>9.3f} ms ({stats['queries']})"
+                            f"  serialization {stats['serialization_median_ms']:>9.3f} ms"
+                        )
+    finally:
+        for viewset, classes in throttles:
+            viewset.throttle_classes = classes
+    return results
@@ -0,0 +1,102 @@
+"""
+Batch multi-origin nearest versus one `nearest` call per origin.
+
+Measured at two levels: `query` compares N sequential KNN queries with the
+single LATERAL query behind `nearest_batch`; `http` compares N POSTs to
+/api/foodspots/nearest/ with one POST to /api/foodspots/nearest_batch/
+through the full middleware and DRF stack (throttling disabled).
+"""
+import json
+import random
+
+from django.contrib.gis.geos import Point
+from django.test import Client, override_settings
+
+from .. import projection, spatial
+from ..models import FoodSpot
+from ..views import FoodSpotViewSet
+from .synthetic import DUBLIN_BBOX, populate_spots
+from .timing import measure
+
+DEFAULT_SIZES = [10_000, 100_000]
+ORIGIN_COUNTS = [1, 10, 50]
+NEAREST_LIMIT = 10
+
+
+def _origins(count, seed=0):
+    rng = random.Random(seed)
+    min_lng, min_lat, max_lng, max_lat = DUBLIN_BBOX
+    return [
+        (rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng), NEAREST_LIMIT, None)
+        for _ in range(count)
+    ]
+
+
+def _sequential_queries(origins):
+    queryset = FoodSpot.objects.filter(is_active=True)
+    return [
+        projection.spatial_results(
+            spatial.nearest(queryset, Point(lng, lat, srid=4326)), with_distance=True, limit=limit
+        )
+        for lat, lng, limit, _ in origins
+    ]
+
+
+def _batch_query(origins):
+    return [
+        [projection.spatial_result(row, distance) for row, distance in rows]
+        for rows in spatial.nearest_batch(origins)
+    ]
+
+
+def _sequential_http(client, origins):
+    for lat, lng, limit, _ in origins:
+        response = client.post(
+            '/api/foodspots/nearest/',
+            json.dumps({'latitude': lat, 'longitude': lng, 'limit': limit}),
+            content_type='application/json',
+        )
+        assert response.status_code == 200, response.content
+
+
+def _batch_http(client, origins):
+    body = {'origins': [{'latitude': lat, 'longitude': lng, 'limit': limit} for lat, lng, limit, _ in origins]}
+    response = client.post(
+        '/api/foodspots/nearest_batch/', json.dumps(body), content_type='application/json'
+    )
+    assert response.status_code == 200, response.content
+
+
+def run(sizes=None, repeat=20, stdout=None):
+    sizes = sizes or DEFAULT_SIZES
+    client = Client()
+    results = []
+    loaded = 0
+    throttle_classes = FoodSpotViewSet.throttle_classes
+    FoodSpotViewSet.throttle_classes = []
+    try:
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for size in sorted(sizes):
+                populate_spots(size - loaded, start=loaded)
+                loaded = size
+                for count in ORIGIN_COUNTS:
+                    origins = _origins(count)
+                    variants = {
+                        'query/sequential': lambda: _sequential_queries(origins),
+                        'query/batch': lambda: _batch_query(origins),
+                        'http/sequential': lambda: _sequential_http(client, origins),
+                        'http/batch': lambda: _batch_http(client, origins),
+                    }
+                    for name, variant in variants.items():
+                        stats = measure(variant, repeat=repeat)
+                        results.append({
+                            'suite': 'batch', 'variant': name, 'size': size, 'origins': count, **stats,
+                        })
+                        if stdout:
+                            stdout.write(
+                                f"{size:>9} {count:>3} origins {name:<18} median {stats['median_ms']:>9.3f} ms"
+                                f"  p95 {stats['p95_ms']:>9.3f} ms"
+                            )
+    finally:
+        FoodSpotViewSet.throttle_classes = throttle_classes
+    return results
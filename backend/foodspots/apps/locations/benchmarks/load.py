@@ -0,0 +1,78 @@
+"""
+HTTP load generator for comparing deployments (e.g. gunicorn sync workers
+versus an ASGI server running the async views).
+
+Unlike the suites in SUITES this talks to already running servers over the
+network and does not create data; load spots first (see load_initial_data).
+Each request is sent from a client thread on a fresh connection, so both
+targets pay the same client-side overhead.
+"""
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .synthetic import DUBLIN_BBOX
+from .timing import summarize
+
+ACTIONS = ('nearest', 'nearest_batch', 'within_radius', 'within_bounds')
+
+
+def _payload(action, rng, bbox):
+    min_lng, min_lat, max_lng, max_lat = bbox
+    lat, lng = rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)
+    if action == 'nearest':
+        return {'latitude': lat, 'longitude': lng, 'limit': 10}
+    if action == 'nearest_batch':
+        return {'origins': [
+            {'latitude': rng.uniform(min_lat, max_lat), 'longitude': rng.uniform(min_lng, max_lng)}
+            for _ in range(10)
+        ]}
+    if action == 'within_radius':
+        return {'latitude': lat, 'longitude': lng, 'radius_meters': 1000}
+    # A ~2 km square, as [lat, lng] corners like the frontend sends
+    d = 0.01
+    return {'bounds': [[lat - d, lng - d], [lat - d, lng + d], [lat + d, lng + d], [lat + d, lng - d]]}
+
+
+def _send(url, body, timeout):
+    request = urllib.request.Request(
+        url, data=body, headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError as e:
+        status = type(e).__name__
+    return (time.perf_counter() - start) * 1000, status
+
+
+def run_load(url, action, concurrency, requests, timeout=30, bbox=DUBLIN_BBOX, seed=0):
+    """POST `requests` randomized `action` payloads to `url`, `concurrency` at a time"""
+    rng = random.Random(seed)
+    bodies = [json.dumps(_payload(action, rng, bbox)).encode() for _ in range(requests)]
+    samples = []
+    errors = Counter()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed_ms, status in pool.map(lambda body: _send(url, body, timeout), bodies):
+            samples.append(elapsed_ms)
+            if status != 200:
+                errors[str(status)] += 1
+    wall = time.perf_counter() - started
+    return {
+        'url': url,
+        'action': action,
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': dict(errors),
+        'throughput_rps': round(requests / wall, 1) if wall else None,
+        **summarize(samples),
+    }
@@ -0,0 +1,110 @@
+"""
+Request-thread cost of the hot-path log lines, before and after the
+background logging pipeline.
+
+Each simulated request logs the three INFO lines of a `nearest` call.
+`sync/fstring` is the old setup: f-string messages, written synchronously
+to a FileHandler and a StreamHandler. `queued/lazy` puts the same handlers
+behind a BackgroundHandler and uses %-style arguments, and
+`queued/sampled` also keeps only 10% of the INFO records. The `disabled/*`
+variants log below the logger's level, where lazy arguments cost nothing.
+Queues are drained between timed runs, so no record is dropped.
+"""
+import logging
+import os
+import tempfile
+import time
+
+from foodspots.instrumentation.log_pipeline import BackgroundHandler, SamplingFilter
+
+from .timing import summarize
+
+DEFAULT_SIZES = [1_000]
+FORMAT = '[{levelname}] {asctime} {module} {message}'
+
+
+def _targets(directory):
+    formatter = logging.Formatter(FORMAT, style='{')
+    file_handler = logging.FileHandler(os.path.join(directory, 'benchmark.log'))
+    # Console output goes nowhere, but through the same code path
+    stream_handler = logging.StreamHandler(open(os.devnull, 'w'))
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    return [file_handler, stream_handler]
+
+
+def _logger(name, handlers, level=logging.INFO):
+    # Not registered with the logging manager, so the app's configuration is untouched
+    logger = logging.Logger(f'foodspots.benchmark.{name}', level)
+    logger.propagate = False
+    for handler in handlers:
+        logger.addHandler(handler)
+    return logger
+
+
+def _fstring_request(logger, i):
+    lat, lng, limit = 53.3498 + i * 1e-6, -6.2603, 10
+    logger.info(f"Finding nearest {limit} spots to ({lat}, {lng})")
+    logger.info(f"Found {limit} nearest spots")
+    logger.debug(f"Nearest ids: {list(range(limit))}")
+
+
+def _lazy_request(logger, i):
+    lat, lng, limit = 53.3498 + i * 1e-6, -6.2603, 10
+    logger.info("Finding nearest %s spots to (%s, %s)", limit, lat, lng)
+    logger.info("Found %s nearest spots", limit)
+    logger.debug("Nearest ids: %s", list(range(limit)))
+
+
+def _measure(batch, repeat, background, warmup=2):
+    samples = []
+    for i in range(warmup + repeat):
+        start = time.perf_counter()
+        batch()
+        elapsed = (time.perf_counter() - start) * 1000
+        # Drain between runs, untimed, so the queue never fills and drops records
+        if background is not None:
+            background.flush()
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+
+def run(sizes=None, repeat=20, stdout=None):
+    sizes = sizes or DEFAULT_SIZES
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        sync_targets = _targets(directory)
+        queued = BackgroundHandler(_targets(directory))
+        sampled = BackgroundHandler(_targets(directory))
+        sampled.addFilter(SamplingFilter({'foodspots.benchmark': 0.1}))
+        variants = {
+            'sync/fstring': (_logger('sync', sync_targets), _fstring_request, None),
+            'queued/lazy': (_logger('queued', [queued]), _lazy_request, queued),
+            'queued/sampled': (_logger('sampled', [sampled]), _lazy_request, sampled),
+            'disabled/fstring': (_logger('off', sync_targets, logging.WARNING), _fstring_request, None),
+            'disabled/lazy': (_logger('off', sync_targets, logging.WARNING), _lazy_request, None),
+        }
+        try:
+            for requests in sorted(sizes):
+                for name, (logger, request, background) in variants.items():
+                    def batch():
+                        for i in range(requests):
+                            request(logger, i)
+                    stats = _measure(batch, repeat, background)
+                    per_request_us = round(stats['median_ms'] * 1000 / requests, 3)
+                    results.append({
+                        'suite': 'logging', 'variant': name, 'size': requests,
+                        'median_us_per_request': per_request_us, **stats,
+                    })
+                    if stdout:
+                        stdout.write(
+                            f"{requests:>7} requests {name:<18} median {stats['median_ms']:>9.3f} ms"
+                            f"  per request {per_request_us:>8.3f} µs"
+                        )
+        finally:
+            for handler in (queued, sampled):
+                handler.close()
+            for handler in sync_targets + queued.targets + sampled.targets:
+                handler.close()
+    return results
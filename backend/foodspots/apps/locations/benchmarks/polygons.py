@@ -0,0 +1,87 @@
+"""
+Polygon search latency by vertex count.
+
+Each area is a jagged star around the centre of the synthetic data: a
+ring of 10, 1k or 10k vertices, plus a two-part multipolygon with a hole.
+`legacy` is the original `location__within` query on the raw drawing,
+`hardened` is polygons.prepare + spatial.within_area (validation,
+simplification, subdivided && prefilter, statement timeout). Rows report
+the match count of each variant, since simplification may move the edge.
+"""
+import math
+
+from django.conf import settings
+from django.contrib.gis.geos import MultiPolygon, Polygon
+
+from .. import polygons, projection, spatial
+from ..models import FoodSpot
+from .synthetic import DUBLIN_BBOX, bbox_center, populate_spots
+from .timing import measure
+
+DEFAULT_SIZES = [100_000]
+VERTICES = [10, 1_000, 10_000]
+
+
+def _star(center, radius, vertices, spikes=0.3):
+    """Closed ring with `vertices` points alternating between two radii"""
+    lng, lat = center
+    ring = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        r = radius * (1 - spikes if i % 2 else 1)
+        ring.append((lng + r * math.cos(angle), lat + r * math.sin(angle) * 0.6))
+    ring.append(ring[0])
+    return ring
+
+
+def _areas(bbox):
+    center = bbox_center(bbox)
+    radius = (bbox[2] - bbox[0]) / 4
+    areas = {
+        f'polygon/{n}': Polygon(_star(center, radius, n), srid=4326)
+        for n in VERTICES
+    }
+    east = (center[0] + radius * 1.5, center[1])
+    west = (center[0] - radius * 1.5, center[1])
+    areas['multipolygon/holes'] = MultiPolygon(
+        Polygon(_star(east, radius / 2, 1_000), _star(east, radius / 6, 100)[::-1], srid=4326),
+        Polygon(_star(west, radius / 2, 1_000), srid=4326),
+        srid=4326,
+    )
+    return areas
+
+
+def _legacy(area):
+    return projection.spatial_results(FoodSpot.objects.filter(is_active=True, location__within=area))
+
+
+def _hardened(area):
+    prepared, _ = polygons.prepare(area)
+    return spatial.within_area(prepared, settings.POLYGON_STATEMENT_TIMEOUT_MS)
+
+
+def run(sizes=None, repeat=20, stdout=None):
+    sizes = sizes or DEFAULT_SIZES
+    areas = _areas(DUBLIN_BBOX)
+    results = []
+    loaded = 0
+    for size in sorted(sizes):
+        populate_spots(size - loaded, start=loaded)
+        loaded = size
+        for name, area in areas.items():
+            for variant, query in (('legacy', _legacy), ('hardened', _hardened)):
+                if variant == 'legacy' and area.geom_type == 'MultiPolygon':
+                    # The original endpoint only took one ring
+                    continue
+                matches = len(query(area))
+                stats = measure(lambda: query(area), repeat=repeat)
+                results.append({
+                    'suite': 'polygons', 'query': f'{name}/{variant}', 'size': size,
+                    'vertices': area.num_coords, 'matches': matches, **stats,
+                })
+                if stdout:
+                    stdout.write(
+                        f"{size:>9} {name + '/' + variant:<30} median {stats['median_ms']:>9.3f} ms"
+                        f"  p95 {stats['p95_ms']:>9.3f} ms  {matches:>7} matches"
+                    )
+    return results
@@ -0,0 +1,68 @@
+"""
+Result files and regression checks.
+
+A result file holds the suite's rows plus enough context (commit, database
+and library versions) to tell two runs apart. `compare` matches rows from
+two files by their non-timing fields and flags those whose median got
+slower by more than a threshold.
+"""
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from django.db import connection
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def metadata(suite, sizes, repeat, **options):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT version(), PostGIS_Lib_Version()')
+        postgres, postgis = cursor.fetchone()
+    return {
+        'suite': suite,
+        'sizes': sizes,
+        'repeat': repeat,
+        'options': options,
+        'commit': _git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'postgres': postgres,
+        'postgis': postgis,
+    }
+
+
+def _key(row):
+    # Timings and counts vary between runs; everything else names the measurement
+    return tuple(sorted(
+        (name, value) for name, value in row.items()
+        if not name.endswith(('_ms', '_per_1k')) and name != 'queries'
+    ))
+
+
+def compare(baseline, results, threshold=1.2, metric='median_ms'):
+    """
+    Rows of `results` (a list) matched against `baseline` (a list, or a
+    result file dict). Returns a list of (row, baseline value, current
+    value, ratio, regressed) for every row present in both.
+    """
+    if isinstance(baseline, dict):
+        baseline = baseline['results']
+    previous = {_key(row): row for row in baseline}
+    rows = []
+    for row in results:
+        before = previous.get(_key(row))
+        if before is None or metric not in row or not before.get(metric):
+            continue
+        ratio = row[metric] / before[metric]
+        rows.append((row, before[metric], row[metric], round(ratio, 3), ratio > threshold))
+    return rows
@@ -0,0 +1,69 @@
+"""
+Bulk review upload versus one review at a time.
+
+`per_review` saves each review through the ORM, as one POST per review
+did: every save fires the Review signals, which refresh its spot's
+aggregates and bump the data versions. `bulk` is bulk_reviews.ingest:
+one validation pass, bulk_create and one aggregate refresh per touched
+spot. Batches spread over SPOTS_PER_BATCH spots, like a partner export.
+"""
+import random
+
+from .. import bulk_reviews
+from ..models import FoodSpot, Review
+from ..serializers import ReviewBulkItemSerializer
+from .synthetic import populate_spots
+from .timing import measure
+
+DEFAULT_SIZES = [10_000]
+BATCH_SIZES = [100, 1_000]
+SPOTS_PER_BATCH = 50
+
+
+def _items(spot_ids, count, rng):
+    spots = rng.sample(spot_ids, min(SPOTS_PER_BATCH, len(spot_ids)))
+    return [
+        {
+            'foodspot': rng.choice(spots),
+            'reviewer_name': f'Benchmark reviewer {i}',
+            'rating': str(rng.randint(10, 50) / 10),
+            'comment': 'Imported review',
+        }
+        for i in range(count)
+    ]
+
+
+def _per_review(items):
+    for item in items:
+        serializer = ReviewBulkItemSerializer(data=item)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        Review.objects.create(foodspot_id=data.pop('foodspot'), is_approved=True, **data)
+
+
+def _bulk(items):
+    bulk_reviews.ingest(items)
+
+
+def run(sizes=None, repeat=20, stdout=None):
+    sizes = sizes or DEFAULT_SIZES
+    rng = random.Random(0)
+    results = []
+    loaded = 0
+    for size in sorted(sizes):
+        populate_spots(size - loaded, start=loaded)
+        loaded = size
+        spot_ids = list(FoodSpot.objects.values_list('pk', flat=True))
+        for count in BATCH_SIZES:
+            for variant, upload in (('per_review', _per_review), ('bulk', _bulk)):
+                stats = measure(lambda: upload(_items(spot_ids, count, rng)), repeat=repeat)
+                results.append({
+                    'suite': 'reviews', 'query': f'{count} reviews/{variant}', 'size': size,
+                    'reviews': count, **stats,
+                })
+                if stdout:
+                    stdout.write(
+                        f"{size:>9} {f'{count} reviews/{variant}':<30} median {stats['median_ms']:>9.3f} ms"
+                        f"  p95 {stats['p95_ms']:>9.3f} ms"
+                    )
+    return results
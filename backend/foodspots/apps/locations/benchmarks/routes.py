@@ -0,0 +1,90 @@
+"""
+Corridor search along a route.
+
+The route is a zigzag walk across the synthetic data, 2, 10 or 40 km long
+with a vertex every 50 m. `radius_calls` is what clients did before
+along_route: one within_radius query per RADIUS_STEP_METERS of route,
+merged by id. `along_route` is spatial.along_route on the route after
+routes.prepare. Rows report the match count of each variant; the radius
+calls cover a slightly different (scalloped) corridor.
+"""
+import math
+
+from django.conf import settings
+from django.contrib.gis.geos import LineString, Point
+
+from .. import projection, routes, spatial
+from ..models import FoodSpot
+from .synthetic import DUBLIN_BBOX, bbox_center, populate_spots
+from .timing import measure
+
+DEFAULT_SIZES = [100_000]
+LENGTHS_KM = [2, 10, 40]
+DISTANCE_METERS = 200
+VERTEX_SPACING_METERS = 50
+RADIUS_STEP_METERS = 200
+
+# Degrees of latitude per meter
+_LAT_DEGREES = 1 / 111_320
+
+
+def _route(bbox, length_km):
+    """Zigzag (lng, lat) path of `length_km` bouncing inside `bbox`"""
+    lng, lat = bbox_center(bbox)
+    lng_degrees = _LAT_DEGREES / math.cos(math.radians(lat))
+    heading = math.radians(35)
+    positions = [(lng, lat)]
+    for _ in range(int(length_km * 1000 / VERTEX_SPACING_METERS)):
+        next_lng = lng + math.cos(heading) * VERTEX_SPACING_METERS * lng_degrees
+        next_lat = lat + math.sin(heading) * VERTEX_SPACING_METERS * _LAT_DEGREES
+        if not bbox[0] <= next_lng <= bbox[2]:
+            heading = math.pi - heading
+            continue
+        if not bbox[1] <= next_lat <= bbox[3]:
+            heading = -heading
+            continue
+        lng, lat = next_lng, next_lat
+        positions.append((lng, lat))
+    return positions
+
+
+def _radius_calls(positions):
+    step = max(1, RADIUS_STEP_METERS // VERTEX_SPACING_METERS)
+    found = {}
+    for lng, lat in positions[::step]:
+        rows = projection.spatial_results(
+            spatial.within_radius(FoodSpot.objects.filter(is_active=True), Point(lng, lat, srid=4326), DISTANCE_METERS),
+            with_distance=True,
+        )
+        for row in rows:
+            found.setdefault(row['id'], row)
+    return list(found.values())
+
+
+def _along_route(positions):
+    route, _ = routes.prepare(LineString(positions, srid=4326))
+    return spatial.along_route(route, DISTANCE_METERS, settings.ROUTE_STATEMENT_TIMEOUT_MS)
+
+
+def run(sizes=None, repeat=20, stdout=None):
+    sizes = sizes or DEFAULT_SIZES
+    paths = {f'route/{km}km': _route(DUBLIN_BBOX, km) for km in LENGTHS_KM}
+    results = []
+    loaded = 0
+    for size in sorted(sizes):
+        populate_spots(size - loaded, start=loaded)
+        loaded = size
+        for name, positions in paths.items():
+            for variant, query in (('radius_calls', _radius_calls), ('along_route', _along_route)):
+                matches = len(query(positions))
+                stats = measure(lambda: query(positions), repeat=repeat)
+                results.append({
+                    'suite': 'routes', 'query': f'{name}/{variant}', 'size': size,
+                    'vertices': len(positions), 'matches': matches, **stats,
+                })
+                if stdout:
+                    stdout.write(
+                        f"{size:>9} {name + '/' + variant:<30} median {stats['median_ms']:>9.3f} ms"
+                        f"  p95 {stats['p95_ms']:>9.3f} ms  {matches:>7} matches"
+                    )
+    return results
@@ -0,0 +1,88 @@
+"""
+Serialization cost per 1k rows, before and after the projection fast path.
+
+`legacy` variants load model instances and build response dicts the way the
+views used to (per-row `get_cuisine_type_display()`, GEOS coordinates,
+`float(Decimal)`, SerializerMethodFields) and render with the stdlib-backed
+JSONRenderer. `projection` variants use `locations.projection` and the
+orjson-backed FastJSONRenderer. Every variant includes fetch, build and
+render, since the projection also changes what is fetched.
+"""
+from rest_framework.renderers import JSONRenderer
+
+from .. import projection
+from ..models import FoodSpot
+from ..renderers import FastJSONRenderer
+from ..serializers import FoodSpotListSerializer
+from .synthetic import populate_spots
+from .timing import measure
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000]
+
+
+def _legacy_spatial(queryset):
+    results = []
+    for spot in queryset:
+        results.append({
+            'id': spot.id,
+            'name': spot.name,
+            'cuisine_type': spot.cuisine_type,
+            'cuisine_display': spot.get_cuisine_type_display(),
+            'description': spot.description,
+            'address': spot.address,
+            'phone': spot.phone,
+            'rating': float(spot.rating),
+            'price_range': spot.price_range,
+            'opening_hours': spot.opening_hours,
+            'latitude': spot.location.y,
+            'longitude': spot.location.x,
+            'review_count': spot.review_count,
+            'average_rating': float(spot.average_rating) if spot.average_rating else float(spot.rating)
+        })
+    return JSONRenderer().render(results)
+
+
+def _projection_spatial(queryset):
+    return FastJSONRenderer().render(projection.spatial_results(queryset))
+
+
+def _legacy_list(queryset):
+    return JSONRenderer().render(FoodSpotListSerializer(queryset, many=True).data)
+
+
+def _projection_list(queryset):
+    return FastJSONRenderer().render(
+        projection.list_results(projection.list_values(queryset))
+    )
+
+
+VARIANTS = {
+    'spatial/legacy': _legacy_spatial,
+    'spatial/projection': _projection_spatial,
+    'list/legacy': _legacy_list,
+    'list/projection': _projection_list,
+}
+
+
+def run(sizes=None, repeat=20, stdout=None):
+    sizes = sizes or DEFAULT_SIZES
+    results = []
+    loaded = 0
+    for size in sorted(sizes):
+        populate_spots(size - loaded, start=loaded)
+        loaded = size
+        queryset = FoodSpot.objects.filter(is_active=True).order_by('id')
+        for name, variant in VARIANTS.items():
+            # A fresh queryset each call, so nothing is served from its result cache
+            stats = measure(lambda: variant(queryset.all()), repeat=repeat)
+            per_1k = round(stats['median_ms'] * 1000 / size, 3)
+            results.append({
+                'suite': 'serialization', 'variant': name, 'size': size,
+                'median_ms_per_1k': per_1k, **stats,
+            })
+            if stdout:
+                stdout.write(
+                    f"{size:>9} {name:<20} median {stats['median_ms']:>9.3f} ms"
+                    f"  per 1k rows {per_1k:>8.3f} ms"
+                )
+    return results
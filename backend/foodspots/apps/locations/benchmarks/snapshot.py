@@ -0,0 +1,97 @@
+"""
+In-memory snapshot engine versus the PostGIS path.
+
+Besides timing both engines, every sampled query is checked for parity:
+the same spot ids in the same order, with distances agreeing to the
+centimetre. Any mismatch aborts the run.
+"""
+import random
+
+from django.contrib.gis.geos import Point
+
+from .. import spatial
+from ..models import FoodSpot
+from ..snapshot import SpatialSnapshot
+from .synthetic import DUBLIN_BBOX, populate_spots
+from .timing import measure
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+PARITY_SAMPLES = 50
+RADIUS_METERS = 750
+NEAREST_LIMIT = 10
+
+
+def _random_origin(rng):
+    min_lng, min_lat, max_lng, max_lat = DUBLIN_BBOX
+    return rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)
+
+
+def _postgis_nearest(lat, lng):
+    spots = spatial.nearest(
+        FoodSpot.objects.filter(is_active=True), Point(lng, lat, srid=4326)
+    )[:NEAREST_LIMIT]
+    return [(spot.id, round(spot.distance, 2)) for spot in spots]
+
+
+def _postgis_radius(lat, lng):
+    spots = spatial.within_radius(
+        FoodSpot.objects.filter(is_active=True), Point(lng, lat, srid=4326), RADIUS_METERS
+    )
+    return [(spot.id, round(spot.distance, 2)) for spot in spots]
+
+
+def _assert_parity(name, expected, actual):
+    expected_ids = [pk for pk, _ in expected]
+    actual_ids = [pk for pk, _ in actual]
+    if expected_ids != actual_ids:
+        # Equidistant spots may legitimately swap places
+        same_set = sorted(expected_ids) == sorted(actual_ids)
+        ties_only = same_set and all(
+            abs(e[1] - a[1]) <= 0.01 for e, a in zip(expected, actual)
+        )
+        if not ties_only:
+            raise AssertionError(f'{name}: result ids differ: {expected_ids} != {actual_ids}')
+    for (pk, expected_m), (_, actual_m) in zip(sorted(expected), sorted(actual)):
+        if abs(expected_m - actual_m) > 0.01:
+            raise AssertionError(f'{name}: distance for spot {pk} differs: {expected_m} != {actual_m}')
+
+
+def run(sizes=None, repeat=20, stdout=None):
+    sizes = sizes or DEFAULT_SIZES
+    rng = random.Random(42)
+    results = []
+    loaded = 0
+    for size in sorted(sizes):
+        populate_spots(size - loaded, start=loaded)
+        loaded = size
+        engine = SpatialSnapshot.load()
+
+        origins = [_random_origin(rng) for _ in range(PARITY_SAMPLES)]
+        for lat, lng in origins:
+            _assert_parity(
+                'nearest', _postgis_nearest(lat, lng),
+                [(r['id'], r['distance_meters']) for r in engine.nearest(lat, lng, NEAREST_LIMIT)],
+            )
+            _assert_parity(
+                'within_radius', _postgis_radius(lat, lng),
+                [(r['id'], r['distance_meters']) for r in engine.within_radius(lat, lng, RADIUS_METERS)],
+            )
+        if stdout:
+            stdout.write(f'{size:>9} parity OK over {PARITY_SAMPLES} origins')
+
+        lat, lng = origins[0]
+        queries = {
+            'nearest/postgis': lambda: _postgis_nearest(lat, lng),
+            'nearest/memory': lambda: engine.nearest(lat, lng, NEAREST_LIMIT),
+            'within_radius/postgis': lambda: _postgis_radius(lat, lng),
+            'within_radius/memory': lambda: engine.within_radius(lat, lng, RADIUS_METERS),
+        }
+        for name, query in queries.items():
+            stats = measure(query, repeat=repeat)
+            results.append({'suite': 'snapshot', 'query': name, 'size': size, **stats})
+            if stdout:
+                stdout.write(
+                    f"{size:>9} {name:<24} median {stats['median_ms']:>9.3f} ms"
+                    f"  p95 {stats['p95_ms']:>9.3f} ms"
+                )
+    return results
@@ -0,0 +1,70 @@
+"""
+Radius and nearest-neighbour latency as the table grows.
+
+Compares the original full-scan queries (Distance annotation + filter/sort on
+every row) with the index-backed helpers in `locations.spatial`. The indexed
+variants should stay flat from 1k to 1M spots.
+"""
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+
+from .. import spatial
+from ..models import FoodSpot
+from .synthetic import bbox_center, populate_spots
+from .timing import measure
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RADIUS_METERS = 500
+NEAREST_LIMIT = 10
+
+
+def _legacy_nearest(point):
+    return list(
+        FoodSpot.objects.filter(is_active=True).annotate(
+            distance=Distance('location', point)
+        ).order_by('distance')[:NEAREST_LIMIT]
+    )
+
+
+def _legacy_radius(point):
+    return list(
+        FoodSpot.objects.filter(is_active=True).annotate(
+            distance=Distance('location', point)
+        ).filter(distance__lte=D(m=RADIUS_METERS)).order_by('distance')
+    )
+
+
+def _indexed_nearest(point):
+    return list(spatial.nearest(FoodSpot.objects.filter(is_active=True), point)[:NEAREST_LIMIT])
+
+
+def _indexed_radius(point):
+    return list(spatial.within_radius(FoodSpot.objects.filter(is_active=True), point, RADIUS_METERS))
+
+
+QUERIES = {
+    'nearest/legacy': _legacy_nearest,
+    'nearest/indexed': _indexed_nearest,
+    'within_radius/legacy': _legacy_radius,
+    'within_radius/indexed': _indexed_radius,
+}
+
+
+def run(sizes=None, repeat=20, stdout=None):
+    sizes = sizes or DEFAULT_SIZES
+    point = Point(*bbox_center(), srid=4326)
+    results = []
+    loaded = 0
+    for size in sorted(sizes):
+        populate_spots(size - loaded, start=loaded)
+        loaded = size
+        for name, query in QUERIES.items():
+            stats = measure(lambda: query(point), repeat=repeat)
+            results.append({'suite': 'spatial', 'query': name, 'size': size, **stats})
+            if stdout:
+                stdout.write(
+                    f"{size:>9} {name:<24} median {stats['median_ms']:>9.3f} ms"
+                    f"  p95 {stats['p95_ms']:>9.3f} ms"
+                )
+    return results
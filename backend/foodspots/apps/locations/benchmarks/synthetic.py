@@ -0,0 +1,136 @@
+"""
+Deterministic synthetic data for benchmarks.
+"""
+from django.db import connection
+
+from ..hours import parse_opening_hours, to_multirange
+from ..models import FoodSpot, Review
+
+SYNTHETIC_HOURS = '9:00 AM - 10:00 PM'
+
+# (min_lng, min_lat, max_lng, max_lat) around Dublin city centre
+DUBLIN_BBOX = (-6.45, 53.25, -6.05, 53.45)
+
+
+def populate_spots(count, bbox=DUBLIN_BBOX, start=0):
+    """
+    Insert `count` active FoodSpots uniformly spread over `bbox`, numbered
+    from `start`. Rows are generated server-side with generate_series, so a
+    million spots load in seconds rather than through the ORM. The random
+    seed is derived from `start`, so repeated runs produce identical data.
+    """
+    min_lng, min_lat, max_lng, max_lat = bbox
+    cuisines = [c[0] for c in FoodSpot.CUISINE_CHOICES]
+    prices = [p[0] for p in FoodSpot.PRICE_CHOICES]
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT setseed(%s)', [(start % 997) / 997])
+        cursor.execute(
+            f"""
+            INSERT INTO {FoodSpot._meta.db_table}
+                (name, cuisine_type, description, address, phone, website,
+                 rating, price_range, opening_hours, opening_periods, location,
+                 created_at, updated_at, is_active)
+            SELECT
+                'Spot ' || (%(start)s + i),
+                (%(cuisines)s)[1 + floor(random() * %(n_cuisines)s)::int],
+                '',
+                (%(start)s + i) || ' Benchmark Street',
+                '',
+                '',
+                round((1 + random() * 4)::numeric, 1),
+                (%(prices)s)[1 + floor(random() * %(n_prices)s)::int],
+                %(hours)s,
+                %(periods)s::int4multirange,
+                ST_SetSRID(ST_MakePoint(
+                    %(min_lng)s + random() * (%(max_lng)s - %(min_lng)s),
+                    %(min_lat)s + random() * (%(max_lat)s - %(min_lat)s)
+                ), 4326),
+                now(),
+                now(),
+                true
+            FROM generate_series(1, %(count)s) AS i
+            """,
+            {
+                'cuisines': cuisines,
+                'n_cuisines': len(cuisines),
+                'prices': prices,
+                'n_prices': len(prices),
+                'min_lng': min_lng,
+                'min_lat': min_lat,
+                'max_lng': max_lng,
+                'max_lat': max_lat,
+                'count': count,
+                'start': start,
+                'hours': SYNTHETIC_HOURS,
+                'periods': to_multirange(parse_opening_hours(SYNTHETIC_HOURS)),
+            },
+        )
+        cursor.execute(f'ANALYZE {FoodSpot._meta.db_table}')
+
+
+def populate_reviews(count, start=0):
+    """
+    Insert `count` reviews over the existing spots, numbered from `start`,
+    then recompute the spots' review aggregates.
+
+    Popularity is skewed like real review sites: spot k (in id order) is
+    picked with probability falling off as a power law, so the first few
+    percent of spots collect most reviews and the long tail has none.
+    Ratings lean positive (mostly 4-5 stars), about 5% of reviews await
+    approval, and creation times span the last two years. Deterministic
+    for a given `start`, like populate_spots().
+    """
+    spots = FoodSpot._meta.db_table
+    reviews = Review._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT setseed(%s)', [(start % 991) / 991])
+        cursor.execute(
+            f"""
+            WITH ids AS (SELECT array_agg(id ORDER BY id) AS ids FROM {spots})
+            INSERT INTO {reviews}
+                (foodspot_id, reviewer_name, reviewer_email, rating, comment,
+                 created_at, updated_at, is_approved)
+            SELECT
+                ids[1 + floor(power(random(), 3) * cardinality(ids))::int],
+                'Reviewer ' || ((%(start)s + i) %% 5000),
+                NULL,
+                GREATEST(1, LEAST(5, round((5.4 - power(random(), 1.6) * 4.4)::numeric * 2) / 2)),
+                'Benchmark review ' || (%(start)s + i),
+                now() - random() * interval '730 days',
+                now(),
+                random() >= 0.05
+            FROM ids, generate_series(1, %(count)s) AS i
+            WHERE cardinality(ids) > 0
+            """,
+            {'count': count, 'start': start},
+        )
+        # Same result as rebuild_review_stats, in one statement
+        cursor.execute(
+            f"""
+            UPDATE {spots} f
+            SET review_count = s.review_count, average_rating = s.average_rating
+            FROM (
+                SELECT foodspot_id, count(*) AS review_count, round(avg(rating), 2) AS average_rating
+                FROM {reviews}
+                WHERE is_approved
+                GROUP BY foodspot_id
+            ) s
+            WHERE f.id = s.foodspot_id
+            """
+        )
+        cursor.execute(f'ANALYZE {reviews}')
+        cursor.execute(f'ANALYZE {spots}')
+
+
+def parse_bbox(value):
+    """'min_lng,min_lat,max_lng,max_lat' as a bbox tuple"""
+    bbox = tuple(float(v) for v in value.split(','))
+    if len(bbox) != 4 or bbox[0] >= bbox[2] or bbox[1] >= bbox[3]:
+        raise ValueError('bbox must be min_lng,min_lat,max_lng,max_lat')
+    return bbox
+
+
+def bbox_center(bbox=DUBLIN_BBOX):
+    """Return (lng, lat) of the middle of `bbox`"""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    return (min_lng + max_lng) / 2, (min_lat + max_lat) / 2
@@ -0,0 +1,32 @@
+"""
+Timing helpers shared by benchmark suites.
+"""
+import statistics
+import time
+
+
+def measure(fn, repeat=20, warmup=2):
+    """Call `fn` repeatedly and return latency stats in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples):
+    """Latency stats in milliseconds for `samples` (milliseconds)"""
+    samples = sorted(samples)
+
+    def percentile(fraction):
+        return round(samples[min(len(samples) - 1, int(len(samples) * fraction))], 3)
+
+    return {
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': round(samples[-1], 3),
+    }
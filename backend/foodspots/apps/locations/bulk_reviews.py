@@ -0,0 +1,65 @@
+"""
+Bulk review ingestion (POST /api/reviews/bulk/).
+
+A batch is validated in one pass: field checks per item, then a single
+query for the existence of every referenced spot. Valid items are inserted
+with bulk_create in one transaction, and the per-spot work that the Review
+signals would do per review (aggregates, tile invalidation, data versions)
+runs once for the batch. Invalid items are reported by index and do not
+stop the rest of the batch.
+"""
+from django.db import transaction
+
+from . import versioning
+from .aggregates import refresh_review_stats
+from .models import FoodSpot, Review
+from .serializers import ReviewBulkItemSerializer
+
+MAX_ITEMS = 5_000
+INSERT_BATCH_SIZE = 1_000
+
+
+def validate(items):
+    """Split `items` into ([(index, unsaved Review)], [(index, errors)])"""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        serializer = ReviewBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append((index, serializer.errors))
+
+    referenced = {data['foodspot'] for _, data in valid}
+    existing = set(FoodSpot.objects.filter(pk__in=referenced).values_list('pk', flat=True))
+    reviews = []
+    for index, data in valid:
+        fields = dict(data)
+        foodspot_id = fields.pop('foodspot')
+        if foodspot_id not in existing:
+            errors.append((index, {'foodspot': [f'Invalid pk "{foodspot_id}" - object does not exist.']}))
+            continue
+        reviews.append((index, Review(foodspot_id=foodspot_id, is_approved=True, **fields)))
+    errors.sort(key=lambda error: error[0])
+    return reviews, errors
+
+
+def create(reviews):
+    """
+    Insert unsaved `reviews` and refresh the aggregates of the spots they
+    touch, all in one transaction. Returns the saved reviews, with ids.
+    """
+    if not reviews:
+        return []
+    with transaction.atomic():
+        created = Review.objects.bulk_create(reviews, batch_size=INSERT_BATCH_SIZE)
+        # bulk_create skips the Review signals: stamp and refresh once per batch
+        versioning.bump(versioning.REVIEWS)
+        refresh_review_stats({review.foodspot_id for review in created})
+    return created
+
+
+def ingest(items):
+    """Validate and insert a batch; returns ([(index, saved Review)], [(index, errors)])"""
+    indexed, errors = validate(items)
+    created = create([review for _, review in indexed])
+    return [(index, review) for (index, _), review in zip(indexed, created)], errors
@@ -0,0 +1,160 @@
+"""
+Hierarchical spatial cell keys and per-cell aggregates.
+
+Cells are web map tiles: at level L the world is split into 2^L x 2^L
+cells, so a heatmap cell lines up with the map tiles. `FoodSpot.cell_key`
+is the spot's cell at MAX_LEVEL as a Morton-coded quadkey (two bits per
+level, most significant first). The cell at any coarser level is the key
+shifted right, and all descendants of a cell form one contiguous key range.
+
+Both the key and the CellAggregate rows (active spot count and rating sum
+per cell, for every level in AGGREGATE_LEVELS) are maintained by database
+triggers (migrations 0011 and 0013). They therefore stay current through ORM
+saves, update() calls and the COPY import merge alike. The aggregate trigger
+is statement-level, so a bulk import applies one grouped delta per batch.
+Levels below AGGREGATE_LEVELS are not stored, since their few huge cells
+would make every write contend on the same rows; they are summed from the
+first aggregate level, which has at most 4^6 cells.
+"""
+import math
+
+from django.conf import settings
+from django.db import connections, router
+
+from foodspots.db.timeouts import statement_timeout
+
+from .models import CellAggregate, FoodSpot
+
+# Finest level stored in FoodSpot.cell_key (about 2.4 m cells at the equator)
+MAX_LEVEL = 24
+# Levels with a maintained CellAggregate row per non-empty cell
+AGGREGATE_LEVELS = range(6, 17)
+# Heatmap cells per map tile edge: 2^2 = 4
+LEVEL_OFFSET = 2
+MAX_CELLS = 4096
+MAX_LATITUDE = 85.0511287798
+
+
+def tile_x(lng, level):
+    n = 1 << level
+    return min(max(math.floor((lng + 180.0) / 360.0 * n), 0), n - 1)
+
+
+def tile_y(lat, level):
+    n = 1 << level
+    lat = math.radians(min(max(lat, -MAX_LATITUDE), MAX_LATITUDE))
+    y = (1.0 - math.log(math.tan(lat) + 1.0 / math.cos(lat)) / math.pi) / 2.0 * n
+    return min(max(math.floor(y), 0), n - 1)
+
+
+def key_xy(key, level):
+    x = y = 0
+    for i in range(level):
+        x |= ((key >> (2 * i)) & 1) << i
+        y |= ((key >> (2 * i + 1)) & 1) << i
+    return x, y
+
+
+def quadkey(x, y, level):
+    """Bing Maps style quadkey string, e.g. '120210'"""
+    return ''.join(
+        str(((x >> i) & 1) | (((y >> i) & 1) << 1))
+        for i in range(level - 1, -1, -1)
+    )
+
+
+def cell_bounds(x, y, level):
+    """(min_lng, min_lat, max_lng, max_lat) of a cell"""
+    n = 1 << level
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return (x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y))
+
+
+def cell_range(bbox, level):
+    """Inclusive (min_x, min_y, max_x, max_y) of the cells covering `bbox`"""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    # Tile rows grow southwards
+    return tile_x(min_lng, level), tile_y(max_lat, level), tile_x(max_lng, level), tile_y(min_lat, level)
+
+
+def heatmap_level(zoom):
+    return min(zoom + LEVEL_OFFSET, MAX_LEVEL)
+
+
+def _aggregated_cells(level, cells):
+    min_x, min_y, max_x, max_y = cells
+    return CellAggregate.objects.filter(
+        level=level, x__range=(min_x, max_x), y__range=(min_y, max_y), spot_count__gt=0,
+    ).values_list('x', 'y', 'spot_count', 'rating_sum')
+
+
+def _rolled_up_cells(level, cells):
+    """Cells coarser than the aggregates: sum their children at the first aggregate level"""
+    base = AGGREGATE_LEVELS.start
+    shift = base - level
+    min_x, min_y, max_x, max_y = cells
+    children = (min_x << shift, min_y << shift, ((max_x + 1) << shift) - 1, ((max_y + 1) << shift) - 1)
+    totals = {}
+    for x, y, count, rating_sum in _aggregated_cells(base, children):
+        cell = (x >> shift, y >> shift)
+        spots, ratings = totals.get(cell, (0, 0))
+        totals[cell] = (spots + count, ratings + rating_sum)
+    for (x, y), (count, rating_sum) in totals.items():
+        yield x, y, count, rating_sum
+
+
+def _grouped_cells(level, cells):
+    """Cells finer than the aggregates: group the spots in view by key prefix"""
+    min_x, min_y, max_x, max_y = cells
+    west, _, _, north = cell_bounds(min_x, min_y, level)
+    _, south, east, _ = cell_bounds(max_x, max_y, level)
+    alias = router.db_for_read(FoodSpot)
+    with statement_timeout(settings.READ_STATEMENT_TIMEOUT_MS, using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT cell_key >> %(shift)s AS cell, count(*), sum(COALESCE(average_rating, rating))
+                FROM {FoodSpot._meta.db_table}
+                WHERE is_active
+                  AND location && ST_MakeEnvelope(%(west)s, %(south)s, %(east)s, %(north)s, 4326)
+                GROUP BY cell
+                """,
+                {'shift': 2 * (MAX_LEVEL - level), 'west': west, 'south': south, 'east': east, 'north': north},
+            )
+            rows = cursor.fetchall()
+    for key, count, rating_sum in rows:
+        if key is not None:
+            yield (*key_xy(key, level), count, rating_sum)
+
+
+def get_heatmap(bbox, zoom):
+    """Spot count and average rating of the non-empty cells covering `bbox`"""
+    level = heatmap_level(zoom)
+    cells = cell_range(bbox, level)
+    min_x, min_y, max_x, max_y = cells
+    if (max_x - min_x + 1) * (max_y - min_y + 1) > MAX_CELLS:
+        raise ValueError('Bounding box too large for this zoom level')
+
+    if level in AGGREGATE_LEVELS:
+        rows = _aggregated_cells(level, cells)
+    elif level < AGGREGATE_LEVELS.start:
+        rows = _rolled_up_cells(level, cells)
+    else:
+        rows = _grouped_cells(level, cells)
+
+    results = []
+    for x, y, count, rating_sum in rows:
+        bounds = cell_bounds(x, y, level)
+        results.append({
+            'key': quadkey(x, y, level),
+            'latitude': (bounds[1] + bounds[3]) / 2,
+            'longitude': (bounds[0] + bounds[2]) / 2,
+            'bounds': bounds,
+            'count': count,
+            'average_rating': round(float(rating_sum) / count, 2) if count else None,
+        })
+    results.sort(key=lambda cell: cell['key'])
+    return level, results
@@ -0,0 +1,130 @@
+"""
+Server-side marker clustering by zoom level.
+
+Spots are grouped by snapping them to a lat/lng grid whose cell size halves
+with every zoom level (CELLS_PER_TILE cells across one web map tile). Each
+cell's aggregate is cached under the 'foodspots' data version, so panning
+only queries the cells that have not been seen since the last write.
+Cells are aggregated on the read database.
+"""
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router
+
+from foodspots.db.timeouts import statement_timeout
+
+from . import versioning
+from .models import FoodSpot
+
+CELLS_PER_TILE = 4
+# From this zoom level on, individual spots are returned instead of clusters
+MAX_CLUSTER_ZOOM = 17
+MAX_CELLS = 4096
+# Individual spots returned at most from MAX_CLUSTER_ZOOM on
+MAX_SPOTS = 2000
+CACHE_TIMEOUT = 3600
+# Cached marker for cells known to contain no spots
+_EMPTY = 0
+
+
+def cell_size(zoom):
+    """Cell edge in degrees at `zoom`"""
+    return 360.0 / (2 ** zoom * CELLS_PER_TILE)
+
+
+def cell_range(bbox, zoom):
+    """Inclusive (min_cx, min_cy, max_cx, max_cy) of the cells covering `bbox`"""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    size = cell_size(zoom)
+    return (
+        math.floor(min_lng / size), math.floor(min_lat / size),
+        math.floor(max_lng / size), math.floor(max_lat / size),
+    )
+
+
+def _query_cells(zoom, cells, cuisine_type):
+    """Aggregate spots per grid cell for the cell range `cells` in one pass"""
+    min_cx, min_cy, max_cx, max_cy = cells
+    size = cell_size(zoom)
+    params = {
+        'size': size,
+        'x0': min_cx * size, 'y0': min_cy * size,
+        'x1': (max_cx + 1) * size, 'y1': (max_cy + 1) * size,
+    }
+    cuisine_sql = ''
+    if cuisine_type:
+        cuisine_sql = 'AND cuisine_type = %(cuisine_type)s'
+        params['cuisine_type'] = cuisine_type
+    alias = router.db_for_read(FoodSpot)
+    with statement_timeout(settings.READ_STATEMENT_TIMEOUT_MS, using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT floor(ST_X(location) / %(size)s)::int AS cx,
+                       floor(ST_Y(location) / %(size)s)::int AS cy,
+                       count(*),
+                       avg(ST_Y(location)),
+                       avg(ST_X(location)),
+                       mode() WITHIN GROUP (ORDER BY cuisine_type),
+                       avg(COALESCE(average_rating, rating))
+                FROM {FoodSpot._meta.db_table}
+                WHERE is_active
+                  AND location && ST_MakeEnvelope(%(x0)s, %(y0)s, %(x1)s, %(y1)s, 4326)
+                  {cuisine_sql}
+                GROUP BY cx, cy
+                """,
+                params,
+            )
+            rows = cursor.fetchall()
+
+    found = {}
+    for cx, cy, count, lat, lng, cuisine, rating in rows:
+        if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy:
+            found[(cx, cy)] = {
+                'latitude': lat,
+                'longitude': lng,
+                'count': count,
+                'dominant_cuisine': cuisine,
+                'average_rating': round(float(rating), 2) if rating is not None else None,
+            }
+    return found
+
+
+def check_extent(bbox, zoom):
+    """Raise ValueError when `bbox` spans more than MAX_CELLS cells at `zoom`"""
+    min_cx, min_cy, max_cx, max_cy = cell_range(bbox, zoom)
+    if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > MAX_CELLS:
+        raise ValueError('Bounding box too large for this zoom level')
+    return min_cx, min_cy, max_cx, max_cy
+
+
+def get_clusters(bbox, zoom, cuisine_type=None):
+    """Return the non-empty clusters for the cells covering `bbox`"""
+    min_cx, min_cy, max_cx, max_cy = check_extent(bbox, zoom)
+
+    version = versioning.current(versioning.FOODSPOTS)[0]
+    prefix = f'clusters:{version}:{cuisine_type or "*"}:{zoom}'
+    keys = {
+        (cx, cy): f'{prefix}:{cx}:{cy}'
+        for cx in range(min_cx, max_cx + 1)
+        for cy in range(min_cy, max_cy + 1)
+    }
+    cached = cache.get_many(keys.values())
+    missing = [cell for cell, key in keys.items() if key not in cached]
+
+    if missing:
+        # One grouped query over the smallest cell range holding every miss
+        xs = [cx for cx, _ in missing]
+        ys = [cy for _, cy in missing]
+        found = _query_cells(zoom, (min(xs), min(ys), max(xs), max(ys)), cuisine_type)
+        fresh = {keys[cell]: found.get(cell, _EMPTY) for cell in missing}
+        cache.set_many(fresh, CACHE_TIMEOUT)
+        cached.update(fresh)
+
+    return [
+        {'cell': [cx, cy], **cached[key]}
+        for (cx, cy), key in keys.items()
+        if cached.get(key, _EMPTY) != _EMPTY
+    ]
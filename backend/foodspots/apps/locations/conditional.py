@@ -0,0 +1,64 @@
+"""
+Conditional GET support (ETag / Last-Modified) for read-only API actions.
+
+Validators are derived from the DataVersion stamps the action depends on,
+plus the request path, query string and Accept header. They are checked
+before the view runs, so a matching If-None-Match / If-Modified-Since is
+answered with 304 without touching the action's queries or serializers.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from . import versioning
+
+
+def _etag(request, versions):
+    parts = [
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        request.META.get('HTTP_ACCEPT', ''),
+        ':'.join(str(v) for v in versions),
+    ]
+    return quote_etag(hashlib.sha1('|'.join(parts).encode()).hexdigest())
+
+
+def conditional(*scopes, static_version=None, clock=None):
+    """
+    Decorate a viewset action so GET/HEAD honour conditional request headers.
+    `scopes` are DataVersion scopes; `static_version` covers data that only
+    changes with a deploy (e.g. choice lists). `clock(request)` returns a
+    stamp for responses that also change with the time of day (None when
+    the request does not); such responses carry no Last-Modified.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_method(self, request, *args, **kwargs)
+
+            versions, last_modified = versioning.stamp(*scopes) if scopes else ((), None)
+            if static_version is not None:
+                versions += (static_version,)
+            clock_stamp = clock(request) if clock else None
+            if clock_stamp is not None:
+                versions += (clock_stamp,)
+                last_modified = None
+            etag = _etag(request, versions)
+            timestamp = last_modified.timestamp() if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response.headers.setdefault('ETag', etag)
+            if timestamp is not None:
+                response.headers.setdefault('Last-Modified', http_date(timestamp))
+            # Let browsers and the service worker keep the body but always revalidate
+            patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
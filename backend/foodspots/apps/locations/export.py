@@ -0,0 +1,73 @@
+"""
+Streaming bulk export of the FoodSpot catalogue.
+
+Rows are read through a server-side cursor (QuerySet.iterator) in chunks
+and encoded chunk by chunk into a StreamingHttpResponse, so worker memory
+stays flat whatever the table size. Review aggregates are stored on
+FoodSpot, so no per-row queries are issued.
+"""
+import logging
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+
+from . import projection
+from .renderers import FastJSONRenderer
+from .serializers import FoodSpotSerializer
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'foodspots.ndjson'),
+    'geojson': ('application/geo+json', 'foodspots.geojson'),
+}
+CHUNK_SIZE = 2000
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ndjson_lines(queryset, chunk_size=CHUNK_SIZE):
+    """One JSON object per line, with the same fields as the list endpoint"""
+    renderer = FastJSONRenderer()
+    rows = projection.list_values(queryset.order_by('id')).iterator(chunk_size=chunk_size)
+    for chunk in _chunks(rows, chunk_size):
+        yield b''.join(renderer.render(row) + b'\n' for row in projection.list_results(chunk))
+
+
+def geojson_collection(queryset, chunk_size=CHUNK_SIZE):
+    """A GeoJSON FeatureCollection of FoodSpotSerializer features"""
+    renderer = FastJSONRenderer()
+    spots = queryset.defer('search_vector').order_by('id').iterator(chunk_size=chunk_size)
+    yield b'{"type":"FeatureCollection","features":['
+    separator = b''
+    for chunk in _chunks(spots, chunk_size):
+        features = FoodSpotSerializer(chunk, many=True).data['features']
+        yield separator + b','.join(renderer.render(feature) for feature in features)
+        separator = b','
+    yield b']}'
+
+
+def _logged(chunks, export_format):
+    # Once streaming has started the status line is sent, so errors can only be logged
+    try:
+        yield from chunks
+    except Exception as e:
+        logger.error("Error streaming %s export: %s", export_format, e)
+        raise
+
+
+def stream_export(queryset, export_format, chunk_size=CHUNK_SIZE):
+    content_type, filename = EXPORT_FORMATS[export_format]
+    encode = ndjson_lines if export_format == 'ndjson' else geojson_collection
+    response = StreamingHttpResponse(
+        _logged(encode(queryset, chunk_size), export_format), content_type=content_type
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,181 @@
+"""
+Structured opening hours and the "open at" filter.
+
+`FoodSpot.opening_hours` stays free text for display. `parse_opening_hours`
+turns it into weekly periods: [start, end) minutes since Monday 00:00,
+stored in `FoodSpot.opening_periods` (an int4multirange with a GiST
+index). "Open at T" is then `opening_periods @> minute_of_week(T)`, which
+is evaluated in SQL.
+
+Understood formats:
+- one range for every day: "11:00 AM - 11:00 PM", "08:00-22:00";
+- OpenStreetMap-style rules: "Mo-Fr 08:00-18:00; Sa 10:00-14:00,17:00-22:00; Su off";
+- "24/7".
+Ranges ending at or before their start run past midnight. Later rules
+override earlier ones for the days they name; public/school holiday rules
+are ignored. Text that cannot be parsed gives None (hours unknown), and
+such spots never match an open filter.
+
+The parsing functions need neither the database nor the ORM, so import
+workers and migrations call them directly.
+"""
+import re
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DAYS = ('mo', 'tu', 'we', 'th', 'fr', 'sa', 'su')
+
+_DAY = r'(?:mo|tu|we|th|fr|sa|su)[a-z]*\.?'
+_DAY_RANGE = rf'{_DAY}(?:\s*(?:-|–|to)\s*{_DAY})?'
+_DAY_SPEC = re.compile(rf'^({_DAY_RANGE}(?:\s*,\s*{_DAY_RANGE})*)\s*:?\s*')
+_HOLIDAY_RULE = re.compile(r'^(?:ph|sh)\b')
+_TIME = r'(\d{1,2})(?:[:.h](\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?'
+_TIME_RANGE = re.compile(rf'^{_TIME}\s*(?:-|–|—|to)\s*{_TIME}$')
+_ALWAYS = {'24/7', '24 hours', 'open 24 hours'}
+_CLOSED = {'off', 'closed'}
+
+
+class OpenAtError(ValueError):
+    """Unusable open_at / open_now request parameter"""
+
+
+def _minute(hour, minute, meridiem):
+    hour, minute = int(hour), int(minute or 0)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.startswith('p') else 0)
+    if minute >= 60 or hour > 24 or (hour == 24 and minute):
+        return None
+    return hour * 60 + minute
+
+
+def _time_range(text):
+    match = _TIME_RANGE.match(text.strip())
+    if match is None:
+        return None
+    start = _minute(*match.group(1, 2, 3))
+    end = _minute(*match.group(4, 5, 6))
+    if start is None or end is None or start == MINUTES_PER_DAY:
+        return None
+    if end <= start:
+        # Past midnight ("18:00-02:00"); equal ends mean round the clock
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+def _days(spec):
+    days = []
+    for part in spec.split(','):
+        bounds = re.split(r'\s*(?:-|–|to)\s*', part.strip())
+        first, last = DAYS.index(bounds[0][:2]), DAYS.index(bounds[-1][:2])
+        # Ranges may wrap round the week ("Fr-Mo")
+        days.extend(DAYS[(first + i) % 7] for i in range((last - first) % 7 + 1))
+    return days
+
+
+def _merge(periods):
+    merged = []
+    for start, end in sorted(periods):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(period) for period in merged]
+
+
+def parse_opening_hours(text):
+    """Sorted, non-overlapping weekly [start, end) minute periods, or None"""
+    text = ' '.join((text or '').lower().split())
+    if not text:
+        return None
+    if text in _ALWAYS:
+        return [(0, MINUTES_PER_WEEK)]
+
+    week = {}
+    for rule in text.split(';'):
+        rule = rule.strip()
+        if not rule or _HOLIDAY_RULE.match(rule):
+            continue
+        match = _DAY_SPEC.match(rule)
+        days = _days(match.group(1)) if match else DAYS
+        rest = rule[match.end():] if match else rule
+        if rest in _CLOSED:
+            ranges = []
+        elif rest in _ALWAYS:
+            ranges = [(0, MINUTES_PER_DAY)]
+        else:
+            ranges = [_time_range(part) for part in rest.split(',')]
+            if not ranges or None in ranges:
+                return None
+        for day in days:
+            week[day] = ranges
+
+    periods = []
+    for day, ranges in week.items():
+        offset = DAYS.index(day) * MINUTES_PER_DAY
+        for start, end in ranges:
+            start, end = offset + start, offset + end
+            if end > MINUTES_PER_WEEK:
+                # Sunday night into Monday morning
+                periods.append((0, end - MINUTES_PER_WEEK))
+                end = MINUTES_PER_WEEK
+            periods.append((start, end))
+    return _merge(periods)
+
+
+def to_multirange(periods):
+    """int4multirange literal for `periods` (None stays None)"""
+    if periods is None:
+        return None
+    return '{' + ','.join(f'[{start},{end})' for start, end in periods) + '}'
+
+
+def minute_of_week(moment):
+    """Minutes since Monday 00:00 of `moment` in the spots' local time"""
+    local = moment.astimezone(ZoneInfo(settings.OPENING_HOURS_TIME_ZONE))
+    return local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+
+def requested_minute(params):
+    """
+    Minute of the week asked for by `open_at` (ISO 8601; without an offset
+    it is local time of the spots) or `open_now` in request `params`, or
+    None when neither is given.
+    """
+    open_at = params.get('open_at')
+    if open_at:
+        moment = parse_datetime(str(open_at))
+        if moment is None:
+            raise OpenAtError('open_at must be an ISO 8601 date and time, e.g. 2026-10-16T21:30')
+        if timezone.is_naive(moment):
+            moment = moment.replace(tzinfo=ZoneInfo(settings.OPENING_HOURS_TIME_ZONE))
+        return minute_of_week(moment)
+    if _open_now(params):
+        return minute_of_week(datetime.now(dt_timezone.utc))
+    return None
+
+
+def _open_now(params):
+    return str(params.get('open_now', '')).lower() in ('1', 'true', 'yes')
+
+
+def open_now_stamp(request):
+    """conditional() clock: open_now answers change every minute"""
+    params = request.query_params
+    if params.get('open_at') or not _open_now(params):
+        return None
+    return minute_of_week(datetime.now(dt_timezone.utc))
+
+
+def open_at(queryset, minute):
+    """Restrict FoodSpot `queryset` to spots open at `minute` (None: no filter)"""
+    if minute is None:
+        return queryset
+    return queryset.filter(opening_periods__contains=minute)
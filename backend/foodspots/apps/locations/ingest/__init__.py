@@ -0,0 +1,10 @@
+"""
+Bulk import of food spots from CSV, GeoJSON and OSM extracts.
+
+Used by the `load_initial_data` management command. Files are streamed
+record by record, validated in a generator pipeline, COPYed into a staging
+table and merged into FoodSpot keyed on `source_ref`, so imports are
+idempotent and resumable from their last committed batch.
+"""
+from .pipeline import DEFAULT_BATCH_SIZE, get_checkpoint, run_import
+from .readers import FORMATS, detect_format
@@ -0,0 +1,128 @@
+"""
+COPY-based loading of normalized import batches.
+
+Each batch is streamed with COPY into a session-local staging table and
+merged into FoodSpot with a single INSERT ... ON CONFLICT (source_ref)
+statement. The same statement logs SpotChange rows for new, moved and
+edited spots (so their map tiles are re-rendered). Unchanged rows are left
+untouched, which makes replaying a batch after a crash harmless.
+"""
+import io
+
+from django.db import connection, transaction
+
+from .. import versioning
+from ..models import FoodSpot, SpotChange
+from .transform import COLUMNS
+
+STAGING_TABLE = 'locations_foodspot_import'
+
+# Columns copied from staging on insert and compared/overwritten on update
+_MERGED = (
+    'name', 'cuisine_type', 'description', 'address', 'phone', 'website',
+    'rating', 'price_range', 'opening_hours', 'opening_periods',
+)
+
+
+def _ensure_staging(cursor):
+    # Temporary and emptied at every commit: nothing to clean up afterwards
+    cursor.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+            seq bigint,
+            source_ref text,
+            name text,
+            cuisine_type text,
+            description text,
+            address text,
+            phone text,
+            website text,
+            rating numeric(2, 1),
+            price_range text,
+            opening_hours text,
+            opening_periods int4multirange,
+            longitude float8,
+            latitude float8
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+
+
+def _merge_sql():
+    spots = FoodSpot._meta.db_table
+    changes = SpotChange._meta.db_table
+    merged = ', '.join(_MERGED)
+    updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in _MERGED)
+    current = ', '.join(f'f.{column}' for column in _MERGED)
+    incoming = ', '.join(f'EXCLUDED.{column}' for column in _MERGED)
+    return f"""
+        WITH incoming AS (
+            -- A source may repeat a record; the last occurrence wins
+            SELECT DISTINCT ON (source_ref) *
+            FROM {STAGING_TABLE}
+            ORDER BY source_ref, seq DESC
+        ),
+        previous AS (
+            SELECT f.id, f.location
+            FROM {spots} f
+            JOIN incoming i ON f.source_ref = i.source_ref
+        ),
+        merged AS (
+            INSERT INTO {spots} AS f (
+                source_ref, {merged}, location,
+                review_count, created_at, updated_at, is_active
+            )
+            SELECT source_ref, {merged}, ST_SetSRID(ST_MakePoint(longitude, latitude), 4326),
+                   0, now(), now(), true
+            FROM incoming
+            ON CONFLICT (source_ref) DO UPDATE SET
+                {updates}, location = EXCLUDED.location, updated_at = EXCLUDED.updated_at
+            WHERE ({current}, f.location) IS DISTINCT FROM ({incoming}, EXCLUDED.location)
+            RETURNING f.id, f.location, (f.xmax = 0) AS inserted
+        ),
+        logged AS (
+            INSERT INTO {changes} (foodspot_id, location, created_at)
+            SELECT id, location, now() FROM merged
+            UNION ALL
+            -- Moved spots also invalidate the tiles they left
+            SELECT p.id, p.location, now()
+            FROM previous p
+            JOIN merged m ON m.id = p.id
+            WHERE NOT m.inserted AND p.location IS DISTINCT FROM m.location
+        )
+        SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+        FROM merged
+    """
+
+
+def merge_batch(payload, checkpoint=None, consumed=0):
+    """
+    Load one COPY payload (see transform.encode_batch) into FoodSpot.
+    `checkpoint` advances by `consumed` records in the same transaction, and
+    is left as it was if the batch fails. Returns (inserted, updated).
+    """
+    inserted = updated = 0
+    previous = checkpoint.records_done if checkpoint is not None else 0
+    try:
+        with transaction.atomic():
+            if payload:
+                with connection.cursor() as cursor:
+                    _ensure_staging(cursor)
+                    cursor.copy_expert(
+                        f"COPY {STAGING_TABLE} ({', '.join(COLUMNS)}) FROM STDIN",
+                        io.StringIO(payload),
+                    )
+                    cursor.execute(_merge_sql())
+                    inserted, updated = cursor.fetchone()
+            if checkpoint is not None:
+                checkpoint.records_done = previous + consumed
+                checkpoint.save()
+            if inserted or updated:
+                # Raw SQL skips FoodSpot signals, so stamp the change here
+                versioning.bump(versioning.FOODSPOTS)
+    except Exception:
+        if checkpoint is not None:
+            # The saved value rolled back with the batch
+            checkpoint.records_done = previous
+        raise
+    return inserted, updated
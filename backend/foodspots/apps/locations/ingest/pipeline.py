@@ -0,0 +1,100 @@
+"""
+Import driver: reader -> batches -> normalize/encode (optionally in worker
+processes) -> COPY + merge, with a checkpoint committed after every batch.
+"""
+import multiprocessing
+import os
+import time
+from collections import Counter, deque
+from itertools import islice
+
+from ..models import ImportCheckpoint
+from .loader import merge_batch
+from .readers import open_records
+from .transform import encode_batch
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def fingerprint(path):
+    stat = os.stat(path)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def get_checkpoint(source, path, restart=False):
+    """
+    Return the checkpoint for `source`. It is reset when `restart` is set or
+    when the file changed since the checkpoint was written.
+    """
+    current = fingerprint(path)
+    checkpoint, created = ImportCheckpoint.objects.get_or_create(
+        source=source, defaults={'fingerprint': current}
+    )
+    if not created and (restart or checkpoint.fingerprint != current):
+        checkpoint.fingerprint = current
+        checkpoint.records_done = 0
+        checkpoint.completed = False
+        checkpoint.save()
+    return checkpoint
+
+
+def _batches(records, source, size, start):
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield source, start, batch
+        start += len(batch)
+
+
+def _encoded(tasks, workers):
+    """
+    encode_batch over `tasks` in order. With several workers, at most two
+    batches per worker are in flight, so a fast reader cannot run ahead of
+    the database and fill memory.
+    """
+    if workers <= 1:
+        yield from map(encode_batch, tasks)
+        return
+    # Workers inherit the configured Django process; they never touch the database
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(encode_batch, (task,)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def run_import(path, input_format, checkpoint, batch_size=DEFAULT_BATCH_SIZE, workers=1):
+    """
+    Import `path`, resuming after `checkpoint.records_done`. Yields a
+    progress dict after every merged batch.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        workers = 1
+    records, fraction = open_records(path, input_format)
+    start = checkpoint.records_done
+    records = islice(records, start, None)
+
+    totals = {'records': start, 'loaded': 0, 'inserted': 0, 'updated': 0, 'rejected': Counter()}
+    started_at = time.monotonic()
+    tasks = _batches(records, checkpoint.source, batch_size, start)
+    for payload, loaded, rejected, consumed in _encoded(tasks, workers):
+        inserted, updated = merge_batch(payload, checkpoint, consumed)
+        totals['records'] += consumed
+        totals['loaded'] += loaded
+        totals['inserted'] += inserted
+        totals['updated'] += updated
+        totals['rejected'].update(rejected)
+        elapsed = time.monotonic() - started_at
+        yield {
+            **totals,
+            'resumed_from': start,
+            'fraction': fraction(),
+            'rate': (totals['records'] - start) / elapsed if elapsed else 0.0,
+        }
+
+    checkpoint.completed = True
+    checkpoint.save()
@@ -0,0 +1,287 @@
+"""
+Streaming readers for bulk import sources.
+
+Every reader yields flat dicts using the import vocabulary understood by
+`ingest.transform.normalize`: ref, name, cuisine_type, amenity, description,
+address, phone, website, rating, price_range, opening_hours, latitude,
+longitude. Files are read incrementally (gzip is handled transparently), so
+memory use does not depend on the file size.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import xml.etree.ElementTree as ET
+
+FORMATS = ('csv', 'geojson', 'osm')
+
+# Header aliases accepted in CSV files
+CSV_COLUMNS = {
+    'id': 'ref', 'ref': 'ref', 'source_id': 'ref',
+    'lat': 'latitude', 'latitude': 'latitude', 'y': 'latitude',
+    'lng': 'longitude', 'lon': 'longitude', 'long': 'longitude', 'longitude': 'longitude', 'x': 'longitude',
+    'cuisine': 'cuisine_type', 'cuisine_type': 'cuisine_type',
+    'price': 'price_range', 'price_range': 'price_range',
+    'hours': 'opening_hours', 'opening_hours': 'opening_hours',
+    'name': 'name', 'description': 'description', 'address': 'address',
+    'phone': 'phone', 'website': 'website', 'rating': 'rating', 'amenity': 'amenity',
+}
+
+OSM_AMENITIES = {'restaurant', 'cafe', 'fast_food', 'food_court', 'ice_cream', 'biergarten'}
+
+_READ_SIZE = 1 << 20
+# Largest single JSON value (one feature) the scanner will buffer
+_MAX_VALUE = 64 << 20
+
+
+class CountingReader(io.RawIOBase):
+    """Raw file wrapper counting the bytes consumed, for progress reporting"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self.raw.readinto(buffer)
+        self.bytes_read += count or 0
+        return count
+
+    def close(self):
+        self.raw.close()
+        super().close()
+
+
+def detect_format(path):
+    name = path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.endswith(('.csv', '.tsv')):
+        return 'csv'
+    if name.endswith(('.geojson', '.json', '.geojsonl', '.geojsons', '.ndjson')):
+        return 'geojson'
+    if name.endswith(('.osm', '.osm.pbf', '.pbf')):
+        return 'osm'
+    return None
+
+
+def open_binary(path):
+    """Return (binary stream, CountingReader over the file on disk)"""
+    counter = CountingReader(open(path, 'rb', buffering=0))
+    stream = io.BufferedReader(counter, _READ_SIZE)
+    if path.lower().endswith('.gz'):
+        stream = gzip.GzipFile(fileobj=stream)
+    return stream, counter
+
+
+def read_csv(stream):
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text, dialect=_sniff(text))
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [CSV_COLUMNS.get(h.strip().lower()) for h in header]
+    for number, row in enumerate(reader, start=1):
+        record = {key: value for key, value in zip(columns, row) if key}
+        record.setdefault('ref', str(number))
+        yield record
+
+
+def _sniff(text):
+    sample = text.buffer.peek(64 * 1024)[:64 * 1024].decode('utf-8', errors='ignore')
+    first_line = sample.split('\n', 1)[0]
+    return csv.excel_tab if first_line.count('\t') > first_line.count(',') else csv.excel
+
+
+def read_geojson(stream):
+    """
+    Features from a FeatureCollection, or from newline-delimited GeoJSON
+    (one Feature per line, optionally RFC 8142 record separators).
+    """
+    scanner = _JSONScanner(io.TextIOWrapper(stream, encoding='utf-8-sig'))
+    for number, feature in enumerate(scanner.features(), start=1):
+        yield _feature_record(feature, number)
+
+
+def _feature_record(feature, number):
+    if not isinstance(feature, dict) or feature.get('type') != 'Feature':
+        return {'ref': str(number), 'error': 'malformed record'}
+    properties = feature.get('properties') or {}
+    geometry = feature.get('geometry') or {}
+    if not isinstance(properties, dict) or not isinstance(geometry, dict):
+        return {'ref': str(number), 'error': 'malformed record'}
+    record = {CSV_COLUMNS[k.lower()]: v for k, v in properties.items() if k.lower() in CSV_COLUMNS}
+    ref = feature.get('id', properties.get('id'))
+    record['ref'] = str(ref) if ref is not None else str(number)
+    if geometry.get('type') != 'Point':
+        record['error'] = 'unsupported geometry'
+        return record
+    coordinates = geometry.get('coordinates') or ()
+    if not isinstance(coordinates, (list, tuple)):
+        record['error'] = 'malformed record'
+        return record
+    if len(coordinates) >= 2:
+        record['longitude'], record['latitude'] = coordinates[0], coordinates[1]
+    return record
+
+
+class _JSONScanner:
+    """
+    Incremental JSON scanner over a text stream. Values are decoded one at a
+    time with raw_decode, so only the current feature is held in memory.
+    """
+
+    _WHITESPACE = ' \t\n\r\x1e'
+
+    def __init__(self, text):
+        self.text = text
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.text.read(_READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self._WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        decoder = json.JSONDecoder()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off at the buffer end; read more and retry
+                if len(self.buffer) - self.pos > _MAX_VALUE or not self._fill():
+                    raise
+                continue
+            # A number at the buffer end may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def features(self):
+        """
+        Yield the Features of a FeatureCollection, streaming its array, or
+        successive top-level Features (newline-delimited GeoJSON)
+        """
+        while self.peek():
+            self.expect('{')
+            members = {}
+            while self.peek() == '"':
+                key = self.value()
+                self.expect(':')
+                if key == 'features':
+                    yield from self._array()
+                    members[key] = None
+                else:
+                    members[key] = self.value()
+                if self.peek() != ',':
+                    break
+                self.pos += 1
+            self.expect('}')
+            if members.get('type') == 'Feature':
+                yield members
+
+    def _array(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' at offset {self.pos - 1}")
+
+
+def read_osm_xml(stream):
+    """Food amenity nodes from an OSM XML extract (ways and relations are skipped)"""
+    context = ET.iterparse(stream, events=('start', 'end'))
+    _, root = next(context)
+    for event, element in context:
+        if event != 'end' or element.tag not in ('node', 'way', 'relation'):
+            continue
+        if element.tag == 'node':
+            tags = {tag.get('k'): tag.get('v') for tag in element.iter('tag')}
+            if tags.get('amenity') in OSM_AMENITIES:
+                yield _osm_record(element.get('id'), element.get('lat'), element.get('lon'), tags)
+        # Drop parsed elements so the tree never grows with the file
+        root.clear()
+
+
+def read_osm_pbf(path):
+    """Food amenity nodes from an .osm.pbf extract (requires pyosmium)"""
+    try:
+        import osmium
+    except ImportError:
+        raise ValueError('Reading .osm.pbf files requires the "osmium" package (pip install osmium)')
+    processor = osmium.FileProcessor(path, osmium.osm.NODE).with_filter(osmium.filter.KeyFilter('amenity'))
+    for node in processor:
+        tags = dict(node.tags)
+        if tags.get('amenity') in OSM_AMENITIES and node.location.valid():
+            yield _osm_record(node.id, node.location.lat, node.location.lon, tags)
+
+
+def _osm_record(node_id, lat, lon, tags):
+    street = ' '.join(filter(None, (tags.get('addr:housenumber'), tags.get('addr:street'))))
+    address = ', '.join(filter(None, (street, tags.get('addr:city'), tags.get('addr:postcode'))))
+    return {
+        'ref': f'node/{node_id}',
+        'name': tags.get('name'),
+        'cuisine_type': tags.get('cuisine'),
+        'amenity': tags.get('amenity'),
+        'description': tags.get('description'),
+        'address': address or tags.get('addr:full'),
+        'phone': tags.get('phone') or tags.get('contact:phone'),
+        'website': tags.get('website') or tags.get('contact:website'),
+        'opening_hours': tags.get('opening_hours'),
+        'latitude': lat,
+        'longitude': lon,
+    }
+
+
+def open_records(path, input_format):
+    """
+    Return (records, progress) for `path`. `progress()` gives the fraction
+    of the file read so far, or None when it cannot be known.
+    """
+    if input_format == 'osm' and path.lower().endswith('.pbf'):
+        return read_osm_pbf(path), lambda: None
+    stream, counter = open_binary(path)
+    size = os.path.getsize(path)
+    readers = {'csv': read_csv, 'geojson': read_geojson, 'osm': read_osm_xml}
+    records = _closing(readers[input_format](stream), stream)
+    return records, lambda: counter.bytes_read / size if size else None
+
+
+def _closing(records, stream):
+    try:
+        yield from records
+    finally:
+        stream.close()
@@ -0,0 +1,177 @@
+"""
+Validation and normalisation of import records.
+
+`normalize` turns one reader record into a staging row or raises Rejected.
+`encode_batch` runs it over a batch and encodes the survivors in
+PostgreSQL COPY text format; it is the unit of work handed to parser
+processes, so it only touches plain Python data.
+"""
+import math
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from ..hours import parse_opening_hours, to_multirange
+from ..models import FoodSpot
+
+CUISINES = {value for value, _ in FoodSpot.CUISINE_CHOICES}
+
+# Common source spellings (OSM `cuisine=*` values included) of our choices
+CUISINE_ALIASES = {
+    'coffee_shop': 'cafe', 'coffee': 'cafe', 'tea': 'cafe', 'bakery': 'cafe',
+    'burgers': 'burger', 'hamburger': 'burger',
+    'sushi': 'japanese', 'ramen': 'japanese',
+    'noodle': 'chinese', 'dim_sum': 'chinese',
+    'fish': 'seafood', 'fish_and_chips': 'seafood',
+    'vegan': 'vegetarian',
+    'greek': 'mediterranean', 'turkish': 'mediterranean', 'lebanese': 'mediterranean',
+    'middle_eastern': 'mediterranean', 'spanish': 'mediterranean',
+    'tex-mex': 'mexican', 'tacos': 'mexican',
+    'steak_house': 'american', 'bbq': 'american', 'diner': 'american',
+    'kebab': 'fast_food', 'sandwich': 'fast_food', 'chicken': 'fast_food',
+    'curry': 'indian', 'pakistani': 'indian',
+}
+# OSM amenity used when the cuisine is missing or unknown
+AMENITY_CUISINES = {'cafe': 'cafe', 'fast_food': 'fast_food', 'ice_cream': 'cafe'}
+
+PRICES = {value for value, _ in FoodSpot.PRICE_CHOICES}
+PRICE_ALIASES = {
+    '$': '€', '$$': '€€', '$$$': '€€€', '$$$$': '€€€€',
+    '1': '€', '2': '€€', '3': '€€€', '4': '€€€€',
+}
+
+
+def _max_length(field):
+    return FoodSpot._meta.get_field(field).max_length
+
+
+NAME_MAX = _max_length('name')
+ADDRESS_MAX = _max_length('address')
+PHONE_MAX = _max_length('phone')
+WEBSITE_MAX = _max_length('website')
+HOURS_MAX = _max_length('opening_hours')
+REF_MAX = _max_length('source_ref')
+DEFAULT_PRICE = FoodSpot._meta.get_field('price_range').default
+DEFAULT_HOURS = FoodSpot._meta.get_field('opening_hours').default
+DEFAULT_RATING = Decimal('0.0')
+
+# Staging columns, in COPY order
+COLUMNS = (
+    'seq', 'source_ref', 'name', 'cuisine_type', 'description', 'address', 'phone',
+    'website', 'rating', 'price_range', 'opening_hours', 'opening_periods',
+    'longitude', 'latitude',
+)
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\x00': ''})
+
+
+class Rejected(ValueError):
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _text(value):
+    return str(value).strip() if value is not None else ''
+
+
+def _cuisine(value, amenity):
+    for part in _text(value).lower().replace(',', ';').split(';'):
+        part = part.strip().replace(' ', '_')
+        if part in CUISINES:
+            return part
+        if part in CUISINE_ALIASES:
+            return CUISINE_ALIASES[part]
+    return AMENITY_CUISINES.get(_text(amenity).lower(), 'other')
+
+
+def _rating(value):
+    try:
+        rating = Decimal(_text(value)).quantize(Decimal('0.1'))
+    except (InvalidOperation, ValueError):
+        return DEFAULT_RATING
+    # NaN and Infinity parse, but cannot be compared
+    return rating if rating.is_finite() and 0 <= rating <= 5 else DEFAULT_RATING
+
+
+def _price(value):
+    value = _text(value)
+    if value in PRICES:
+        return value
+    return PRICE_ALIASES.get(value, DEFAULT_PRICE)
+
+
+def normalize(record, source):
+    """Validate one record; return its staging row (without `seq`)"""
+    if record.get('error'):
+        raise Rejected(record['error'])
+    name = _text(record.get('name'))
+    if not name:
+        raise Rejected('missing name')
+    try:
+        lat = float(record['latitude'])
+        lng = float(record['longitude'])
+    except (KeyError, TypeError, ValueError):
+        raise Rejected('invalid coordinates')
+    if not (math.isfinite(lat) and math.isfinite(lng) and -90 <= lat <= 90 and -180 <= lng <= 180):
+        raise Rejected('invalid coordinates')
+    if lat == 0 and lng == 0:
+        # Null Island: a missing location encoded as zeros
+        raise Rejected('invalid coordinates')
+    ref = _text(record.get('ref'))
+    if not ref:
+        # "source:" alone would merge every id-less row into one spot
+        raise Rejected('missing id')
+    source_ref = f"{source}:{ref}"
+    if len(source_ref) > REF_MAX:
+        raise Rejected('reference too long')
+
+    phone = _text(record.get('phone'))
+    website = _text(record.get('website'))
+    opening_hours = _text(record.get('opening_hours'))
+    if not opening_hours or len(opening_hours) > HOURS_MAX:
+        opening_hours = DEFAULT_HOURS
+    return (
+        source_ref,
+        name[:NAME_MAX],
+        _cuisine(record.get('cuisine_type'), record.get('amenity')),
+        _text(record.get('description')),
+        _text(record.get('address'))[:ADDRESS_MAX],
+        # Fields that cannot be shortened meaningfully are dropped instead
+        phone if len(phone) <= PHONE_MAX else '',
+        website if len(website) <= WEBSITE_MAX and website.startswith(('http://', 'https://')) else '',
+        _rating(record.get('rating')),
+        _price(record.get('price_range')),
+        opening_hours,
+        # Parsed here, in the parser processes, rather than row by row in SQL
+        to_multirange(parse_opening_hours(opening_hours)),
+        lng,
+        lat,
+    )
+
+
+def copy_line(values):
+    return '\t'.join(
+        '\\N' if value is None else str(value).translate(_COPY_ESCAPES) for value in values
+    ) + '\n'
+
+
+def encode_batch(task):
+    """
+    Normalize a (source, start, records) batch. Returns the COPY payload,
+    the number of rows in it, rejection counts by reason, and the number of
+    records consumed.
+    """
+    source, start, records = task
+    lines = []
+    rejected = Counter()
+    for offset, record in enumerate(records):
+        try:
+            row = normalize(record, source)
+        except Rejected as e:
+            rejected[e.reason] += 1
+            continue
+        except (AttributeError, TypeError, ValueError, ArithmeticError):
+            rejected['malformed record'] += 1
+            continue
+        lines.append(copy_line((start + offset, *row)))
+    return ''.join(lines), len(lines), rejected, len(records)
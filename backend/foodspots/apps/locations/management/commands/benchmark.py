@@ -0,0 +1,111 @@
+"""
+Management command to run performance benchmarks on synthetic data
+Usage: python manage.py benchmark spatial --sizes 1000,10000,100000,1000000
+       python manage.py benchmark api --output api.json --compare baseline.json
+"""
+import inspect
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from foodspots.apps.locations.benchmarks import SUITES
+from foodspots.apps.locations.benchmarks.report import compare, metadata
+from foodspots.apps.locations.benchmarks.synthetic import parse_bbox
+
+
+class Command(BaseCommand):
+    help = 'Runs a benchmark suite against synthetic data (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('suite', choices=sorted(SUITES), help='Benchmark suite to run')
+        parser.add_argument(
+            '--sizes',
+            default=None,
+            help='Comma-separated table sizes to benchmark (suite default if omitted)',
+        )
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement')
+        parser.add_argument('--output', default=None, help='Write results as JSON to this file')
+        parser.add_argument(
+            '--bbox',
+            default=None,
+            help='City bounding box for synthetic spots: min_lng,min_lat,max_lng,max_lat (api suite)',
+        )
+        parser.add_argument(
+            '--reviews-per-spot',
+            type=int,
+            default=None,
+            help='Synthetic reviews per spot on average (api suite)',
+        )
+        parser.add_argument('--compare', default=None, help='Result file of an earlier run to compare against')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=1.2,
+            help='With --compare, fail when a median is this many times slower (default 1.2)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(s) for s in options['sizes'].split(',')] if options['sizes'] else None
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+
+        suite = SUITES[options['suite']]
+        suite_options = {}
+        if options['bbox']:
+            try:
+                suite_options['bbox'] = parse_bbox(options['bbox'])
+            except ValueError as e:
+                raise CommandError(f'--bbox: {e}')
+        if options['reviews_per_spot'] is not None:
+            suite_options['reviews_per_spot'] = options['reviews_per_spot']
+        unsupported = set(suite_options) - set(inspect.signature(suite.run).parameters)
+        if unsupported:
+            raise CommandError(f"'{options['suite']}' does not take: {', '.join(sorted(unsupported))}")
+
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)
+
+        self.stdout.write(f"⏱️  Running '{options['suite']}' benchmark...")
+
+        # Synthetic rows live only inside this transaction
+        with transaction.atomic():
+            results = suite.run(sizes=sizes, repeat=options['repeat'], stdout=self.stdout, **suite_options)
+            transaction.set_rollback(True)
+
+        if options['output']:
+            report = {
+                'meta': metadata(options['suite'], sizes, options['repeat'], **suite_options),
+                'results': results,
+            }
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Results written to {options['output']}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ Benchmark complete'))
+
+        if baseline is not None:
+            self._compare(baseline, results, options['threshold'])
+
+    def _compare(self, baseline, results, threshold):
+        rows = compare(baseline, results, threshold=threshold)
+        if not rows:
+            raise CommandError('No measurements in common with the baseline')
+        self.stdout.write(f'\n📊 Compared with baseline ({len(rows)} measurements, threshold {threshold:g}x)')
+        regressions = 0
+        for row, before, after, ratio, regressed in rows:
+            label = ' '.join(
+                str(row[name]) for name in ('variant', 'query', 'action', 'size', 'origins') if name in row
+            )
+            line = f'   {label:<45} {before:>9.3f} -> {after:>9.3f} ms  x{ratio:.2f}'
+            if regressed:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f'{line}  REGRESSION'))
+            else:
+                self.stdout.write(line)
+        if regressions:
+            raise CommandError(f'{regressions} measurement(s) slower than {threshold:g}x the baseline')
+        self.stdout.write(self.style.SUCCESS('✅ No regressions'))
@@ -1,23 +1,67 @@
 """
 Management command to load initial food spots data
 Usage: python manage.py load_initial_data
+       python manage.py load_initial_data spots.csv.gz ireland.osm --workers 4
 """
-from django.core.management.base import BaseCommand
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
 from django.contrib.gis.geos import Point
-from foodspots.apps.locations.models import FoodSpot
+from foodspots.apps.locations import ingest, tiles, versioning
+from foodspots.apps.locations.aggregates import batched_signals
+from foodspots.apps.locations.hours import parse_opening_hours
+from foodspots.apps.locations.models import FoodSpot, ImportCheckpoint
 
 
 class Command(BaseCommand):
-    help = 'Loads initial food spots data into the database'
+    help = 'Loads initial food spots data, or imports CSV / GeoJSON / OSM files'
 
     def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            help='Files to import (.csv, .geojson, .geojsonl, .osm, .osm.pbf, optionally .gz). '
+                 'Without files the built-in Dublin spots are loaded.',
+        )
         parser.add_argument(
             '--clear',
             action='store_true',
             help='Clear existing data before loading',
         )
+        parser.add_argument(
+            '--format',
+            choices=ingest.FORMATS,
+            default=None,
+            help='Input format (detected from the file extension if omitted)',
+        )
+        parser.add_argument(
+            '--source',
+            default=None,
+            help='Source name prefixing record ids (default: file name). Only with a single file.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=ingest.DEFAULT_BATCH_SIZE,
+            help='Records per COPY batch and checkpoint',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Parser processes used to validate and encode records',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore saved checkpoints and import from the first record',
+        )
 
     def handle(self, *args, **options):
+        if options['paths']:
+            return self.import_files(options)
+
         # Check if data already exists
         existing_count = FoodSpot.objects.count()
         
@@ -32,7 +76,8 @@ class Command(BaseCommand):
 
         # Clear existing data if requested
         if options['clear'] and existing_count > 0:
-            FoodSpot.objects.all().delete()
+            with batched_signals():
+                FoodSpot.objects.all().delete()
             self.stdout.write(self.style.SUCCESS(f'🗑️  Deleted {existing_count} existing food spots'))
 
         # Create food spots data
@@ -221,9 +266,15 @@ class Command(BaseCommand):
             },
         ]
 
-        # Bulk create all spots
-        spots = [FoodSpot(**data) for data in spots_data]
+        # Bulk create all spots (bulk_create skips FoodSpot.save, which parses the hours)
+        spots = [
+            FoodSpot(**data, opening_periods=parse_opening_hours(data['opening_hours']))
+            for data in spots_data
+        ]
         FoodSpot.objects.bulk_create(spots)
+        # bulk_create skips signals; invalidate per-worker caches explicitly
+        versioning.bump(versioning.FOODSPOTS)
+        tiles.record_changes([(spot.pk, spot.location) for spot in spots])
         
         total_created = FoodSpot.objects.count()
         
@@ -239,4 +290,71 @@ class Command(BaseCommand):
         summary = FoodSpot.objects.values('cuisine_type').annotate(count=Count('id')).order_by('-count')
         for item in summary:
             cuisine_display = dict(FoodSpot.CUISINE_CHOICES).get(item['cuisine_type'], item['cuisine_type'])
-            self.stdout.write(f"   • {cuisine_display}: {item['count']} spot(s)")
\ No newline at end of file
+            self.stdout.write(f"   • {cuisine_display}: {item['count']} spot(s)")
+
+    def import_files(self, options):
+        paths = options['paths']
+        if options['source'] and len(paths) > 1:
+            raise CommandError('--source can only be used with a single file')
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--batch-size and --workers must be positive')
+
+        jobs = []
+        for path in paths:
+            if not os.path.isfile(path):
+                raise CommandError(f'File not found: {path}')
+            input_format = options['format'] or ingest.detect_format(path)
+            if input_format is None:
+                raise CommandError(f'Cannot detect the format of {path}; use --format')
+            source = options['source'] or os.path.basename(path).split('.')[0]
+            jobs.append((path, input_format, source))
+
+        if options['clear']:
+            existing_count = FoodSpot.objects.count()
+            with batched_signals():
+                FoodSpot.objects.all().delete()
+            ImportCheckpoint.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f'🗑️  Deleted {existing_count} existing food spots'))
+
+        for path, input_format, source in jobs:
+            checkpoint = ingest.get_checkpoint(source, path, restart=options['restart'])
+            if checkpoint.completed:
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️  {path} was already imported as '{source}'. Use --restart to import it again."
+                ))
+                continue
+            if checkpoint.records_done:
+                self.stdout.write(f'↩️  Resuming {path} after record {checkpoint.records_done:,}')
+            self.stdout.write(f"📥 Importing {path} ({input_format}) as '{source}'...")
+
+            progress = None
+            try:
+                for progress in ingest.run_import(
+                    path, input_format, checkpoint,
+                    batch_size=options['batch_size'], workers=options['workers'],
+                ):
+                    self.stdout.write(self.format_progress(progress))
+            except (OSError, ValueError, DatabaseError) as e:
+                raise CommandError(
+                    f'Import of {path} stopped after record {checkpoint.records_done:,}: {e}. '
+                    'Run the command again to resume.'
+                )
+
+            if progress is None:
+                self.stdout.write(self.style.WARNING(f'⚠️  No records found in {path}'))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {path}: {progress['inserted']:,} new, {progress['updated']:,} updated, "
+                f"{sum(progress['rejected'].values()):,} rejected"
+            ))
+            for reason, count in progress['rejected'].most_common():
+                self.stdout.write(f'   • {reason}: {count:,}')
+
+    def format_progress(self, progress):
+        fraction = progress['fraction']
+        done = f' ({fraction:.0%} of file)' if fraction is not None else ''
+        return (
+            f"   {progress['records']:,} records{done}: "
+            f"{progress['inserted']:,} new, {progress['updated']:,} updated, "
+            f"{sum(progress['rejected'].values()):,} rejected, {progress['rate']:,.0f} records/s"
+        )
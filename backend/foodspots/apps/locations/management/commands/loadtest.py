@@ -0,0 +1,69 @@
+"""
+Management command to load-test running deployments side by side
+Usage: python manage.py loadtest --action within_bounds --concurrency 1,10,50,100
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from foodspots.apps.locations.benchmarks.load import ACTIONS, run_load
+
+DEFAULT_TARGETS = [
+    'sync=http://localhost:8000/api/foodspots/',
+    'async=http://localhost:8001/api/async/foodspots/',
+]
+
+
+class Command(BaseCommand):
+    help = 'Compares throughput and tail latency of running servers under concurrent load'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            action='append',
+            default=None,
+            help='name=base URL of the spatial actions; repeatable '
+                 '(default: sync on :8000 and async on :8001)',
+        )
+        parser.add_argument('--action', choices=ACTIONS, default='nearest', help='Action to call')
+        parser.add_argument(
+            '--concurrency',
+            default='1,10,50,100',
+            help='Comma-separated numbers of concurrent clients',
+        )
+        parser.add_argument('--requests', type=int, default=500, help='Requests per concurrency level')
+        parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds')
+        parser.add_argument('--output', default=None, help='Write results as JSON to this file')
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(c) for c in options['concurrency'].split(',')]
+            targets = [t.split('=', 1) for t in options['target'] or DEFAULT_TARGETS]
+            targets = [(name, base.rstrip('/') + '/') for name, base in targets]
+        except ValueError:
+            raise CommandError('--concurrency must be integers and --target must be name=url')
+
+        self.stdout.write(f"⏱️  Load testing '{options['action']}' ({options['requests']} requests per level)...")
+        results = []
+        for concurrency in levels:
+            for name, base in targets:
+                url = f"{base}{options['action']}/"
+                stats = run_load(
+                    url, options['action'], concurrency, options['requests'], timeout=options['timeout']
+                )
+                results.append({'target': name, **stats})
+                errors = sum(stats['errors'].values())
+                self.stdout.write(
+                    f"{concurrency:>5} clients {name:<8} {stats['throughput_rps']:>8} req/s"
+                    f"  median {stats['median_ms']:>9.3f} ms  p95 {stats['p95_ms']:>9.3f} ms"
+                    f"  p99 {stats['p99_ms']:>9.3f} ms  errors {errors}"
+                )
+                if errors:
+                    self.stdout.write(self.style.WARNING(f"      {stats['errors']}"))
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Results written to {options['output']}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ Load test complete'))
@@ -0,0 +1,17 @@
+"""
+Management command to print a signed X-Profile-Token header value
+Usage: curl -H "X-Profile-Token: $(python manage.py profile_token)" ...
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from foodspots.instrumentation.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = 'Prints a signed token that makes the server profile a request (needs PROFILING=True)'
+
+    def handle(self, *args, **options):
+        if not settings.PROFILING:
+            self.stderr.write('⚠️  PROFILING is off: the server will ignore the token')
+        self.stdout.write(make_token())
@@ -0,0 +1,38 @@
+"""
+Management command to trim the SpotChange log behind the tile cache
+Usage: python manage.py prune_tile_changes [--days 7] [--batch-size 10000]
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from foodspots.apps.locations.tiles import PRUNE_BATCH_SIZE, prune_changes
+
+
+class Command(BaseCommand):
+    help = 'Deletes tile change log entries older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.TILE_CHANGE_RETENTION_DAYS,
+            help='Days of changes to keep (cached tiles older than that are re-rendered)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=PRUNE_BATCH_SIZE,
+            help='Number of changes deleted per transaction',
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        self.stdout.write(f'🔄 Pruning tile changes logged before {before:%Y-%m-%d %H:%M}...')
+        total = 0
+        for deleted in prune_changes(before, batch_size=options['batch_size']):
+            total += deleted
+            self.stdout.write(f'   • {total} changes deleted')
+        self.stdout.write(self.style.SUCCESS(f'✅ Pruned {total} tile changes'))
@@ -0,0 +1,27 @@
+"""
+Management command to recompute denormalized review aggregates
+Usage: python manage.py rebuild_review_stats [--batch-size 5000]
+"""
+from django.core.management.base import BaseCommand
+
+from foodspots.apps.locations.aggregates import rebuild_review_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes review_count and average_rating on every food spot'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of food spots updated per transaction',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 Rebuilding review aggregates...')
+        total = 0
+        for updated in rebuild_review_stats(batch_size=options['batch_size']):
+            total += updated
+            self.stdout.write(f'   • {total} food spots refreshed')
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt review aggregates for {total} food spots'))
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 09:12
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0003_review'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodspot',
+            index=django.contrib.postgres.indexes.GistIndex(django.db.models.functions.comparison.Cast('location', output_field=django.contrib.gis.db.models.fields.PointField(geography=True, srid=4326)), name='foodspot_location_geog_idx'),
+        ),
+    ]
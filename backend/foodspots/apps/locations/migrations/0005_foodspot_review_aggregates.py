@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-16 10:05
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_review_stats(apps, schema_editor):
+    FoodSpot = apps.get_model('locations', 'FoodSpot')
+    Review = apps.get_model('locations', 'Review')
+    approved = Review.objects.filter(
+        foodspot=models.OuterRef('pk'), is_approved=True
+    ).order_by().values('foodspot')
+    FoodSpot.objects.update(
+        review_count=Coalesce(
+            models.Subquery(approved.annotate(c=models.Count('id')).values('c')),
+            models.Value(0),
+        ),
+        average_rating=models.Subquery(approved.annotate(a=models.Avg('rating')).values('a')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_foodspot_location_geog_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodspot',
+            name='average_rating',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Average rating of approved reviews', max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='foodspot',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of approved reviews'),
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-16 11:20
+
+from django.db import migrations, models
+
+
+def seed_versions(apps, schema_editor):
+    DataVersion = apps.get_model('locations', 'DataVersion')
+    for scope in ('foodspots', 'reviews'):
+        DataVersion.objects.get_or_create(scope=scope, defaults={'version': 1})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0005_foodspot_review_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('scope', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(seed_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-16 13:40
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0006_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpotChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('foodspot_id', models.BigIntegerField()),
+                ('location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-16 15:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION locations_foodspot_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', replace(coalesce(NEW.cuisine_type, ''), '_', ' ')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(NEW.address, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER locations_foodspot_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON locations_foodspot
+    FOR EACH ROW EXECUTE FUNCTION locations_foodspot_search_vector_update();
+
+-- Backfill existing rows through the trigger
+UPDATE locations_foodspot SET name = name;
+"""
+
+DROP_SEARCH_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS locations_foodspot_search_vector_trigger ON locations_foodspot;
+DROP FUNCTION IF EXISTS locations_foodspot_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0007_spotchange'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='foodspot',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_TRIGGER_SQL, DROP_SEARCH_TRIGGER_SQL),
+        migrations.AddIndex(
+            model_name='foodspot',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='foodspot_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodspot',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='foodspot_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
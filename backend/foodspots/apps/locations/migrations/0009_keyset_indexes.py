@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-16 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0008_foodspot_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodspot',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-rating', 'name', 'id'], name='foodspot_list_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['foodspot', '-created_at', 'id'], name='review_feed_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-16 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0009_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodspot',
+            name='source_ref',
+            field=models.CharField(blank=True, editable=False, help_text='Identifier of the imported record', max_length=255, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('source', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(help_text='Input file size and mtime', max_length=64)),
+                ('records_done', models.BigIntegerField(default=0)),
+                ('completed', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,187 @@
+# Generated by Django 4.2.7 on 2026-10-16 18:20
+
+from django.db import migrations, models
+
+# Must match cells.MAX_LEVEL and cells.AGGREGATE_LEVELS
+MAX_LEVEL = 24
+MIN_AGGREGATE_LEVEL = 2
+MAX_AGGREGATE_LEVEL = 16
+
+CELL_FUNCTIONS_SQL = f"""
+CREATE OR REPLACE FUNCTION locations_tile_x(lng float8, level int) RETURNS bigint AS $$
+    SELECT LEAST(GREATEST(floor((lng + 180.0) / 360.0 * (1::bigint << level))::bigint, 0), (1::bigint << level) - 1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION locations_tile_y(lat float8, level int) RETURNS bigint AS $$
+    SELECT LEAST(GREATEST(floor(
+        (1.0 - ln(tan(radians(c.lat)) + 1.0 / cos(radians(c.lat))) / pi()) / 2.0 * (1::bigint << level)
+    )::bigint, 0), (1::bigint << level) - 1)
+    FROM (SELECT LEAST(GREATEST(lat, -85.0511287798), 85.0511287798) AS lat) c
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Spread the bits of v apart (abc -> 0a0b0c) for Morton interleaving
+CREATE OR REPLACE FUNCTION locations_spread_bits(v bigint) RETURNS bigint AS $$
+BEGIN
+    v := (v | (v << 16)) & {0x0000FFFF0000FFFF};
+    v := (v | (v << 8)) & {0x00FF00FF00FF00FF};
+    v := (v | (v << 4)) & {0x0F0F0F0F0F0F0F0F};
+    v := (v | (v << 2)) & {0x3333333333333333};
+    v := (v | (v << 1)) & {0x5555555555555555};
+    RETURN v;
+END
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION locations_cell_key(location geometry) RETURNS bigint AS $$
+    SELECT locations_spread_bits(locations_tile_x(ST_X(location), {MAX_LEVEL}))
+         | (locations_spread_bits(locations_tile_y(ST_Y(location), {MAX_LEVEL})) << 1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION locations_foodspot_cell_key_update() RETURNS trigger AS $$
+BEGIN
+    NEW.cell_key := locations_cell_key(NEW.location);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER locations_foodspot_cell_key_trigger
+    BEFORE INSERT OR UPDATE OF location ON locations_foodspot
+    FOR EACH ROW EXECUTE FUNCTION locations_foodspot_cell_key_update();
+
+-- Backfill existing rows
+UPDATE locations_foodspot SET cell_key = locations_cell_key(location);
+"""
+
+
+def _rows(alias, sign):
+    """Finest-level cell, spot delta and rating delta of the rows of `alias`"""
+    return f"""
+        SELECT locations_tile_x(ST_X({alias}.location), {MAX_LEVEL}) AS x,
+               locations_tile_y(ST_Y({alias}.location), {MAX_LEVEL}) AS y,
+               {sign} AS n,
+               {sign} * COALESCE({alias}.average_rating, {alias}.rating) AS rating
+    """
+
+
+def _apply(delta):
+    """Add the grouped `delta` rows to every aggregate level"""
+    return f"""
+        INSERT INTO locations_cellaggregate AS c (level, x, y, spot_count, rating_sum)
+        SELECT l.level, d.x >> ({MAX_LEVEL} - l.level), d.y >> ({MAX_LEVEL} - l.level), sum(d.n), sum(d.rating)
+        FROM ({delta}) d
+        CROSS JOIN generate_series({MIN_AGGREGATE_LEVEL}, {MAX_AGGREGATE_LEVEL}) AS l(level)
+        GROUP BY 1, 2, 3
+        HAVING sum(d.n) <> 0 OR sum(d.rating) <> 0
+        -- Same lock order in every transaction, so concurrent writers cannot deadlock
+        ORDER BY 1, 2, 3
+        ON CONFLICT (level, x, y) DO UPDATE
+            SET spot_count = c.spot_count + EXCLUDED.spot_count,
+                rating_sum = c.rating_sum + EXCLUDED.rating_sum;
+    """
+
+
+# Rows whose aggregate contribution changed
+_CHANGED = """
+    FROM new_rows n JOIN old_rows o ON o.id = n.id
+    WHERE (n.cell_key, n.is_active, n.rating, n.average_rating)
+          IS DISTINCT FROM (o.cell_key, o.is_active, o.rating, o.average_rating)
+"""
+
+AGGREGATE_SQL = f"""
+{_apply(_rows('f', 1) + ' FROM locations_foodspot f WHERE f.is_active')}
+
+CREATE OR REPLACE FUNCTION locations_cellaggregate_insert() RETURNS trigger AS $$
+BEGIN
+    {_apply(_rows('n', 1) + ' FROM new_rows n WHERE n.is_active')}
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION locations_cellaggregate_update() RETURNS trigger AS $$
+BEGIN
+    {_apply(
+        _rows('n', 1) + _CHANGED + ' AND n.is_active'
+        + ' UNION ALL '
+        + _rows('o', -1) + _CHANGED + ' AND o.is_active'
+    )}
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION locations_cellaggregate_delete() RETURNS trigger AS $$
+BEGIN
+    {_apply(_rows('o', -1) + ' FROM old_rows o WHERE o.is_active')}
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- Statement-level: one grouped upsert per statement, however many rows it wrote
+CREATE TRIGGER locations_foodspot_cells_insert_trigger
+    AFTER INSERT ON locations_foodspot
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION locations_cellaggregate_insert();
+
+CREATE TRIGGER locations_foodspot_cells_update_trigger
+    AFTER UPDATE ON locations_foodspot
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION locations_cellaggregate_update();
+
+CREATE TRIGGER locations_foodspot_cells_delete_trigger
+    AFTER DELETE ON locations_foodspot
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION locations_cellaggregate_delete();
+"""
+
+DROP_AGGREGATE_SQL = """
+DROP TRIGGER IF EXISTS locations_foodspot_cells_insert_trigger ON locations_foodspot;
+DROP TRIGGER IF EXISTS locations_foodspot_cells_update_trigger ON locations_foodspot;
+DROP TRIGGER IF EXISTS locations_foodspot_cells_delete_trigger ON locations_foodspot;
+DROP FUNCTION IF EXISTS locations_cellaggregate_insert();
+DROP FUNCTION IF EXISTS locations_cellaggregate_update();
+DROP FUNCTION IF EXISTS locations_cellaggregate_delete();
+"""
+
+DROP_CELL_FUNCTIONS_SQL = """
+DROP TRIGGER IF EXISTS locations_foodspot_cell_key_trigger ON locations_foodspot;
+DROP FUNCTION IF EXISTS locations_foodspot_cell_key_update();
+DROP FUNCTION IF EXISTS locations_cell_key(geometry);
+DROP FUNCTION IF EXISTS locations_spread_bits(bigint);
+DROP FUNCTION IF EXISTS locations_tile_y(float8, int);
+DROP FUNCTION IF EXISTS locations_tile_x(float8, int);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0010_foodspot_source_ref_importcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodspot',
+            name='cell_key',
+            field=models.BigIntegerField(editable=False, help_text="Quadkey of the spot's finest map cell", null=True),
+        ),
+        migrations.CreateModel(
+            name='CellAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.PositiveSmallIntegerField()),
+                ('x', models.IntegerField()),
+                ('y', models.IntegerField()),
+                ('spot_count', models.IntegerField(default=0)),
+                ('rating_sum', models.DecimalField(decimal_places=2, default=0, help_text="Sum of average_rating (or rating without reviews) of the cell's spots", max_digits=14)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='cellaggregate',
+            constraint=models.UniqueConstraint(fields=('level', 'x', 'y'), name='cellaggregate_cell_unique'),
+        ),
+        migrations.RunSQL(CELL_FUNCTIONS_SQL, DROP_CELL_FUNCTIONS_SQL),
+        # Fills the aggregates before creating their triggers, so existing spots are counted once
+        migrations.RunSQL(AGGREGATE_SQL, DROP_AGGREGATE_SQL),
+        migrations.AddIndex(
+            model_name='foodspot',
+            index=models.Index(fields=['cell_key'], name='foodspot_cell_key_idx'),
+        ),
+    ]
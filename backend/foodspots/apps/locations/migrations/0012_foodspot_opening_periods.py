@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:05
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+import foodspots.apps.locations.models
+from foodspots.apps.locations.hours import parse_opening_hours, to_multirange
+
+
+def backfill_opening_periods(apps, schema_editor):
+    FoodSpot = apps.get_model('locations', 'FoodSpot')
+    table = FoodSpot._meta.db_table
+    texts = list(FoodSpot.objects.order_by().values_list('opening_hours', flat=True).distinct())
+    if not texts:
+        return
+    # Each distinct text is parsed once and applied in a single statement
+    periods = [to_multirange(parse_opening_hours(text)) for text in texts]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table} f
+            SET opening_periods = v.periods::int4multirange
+            FROM unnest(%s::text[], %s::text[]) AS v(hours, periods)
+            WHERE f.opening_hours = v.hours AND v.periods IS NOT NULL
+            """,
+            [texts, periods],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0011_foodspot_cell_key_cellaggregate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodspot',
+            name='opening_periods',
+            field=foodspots.apps.locations.models.WeeklyPeriodsField(editable=False, help_text='Weekly opening periods in minutes since Monday 00:00', null=True),
+        ),
+        migrations.RunPython(backfill_opening_periods, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='foodspot',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['opening_periods'], name='foodspot_open_periods_idx'),
+        ),
+    ]
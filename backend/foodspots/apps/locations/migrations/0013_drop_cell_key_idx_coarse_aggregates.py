@@ -0,0 +1,109 @@
+# Generated by Django 4.2.7 on 2026-10-17 10:15
+
+from django.db import migrations
+
+# Must match cells.MAX_LEVEL and cells.AGGREGATE_LEVELS
+MAX_LEVEL = 24
+MIN_AGGREGATE_LEVEL = 6
+MAX_AGGREGATE_LEVEL = 16
+# First aggregate level of migration 0011
+PREVIOUS_MIN_AGGREGATE_LEVEL = 2
+
+
+def _rows(alias, sign):
+    """Finest-level cell, spot delta and rating delta of the rows of `alias`"""
+    return f"""
+        SELECT locations_tile_x(ST_X({alias}.location), {MAX_LEVEL}) AS x,
+               locations_tile_y(ST_Y({alias}.location), {MAX_LEVEL}) AS y,
+               {sign} AS n,
+               {sign} * COALESCE({alias}.average_rating, {alias}.rating) AS rating
+    """
+
+
+def _apply(delta, min_level):
+    """Add the grouped `delta` rows to every aggregate level from `min_level`"""
+    return f"""
+        INSERT INTO locations_cellaggregate AS c (level, x, y, spot_count, rating_sum)
+        SELECT l.level, d.x >> ({MAX_LEVEL} - l.level), d.y >> ({MAX_LEVEL} - l.level), sum(d.n), sum(d.rating)
+        FROM ({delta}) d
+        CROSS JOIN generate_series({min_level}, {MAX_AGGREGATE_LEVEL}) AS l(level)
+        GROUP BY 1, 2, 3
+        HAVING sum(d.n) <> 0 OR sum(d.rating) <> 0
+        -- Same lock order in every transaction, so concurrent writers cannot deadlock
+        ORDER BY 1, 2, 3
+        ON CONFLICT (level, x, y) DO UPDATE
+            SET spot_count = c.spot_count + EXCLUDED.spot_count,
+                rating_sum = c.rating_sum + EXCLUDED.rating_sum;
+    """
+
+
+# Rows whose aggregate contribution changed
+_CHANGED = """
+    FROM new_rows n JOIN old_rows o ON o.id = n.id
+    WHERE (n.cell_key, n.is_active, n.rating, n.average_rating)
+          IS DISTINCT FROM (o.cell_key, o.is_active, o.rating, o.average_rating)
+"""
+
+
+def aggregate_functions_sql(min_level):
+    """Trigger functions of migration 0011, maintaining levels from `min_level`"""
+    return f"""
+CREATE OR REPLACE FUNCTION locations_cellaggregate_insert() RETURNS trigger AS $$
+BEGIN
+    {_apply(_rows('n', 1) + ' FROM new_rows n WHERE n.is_active', min_level)}
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION locations_cellaggregate_update() RETURNS trigger AS $$
+BEGIN
+    {_apply(
+        _rows('n', 1) + _CHANGED + ' AND n.is_active'
+        + ' UNION ALL '
+        + _rows('o', -1) + _CHANGED + ' AND o.is_active',
+        min_level,
+    )}
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION locations_cellaggregate_delete() RETURNS trigger AS $$
+BEGIN
+    {_apply(_rows('o', -1) + ' FROM old_rows o WHERE o.is_active', min_level)}
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+# Continent-sized cells put every write in a region on the same few rows;
+# the heatmap now sums them from MIN_AGGREGATE_LEVEL instead (cells.py)
+COARSE_LEVELS_SQL = aggregate_functions_sql(MIN_AGGREGATE_LEVEL) + f"""
+DELETE FROM locations_cellaggregate WHERE level < {MIN_AGGREGATE_LEVEL};
+"""
+
+RESTORE_COARSE_LEVELS_SQL = aggregate_functions_sql(PREVIOUS_MIN_AGGREGATE_LEVEL) + f"""
+INSERT INTO locations_cellaggregate (level, x, y, spot_count, rating_sum)
+SELECT l.level, c.x >> ({MIN_AGGREGATE_LEVEL} - l.level), c.y >> ({MIN_AGGREGATE_LEVEL} - l.level),
+       sum(c.spot_count), sum(c.rating_sum)
+FROM locations_cellaggregate c
+CROSS JOIN generate_series({PREVIOUS_MIN_AGGREGATE_LEVEL}, {MIN_AGGREGATE_LEVEL - 1}) AS l(level)
+WHERE c.level = {MIN_AGGREGATE_LEVEL}
+GROUP BY 1, 2, 3;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0012_foodspot_opening_periods'),
+    ]
+
+    operations = [
+        # No query filters or orders on cell_key alone: heatmap groups spots found by location
+        migrations.RemoveIndex(
+            model_name='foodspot',
+            name='foodspot_cell_key_idx',
+        ),
+        migrations.RunSQL(COARSE_LEVELS_SQL, RESTORE_COARSE_LEVELS_SQL),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 11:40
+
+from django.db import migrations
+
+# Not a model field: the database fills it in for ORM and raw SQL inserts alike
+ADD_TXID_SQL = """
+ALTER TABLE locations_spotchange ADD COLUMN txid xid8 NOT NULL DEFAULT pg_current_xact_id();
+CREATE INDEX spotchange_txid_idx ON locations_spotchange (txid);
+"""
+
+DROP_TXID_SQL = """
+DROP INDEX IF EXISTS spotchange_txid_idx;
+ALTER TABLE locations_spotchange DROP COLUMN IF EXISTS txid;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0013_drop_cell_key_idx_coarse_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunSQL(ADD_TXID_SQL, DROP_TXID_SQL),
+    ]
@@ -1,5 +1,54 @@
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Cast
+
+from .hours import parse_opening_hours, to_multirange
+
+
+class WeeklyPeriodsField(models.Field):
+    """
+    Weekly opening periods as a PostgreSQL int4multirange of minutes since
+    Monday 00:00 (see hours.py). Python values are lists of (start, end)
+    pairs; `field__contains=minute` is the GiST-indexable `@>` operator.
+    """
+    
+    description = "Weekly opening periods"
+    
+    def db_type(self, connection):
+        return 'int4multirange'
+    
+    def from_db_value(self, value, expression, connection):
+        if value is None or not isinstance(value, str):
+            return value
+        # psycopg2 returns multiranges as text: '{[480,1320),[1920,2760)}'
+        periods = []
+        for part in value.strip('{}').split('),'):
+            if part:
+                start, end = part.strip('[)').split(',')
+                periods.append((int(start), int(end)))
+        return periods
+    
+    def get_prep_value(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        return to_multirange(value)
+
+
+@WeeklyPeriodsField.register_lookup
+class PeriodsContain(models.Lookup):
+    lookup_name = 'contains'
+    # The right-hand side is a minute, not a list of periods
+    prepare_rhs = False
+    
+    def get_db_prep_lookup(self, value, connection):
+        return '%s', [int(value)]
+    
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} @> ({rhs})::int4', [*lhs_params, *rhs_params]
 
 
 class FoodSpot(models.Model):
@@ -67,6 +116,12 @@ class FoodSpot(models.Model):
         default="9:00 AM - 10:00 PM",
         help_text="Operating hours"
     )
+    # Parsed opening_hours (see hours.py); NULL when the text is not understood
+    opening_periods = WeeklyPeriodsField(
+        null=True,
+        editable=False,
+        help_text="Weekly opening periods in minutes since Monday 00:00"
+    )
     
     # Spatial Data - CRITICAL for PostGIS
     location = models.PointField(
@@ -74,6 +129,42 @@ class FoodSpot(models.Model):
         help_text="Geographic location (longitude, latitude)"
     )
     
+    # Review aggregates (denormalized, maintained by signals.py)
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of approved reviews"
+    )
+    average_rating = models.DecimalField(
+        max_digits=3,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Average rating of approved reviews"
+    )
+    
+    # Full-text search document, maintained by a database trigger (see search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    # Web-map cell at cells.MAX_LEVEL as a Morton-coded quadkey, maintained
+    # by a database trigger (see cells.py)
+    cell_key = models.BigIntegerField(
+        null=True,
+        editable=False,
+        help_text="Quadkey of the spot's finest map cell"
+    )
+    
+    # Stable identifier from the import source, e.g. 'osm:node/123' (see ingest/)
+    source_ref = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Identifier of the imported record"
+    )
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -84,11 +175,40 @@ class FoodSpot(models.Model):
         indexes = [
             models.Index(fields=['cuisine_type']),
             models.Index(fields=['rating']),
+            # Geography expression index backing ST_DWithin radius search and
+            # <-> KNN ordering (see spatial.py)
+            GistIndex(
+                Cast('location', output_field=models.PointField(geography=True, srid=4326)),
+                name='foodspot_location_geog_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='foodspot_search_vector_idx'),
+            GistIndex(fields=['opening_periods'], name='foodspot_open_periods_idx'),
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='foodspot_name_trgm_idx'),
+            # Keyset pagination of the active list (see pagination.py)
+            models.Index(
+                fields=['-rating', 'name', 'id'],
+                condition=models.Q(is_active=True),
+                name='foodspot_list_keyset_idx',
+            ),
         ]
     
     def __str__(self):
         return f"{self.name} ({self.get_cuisine_type_display()})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember where the spot was, so a move invalidates its old map tiles
+        instance._loaded_location = instance.__dict__.get('location')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        self.opening_periods = parse_opening_hours(self.opening_hours)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'opening_hours' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'opening_periods'}
+        super().save(*args, **kwargs)
+    
     @property
     def latitude(self):
         """Get latitude from point geometry"""
@@ -148,7 +268,98 @@ class Review(models.Model):
         indexes = [
             models.Index(fields=['foodspot', '-created_at']),
             models.Index(fields=['rating']),
+            # Keyset pagination of a spot's approved reviews (see pagination.py)
+            models.Index(
+                fields=['foodspot', '-created_at', 'id'],
+                condition=models.Q(is_approved=True),
+                name='review_feed_keyset_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.reviewer_name} - {self.foodspot.name} ({self.rating}⭐)"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stats_state = instance.stats_state()
+        return instance
+    
+    def stats_state(self):
+        """Fields that feed FoodSpot.review_count/average_rating"""
+        return (self.__dict__.get('foodspot_id'), self.__dict__.get('rating'), self.__dict__.get('is_approved'))
+
+
+class DataVersion(models.Model):
+    """
+    Monotonic version counter per data scope ('foodspots', 'reviews').
+    Bumped in the same transaction as the write, so caches keyed on it can
+    never see a version without its data.
+    """
+    
+    scope = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.scope} v{self.version}"
+
+
+class SpotChange(models.Model):
+    """
+    Log of locations touched by FoodSpot writes, trimmed by prune_tile_changes.
+    The table also has a `txid` column (xid8, defaulting to the writing
+    transaction's id; migration 0014) that the ORM never sets: a cached tile
+    stamped with a snapshot stays valid while no change that snapshot could
+    not see falls inside its extent (see tiles.py).
+    """
+    
+    foodspot_id = models.BigIntegerField()
+    location = models.PointField(srid=4326)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Change #{self.pk} to spot {self.foodspot_id}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of a bulk import per source. `records_done` is committed in the
+    same transaction as the merged batch, so a resumed import restarts at
+    exactly the first record that did not reach FoodSpot.
+    """
+    
+    source = models.CharField(max_length=100, primary_key=True)
+    fingerprint = models.CharField(max_length=64, help_text="Input file size and mtime")
+    records_done = models.BigIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.source}: {self.records_done} records"
+
+
+class CellAggregate(models.Model):
+    """
+    Active spot count and rating sum per web-map cell and level, kept
+    current by a statement-level trigger on FoodSpot (see cells.py).
+    """
+    
+    level = models.PositiveSmallIntegerField()
+    x = models.IntegerField()
+    y = models.IntegerField()
+    spot_count = models.IntegerField(default=0)
+    rating_sum = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text="Sum of average_rating (or rating without reviews) of the cell's spots"
+    )
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['level', 'x', 'y'], name='cellaggregate_cell_unique'),
         ]
     
     def __str__(self):
-        return f"{self.reviewer_name} - {self.foodspot.name} ({self.rating}⭐)"
\ No newline at end of file
+        return f"Cell {self.level}/{self.x}/{self.y}: {self.spot_count} spots"
@@ -0,0 +1,122 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by the ordering values of the last row already seen,
+encoded in an opaque `cursor` parameter, instead of an OFFSET. Combined
+with a composite index matching the ordering, page N costs the same as
+page 1, and no COUNT(*) is ever issued.
+"""
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # Ordering fields; the last one must be unique (normally 'id')
+    ordering = ()
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 100)
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        # Fetch one extra row to learn whether a next page exists
+        rows = list(queryset[:self.size + 1])
+        self.has_next = len(rows) > self.size
+        rows = rows[:self.size]
+        self.next_position = self.position(rows[-1]) if self.has_next else None
+        return rows
+
+    def after(self, position):
+        """
+        Rows strictly after `position` in `ordering`. The expanded OR chain
+        handles mixed ASC/DESC orderings; the leading range is repeated as a
+        plain condition so PostgreSQL can start the index scan there.
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            op = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{op}': value})
+            equal[name] = value
+        lead = self.ordering[0]
+        lead_op = 'lte' if lead.startswith('-') else 'gte'
+        return Q(**{f'{lead.lstrip("-")}__{lead_op}': position[0]}) & condition
+
+    def position(self, obj):
+        # Rows may be model instances or values() dicts
+        if isinstance(obj, dict):
+            return [obj[field.lstrip('-')] for field in self.ordering]
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    def encode_cursor(self, position):
+        payload = json.dumps([str(value) for value in position])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, UnicodeDecodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class FoodSpotKeysetPagination(KeysetPagination):
+    ordering = ('-rating', 'name', 'id')
+
+
+class ReviewKeysetPagination(KeysetPagination):
+    ordering = ('-created_at', 'id')
+    page_size = 20
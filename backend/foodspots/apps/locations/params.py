@@ -0,0 +1,79 @@
+"""
+Request body parsing for the spatial actions, shared by the DRF viewset
+(views.py) and the async views (async_views.py).
+
+Each parser takes the decoded body (a dict) and returns the values the
+query needs. Bad input raises ValueError or TypeError: hours.OpenAtError,
+polygons.PolygonError, routes.RouteError and ParamError carry a message
+meant for the client; the views answer other errors with a generic one.
+"""
+from . import hours, polygons, routes
+
+# Caps for nearest_batch (origins per request, spots per origin)
+NEAREST_BATCH_MAX_ORIGINS = 50
+NEAREST_BATCH_MAX_LIMIT = 100
+
+
+class ParamError(ValueError):
+    """Unusable request parameters, with a message for the client"""
+
+
+def nearest(data):
+    """(lat, lng, limit, open minute) for nearest"""
+    return (
+        float(data.get('latitude')),
+        float(data.get('longitude')),
+        int(data.get('limit', 10)),
+        hours.requested_minute(data),
+    )
+
+
+def nearest_batch(data):
+    """(origins, [(lat, lng, limit, cuisine_type)]) for nearest_batch"""
+    origins = data.get('origins')
+    if not isinstance(origins, list) or not origins:
+        raise ParamError('origins must be a non-empty list')
+    if len(origins) > NEAREST_BATCH_MAX_ORIGINS:
+        raise ParamError(f'At most {NEAREST_BATCH_MAX_ORIGINS} origins per request')
+    try:
+        parsed = [
+            (
+                float(origin['latitude']),
+                float(origin['longitude']),
+                max(0, min(int(origin.get('limit', 10)), NEAREST_BATCH_MAX_LIMIT)),
+                origin.get('cuisine_type') or None,
+            )
+            for origin in origins
+        ]
+    except (KeyError, ValueError, TypeError, AttributeError) as e:
+        raise ParamError('Each origin needs a numeric latitude and longitude') from e
+    return origins, parsed
+
+
+def within_radius(data):
+    """(lat, lng, radius, cuisine_type, open minute) for within_radius"""
+    return (
+        float(data.get('latitude')),
+        float(data.get('longitude')),
+        float(data.get('radius_meters', 1000)),
+        data.get('cuisine_type', None),
+        hours.requested_minute(data),
+    )
+
+
+def within_bounds(data):
+    """(area, simplified, open minute) for within_bounds"""
+    area, simplified = polygons.prepare(polygons.parse_area(data))
+    return area, simplified, hours.requested_minute(data)
+
+
+def along_route(data):
+    """(route, simplified, distance, cuisine_type, open minute) for along_route"""
+    route, simplified = routes.prepare(routes.parse_route(data))
+    return (
+        route,
+        simplified,
+        routes.parse_distance(data.get('distance_meters')),
+        data.get('cuisine_type', None),
+        hours.requested_minute(data),
+    )
@@ -0,0 +1,109 @@
+"""
+Parsing and sanitising of client-drawn search areas.
+
+`within_bounds` accepts either the legacy `bounds` list of [lat, lng]
+points or a GeoJSON `geometry` (Polygon or MultiPolygon, holes allowed).
+Areas with more than MAX_VERTICES vertices are rejected. Invalid ones,
+such as self-intersecting drawings, are repaired with make_valid. Areas
+with more than SIMPLIFY_VERTICES vertices are simplified (topology
+preserving) until they fit. The query itself (spatial.within_area) cuts
+the area into small pieces and runs under a statement timeout.
+"""
+from django.contrib.gis.geos import GEOSException, MultiPolygon, Polygon
+
+MAX_VERTICES = 50_000
+SIMPLIFY_VERTICES = 1_000
+# Tolerance doublings tried before giving up on reaching SIMPLIFY_VERTICES
+MAX_SIMPLIFY_STEPS = 20
+
+
+class PolygonError(ValueError):
+    """The search area cannot be used"""
+
+
+def _ring(positions):
+    """Closed ring of (lng, lat) floats"""
+    try:
+        ring = [(float(lng), float(lat)) for lng, lat, *_ in positions]
+    except (TypeError, ValueError):
+        raise PolygonError('Coordinates must be numeric [longitude, latitude] pairs')
+    if any(not -180 <= lng <= 180 or not -90 <= lat <= 90 for lng, lat in ring):
+        raise PolygonError('Coordinates out of range')
+    if ring and ring[0] != ring[-1]:
+        ring.append(ring[0])
+    if len(ring) < 4:
+        raise PolygonError('Each ring needs at least 3 distinct points')
+    return ring
+
+
+def _polygons(data):
+    """Polygons of the request body, as lists of rings of positions"""
+    geometry = data.get('geometry')
+    if geometry is None:
+        bounds = data.get('bounds', [])
+        if not isinstance(bounds, list) or len(bounds) < 4:
+            raise PolygonError('Need at least 4 points')
+        try:
+            return [[[(c[1], c[0]) for c in bounds]]]
+        except (TypeError, IndexError, KeyError):
+            raise PolygonError('bounds must be a list of [latitude, longitude] points')
+    if not isinstance(geometry, dict):
+        raise PolygonError('geometry must be a GeoJSON Polygon or MultiPolygon')
+    coordinates = geometry.get('coordinates')
+    if geometry.get('type') == 'Polygon':
+        polygons = [coordinates]
+    elif geometry.get('type') == 'MultiPolygon':
+        polygons = coordinates
+    else:
+        raise PolygonError('geometry must be a GeoJSON Polygon or MultiPolygon')
+    if not isinstance(polygons, list) or not all(isinstance(rings, list) and rings for rings in polygons):
+        raise PolygonError('Malformed geometry coordinates')
+    return polygons
+
+
+def parse_area(data):
+    """Polygon or MultiPolygon (SRID 4326) described by a request body"""
+    polygons = _polygons(data)
+    vertices = sum(len(ring) for rings in polygons for ring in rings)
+    if vertices > MAX_VERTICES:
+        raise PolygonError(f'At most {MAX_VERTICES} vertices per area')
+    try:
+        parts = [Polygon(*[_ring(ring) for ring in rings], srid=4326) for rings in polygons]
+    except (GEOSException, TypeError) as e:
+        raise PolygonError(f'Invalid polygon: {e}')
+    if not parts:
+        raise PolygonError('geometry has no polygons')
+    return parts[0] if len(parts) == 1 else MultiPolygon(*parts, srid=4326)
+
+
+def _polygonal(geometry):
+    """Polygon parts of a make_valid() result, which may mix in lines and points"""
+    if geometry.geom_type == 'Polygon':
+        return [geometry] if not geometry.empty else []
+    if geometry.geom_type in ('MultiPolygon', 'GeometryCollection'):
+        return [polygon for part in geometry for polygon in _polygonal(part)]
+    return []
+
+
+def prepare(area):
+    """
+    Repair and simplify `area`. Returns (area, simplified): simplified areas
+    may include or miss spots very close to the drawn edge.
+    """
+    if not area.valid:
+        parts = _polygonal(area.make_valid())
+        if not parts:
+            raise PolygonError('Polygon has no area')
+        area = parts[0] if len(parts) == 1 else MultiPolygon(*parts, srid=4326)
+
+    if area.num_coords <= SIMPLIFY_VERTICES:
+        return area, False
+    min_x, min_y, max_x, max_y = area.extent
+    tolerance = max(max_x - min_x, max_y - min_y) / 10_000
+    simplified = area
+    for _ in range(MAX_SIMPLIFY_STEPS):
+        simplified = area.simplify(tolerance, preserve_topology=True)
+        if simplified.num_coords <= SIMPLIFY_VERTICES:
+            break
+        tolerance *= 2
+    return simplified, True
@@ -0,0 +1,130 @@
+"""
+Column projections for FoodSpot API responses.
+
+Hot read paths fetch only the columns a response needs, as plain rows,
+with coordinates and ratings already converted to floats by PostgreSQL.
+Choice labels come from a precomputed table instead of
+`get_cuisine_type_display()`, so no model instances, GEOS geometries or
+Decimals are built per row.
+"""
+from django.db.models import FloatField, Func
+from django.db.models.functions import Cast, Coalesce
+
+from .models import FoodSpot
+
+CUISINE_LABELS = dict(FoodSpot.CUISINE_CHOICES)
+
+
+def _columns():
+    return {
+        'lat_f': Func('location', function='ST_Y', output_field=FloatField()),
+        'lng_f': Func('location', function='ST_X', output_field=FloatField()),
+        'rating_f': Cast('rating', output_field=FloatField()),
+        # Falls back to the spot's own rating until it has approved reviews
+        'average_f': Cast(Coalesce('average_rating', 'rating'), output_field=FloatField()),
+    }
+
+
+SPATIAL_FIELDS = (
+    'id', 'name', 'cuisine_type', 'description', 'address', 'phone', 'rating_f',
+    'price_range', 'opening_hours', 'lat_f', 'lng_f', 'review_count', 'average_f',
+)
+
+LIST_FIELDS = (
+    'id', 'name', 'cuisine_type', 'address', 'rating', 'price_range', 'lat_f', 'lng_f',
+    'review_count', 'average_f', 'description', 'phone', 'opening_hours',
+)
+
+
+# SPATIAL_FIELDS as SQL over a FoodSpot alias `f`, for hand-written queries
+SPATIAL_COLUMNS_SQL = (
+    'f.id', 'f.name', 'f.cuisine_type', 'f.description', 'f.address', 'f.phone',
+    'f.rating::float8', 'f.price_range', 'f.opening_hours', 'ST_Y(f.location)',
+    'ST_X(f.location)', 'f.review_count', 'COALESCE(f.average_rating, f.rating)::float8',
+)
+
+
+def spatial_result(row, distance=None):
+    """Response dict for one SPATIAL_FIELDS row, with optional distance (meters)"""
+    (pk, name, cuisine_type, description, address, phone, rating, price_range,
+     opening_hours, lat, lng, review_count, average_rating) = row
+    result = {
+        'id': pk,
+        'name': name,
+        'cuisine_type': cuisine_type,
+        'cuisine_display': CUISINE_LABELS.get(cuisine_type, cuisine_type),
+        'description': description,
+        'address': address,
+        'phone': phone,
+        'rating': rating,
+        'price_range': price_range,
+        'opening_hours': opening_hours,
+        'latitude': lat,
+        'longitude': lng,
+    }
+    if distance is not None:
+        result['distance_meters'] = round(distance, 2)
+        result['distance_km'] = round(distance / 1000, 2)
+    result['review_count'] = review_count
+    result['average_rating'] = average_rating
+    return result
+
+
+def _spatial_rows(queryset, with_distance, limit):
+    fields = SPATIAL_FIELDS + ('distance',) if with_distance else SPATIAL_FIELDS
+    rows = queryset.annotate(**_columns()).values_list(*fields)
+    return rows[:limit] if limit is not None else rows
+
+
+def spatial_results(queryset, with_distance=False, limit=None):
+    """
+    Rows for the spatial actions (nearest, within_radius, within_bounds).
+    `with_distance` expects a float `distance` annotation in meters, as set
+    by the helpers in `locations.spatial`.
+    """
+    rows = _spatial_rows(queryset, with_distance, limit)
+    if with_distance:
+        return [spatial_result(row[:-1], row[-1]) for row in rows]
+    return [spatial_result(row) for row in rows]
+
+
+async def aspatial_results(queryset, with_distance=False, limit=None):
+    """spatial_results() through the async ORM"""
+    rows = _spatial_rows(queryset, with_distance, limit)
+    if with_distance:
+        return [spatial_result(row[:-1], row[-1]) async for row in rows]
+    return [spatial_result(row) async for row in rows]
+
+
+def list_values(queryset):
+    """
+    Project `queryset` to the dict rows consumed by `list_results`. The rows
+    keep the real ordering columns (rating, name, id), so keyset pagination
+    can take its cursor from them.
+    """
+    return queryset.annotate(**_columns()).values(*LIST_FIELDS)
+
+
+def list_results(rows):
+    """Render `list_values` rows exactly as FoodSpotListSerializer would"""
+    labels = CUISINE_LABELS
+    return [
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'cuisine_type': row['cuisine_type'],
+            'cuisine_display': labels.get(row['cuisine_type'], row['cuisine_type']),
+            'address': row['address'],
+            # DecimalField renders as a string; numeric(2,1) already has its scale
+            'rating': str(row['rating']),
+            'price_range': row['price_range'],
+            'latitude': row['lat_f'],
+            'longitude': row['lng_f'],
+            'review_count': row['review_count'],
+            'average_rating': row['average_f'],
+            'description': row['description'],
+            'phone': row['phone'],
+            'opening_hours': row['opening_hours'],
+        }
+        for row in rows
+    ]
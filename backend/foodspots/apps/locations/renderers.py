@@ -0,0 +1,33 @@
+"""
+JSON renderer backed by orjson when it is installed.
+
+orjson encodes the plain dict/list/float payloads produced by
+`locations.projection` several times faster than the stdlib encoder. Values
+it does not know natively (Decimal, lazy strings, GEOS objects...) go
+through DRF's own encoder, so the output matches JSONRenderer. Indented
+output (browsable API, `; indent=` media types) still uses JSONRenderer.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            # Anything orjson rejects outright (e.g. integers beyond 64 bits)
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,115 @@
+"""
+Parsing and sanitising of routes for corridor search (`along_route`).
+
+A route is either a `route` list of [lat, lng] points, like the legacy
+`bounds` of within_bounds, or a GeoJSON LineString `geometry`. Routes
+with more than MAX_VERTICES vertices or longer than MAX_LENGTH_METERS
+are rejected; routes with more than SIMPLIFY_VERTICES vertices are
+simplified until they fit. The query itself (spatial.along_route) cuts
+the line into short pieces and runs under a statement timeout.
+"""
+import math
+
+from django.contrib.gis.geos import GEOSException, LineString
+
+MAX_VERTICES = 20_000
+SIMPLIFY_VERTICES = 1_000
+# Tolerance doublings tried before giving up on reaching SIMPLIFY_VERTICES
+MAX_SIMPLIFY_STEPS = 20
+MAX_LENGTH_METERS = 100_000
+# Corridor half-width: default and upper bound
+DEFAULT_DISTANCE_METERS = 200
+MAX_DISTANCE_METERS = 2_000
+
+EARTH_RADIUS_METERS = 6_371_008.8
+
+
+class RouteError(ValueError):
+    """The route cannot be used"""
+
+
+def _positions(data):
+    """Route of the request body as (lng, lat) pairs"""
+    geometry = data.get('geometry')
+    if geometry is None:
+        points = data.get('route')
+        if not isinstance(points, list):
+            raise RouteError('route must be a list of [latitude, longitude] points')
+        try:
+            return [(point[1], point[0]) for point in points]
+        except (TypeError, IndexError, KeyError):
+            raise RouteError('route must be a list of [latitude, longitude] points')
+    if not isinstance(geometry, dict) or geometry.get('type') != 'LineString':
+        raise RouteError('geometry must be a GeoJSON LineString')
+    coordinates = geometry.get('coordinates')
+    if not isinstance(coordinates, list):
+        raise RouteError('Malformed geometry coordinates')
+    try:
+        return [(position[0], position[1]) for position in coordinates]
+    except (TypeError, IndexError, KeyError):
+        raise RouteError('Malformed geometry coordinates')
+
+
+def length_meters(positions):
+    """Great-circle length of a (lng, lat) path"""
+    total = 0.0
+    for (lng1, lat1), (lng2, lat2) in zip(positions, positions[1:]):
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        a = (math.sin((phi2 - phi1) / 2) ** 2
+             + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+        total += 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+    return total
+
+
+def parse_route(data):
+    """LineString (SRID 4326) described by a request body"""
+    positions = _positions(data)
+    if len(positions) > MAX_VERTICES:
+        raise RouteError(f'At most {MAX_VERTICES} points per route')
+    try:
+        positions = [(float(lng), float(lat)) for lng, lat in positions]
+    except (TypeError, ValueError):
+        raise RouteError('Coordinates must be numeric')
+    if any(not -180 <= lng <= 180 or not -90 <= lat <= 90 for lng, lat in positions):
+        raise RouteError('Coordinates out of range')
+    # Repeated points (GPS traces at a standstill) add nothing
+    positions = [p for i, p in enumerate(positions) if i == 0 or p != positions[i - 1]]
+    if len(positions) < 2:
+        raise RouteError('Need at least 2 distinct points')
+    if length_meters(positions) > MAX_LENGTH_METERS:
+        raise RouteError(f'Routes may be at most {MAX_LENGTH_METERS // 1000} km long')
+    try:
+        return LineString(positions, srid=4326)
+    except GEOSException as e:
+        raise RouteError(f'Invalid route: {e}')
+
+
+def parse_distance(value):
+    """Corridor half-width in meters from a request value"""
+    if value in (None, ''):
+        return DEFAULT_DISTANCE_METERS
+    try:
+        distance = float(value)
+    except (TypeError, ValueError):
+        raise RouteError('distance_meters must be a number')
+    if not 0 < distance <= MAX_DISTANCE_METERS:
+        raise RouteError(f'distance_meters must be between 0 and {MAX_DISTANCE_METERS}')
+    return distance
+
+
+def prepare(route):
+    """
+    Simplify `route` down to SIMPLIFY_VERTICES vertices. Returns (route,
+    simplified): a simplified route may shift the corridor by a few meters.
+    """
+    if route.num_coords <= SIMPLIFY_VERTICES:
+        return route, False
+    min_x, min_y, max_x, max_y = route.extent
+    tolerance = max(max_x - min_x, max_y - min_y) / 100_000
+    simplified = route
+    for _ in range(MAX_SIMPLIFY_STEPS):
+        simplified = route.simplify(tolerance, preserve_topology=True)
+        if simplified.num_coords <= SIMPLIFY_VERTICES:
+            break
+        tolerance *= 2
+    return simplified, True
@@ -0,0 +1,39 @@
+"""
+Ranked full-text + trigram search over FoodSpots.
+
+`search_vector` is maintained by a database trigger (migration 0008) with
+weights name > cuisine > description > address, and backed by a GIN index.
+A trigram GIN index on `name` catches typos and partial words the
+full-text parser would miss. Both predicates are index-assisted, so the
+query never falls back to a sequential ILIKE scan.
+"""
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import ExpressionWrapper, F, FloatField, Q
+
+from . import spatial
+
+SEARCH_CONFIG = 'english'
+
+
+def search_spots(queryset, text, origin=None):
+    """
+    Filter `queryset` to spots matching `text`, best matches first.
+    With an `origin` point, relevance decays with distance (halved at 1 km).
+    """
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    queryset = queryset.filter(
+        Q(search_vector=query) | Q(name__trigram_word_similar=text)
+    ).annotate(
+        relevance=SearchRank(F('search_vector'), query) + TrigramWordSimilarity(text, 'name'),
+    )
+    if origin is None:
+        return queryset.order_by('-relevance', 'name', 'id')
+    return queryset.alias(
+        geog=spatial.geography(),
+        distance=Distance('geog', origin),
+    ).alias(
+        score=ExpressionWrapper(
+            F('relevance') / (1.0 + F('distance') / 1000.0), output_field=FloatField()
+        ),
+    ).order_by('-score', 'name', 'id')
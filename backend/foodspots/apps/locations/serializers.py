@@ -13,6 +13,7 @@ class FoodSpotSerializer(GeoFeatureModelSerializer):
     longitude = serializers.SerializerMethodField()
     cuisine_display = serializers.CharField(source='get_cuisine_type_display', read_only=True)
     price_display = serializers.CharField(source='get_price_range_display', read_only=True)
+    average_rating = serializers.SerializerMethodField()
     
     class Meta:
         model = FoodSpot
@@ -21,7 +22,8 @@ class FoodSpotSerializer(GeoFeatureModelSerializer):
             'id', 'name', 'cuisine_type', 'cuisine_display', 
             'description', 'address', 'phone', 'website',
             'rating', 'price_range', 'price_display', 'opening_hours',
-            'latitude', 'longitude', 'is_active', 'created_at'
+            'latitude', 'longitude', 'review_count', 'average_rating',
+            'is_active', 'created_at'
         ]
     
     def get_latitude(self, obj):
@@ -29,6 +31,11 @@ class FoodSpotSerializer(GeoFeatureModelSerializer):
     
     def get_longitude(self, obj):
         return obj.location.x if obj.location else None
+    
+    def get_average_rating(self, obj):
+        if obj.average_rating is not None:
+            return float(obj.average_rating)
+        return float(obj.rating) if obj.rating else 0.0
 
 
 class FoodSpotListSerializer(serializers.ModelSerializer):
@@ -39,7 +46,6 @@ class FoodSpotListSerializer(serializers.ModelSerializer):
     cuisine_display = serializers.CharField(source='get_cuisine_type_display', read_only=True)
     latitude = serializers.SerializerMethodField()
     longitude = serializers.SerializerMethodField()
-    review_count = serializers.SerializerMethodField()
     average_rating = serializers.SerializerMethodField()
     
     class Meta:
@@ -56,33 +62,10 @@ class FoodSpotListSerializer(serializers.ModelSerializer):
     def get_longitude(self, obj):
         return obj.location.x if obj.location else None
     
-    def get_review_count(self, obj):
-        # Get from annotation if available (from queryset annotation)
-        # Use getattr to avoid triggering the @property method
-        try:
-            # Check if annotation exists (from queryset)
-            if hasattr(obj, '_state') and hasattr(obj, 'review_count'):
-                # Try to get the annotated value directly
-                count = getattr(obj, 'review_count', None)
-                if count is not None:
-                    return int(count)
-        except:
-            pass
-        # Fallback: return 0 if no reviews
-        return 0
-    
     def get_average_rating(self, obj):
-        # Get from annotation if available (from queryset annotation)
-        try:
-            # Check if annotation exists (from queryset)
-            if hasattr(obj, '_state') and hasattr(obj, 'average_rating'):
-                # Try to get the annotated value directly
-                avg = getattr(obj, 'average_rating', None)
-                if avg is not None:
-                    return float(avg)
-        except:
-            pass
-        # Fallback: use model's default rating
+        # Fall back to the spot's own rating until it has approved reviews
+        if obj.average_rating is not None:
+            return float(obj.average_rating)
         return float(obj.rating) if obj.rating else 0.0
 
 
@@ -105,6 +88,20 @@ class ReviewSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ReviewBulkItemSerializer(serializers.ModelSerializer):
+    """
+    One item of a bulk review upload. `foodspot` is a plain id here: the
+    ids of a whole batch are checked with one query (see bulk_reviews.py)
+    instead of one lookup per item.
+    """
+    
+    foodspot = serializers.IntegerField(min_value=1)
+    
+    class Meta:
+        model = Review
+        fields = ['foodspot', 'reviewer_name', 'reviewer_email', 'rating', 'comment']
+
+
 class ReviewListSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for listing reviews.
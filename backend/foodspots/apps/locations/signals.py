@@ -0,0 +1,67 @@
+"""
+Signal handlers keeping derived data in sync with FoodSpot and Review rows:
+the denormalized review aggregates, the DataVersion stamps and the
+SpotChange log used by the tile cache. Inside aggregates.batched_signals()
+the work is collected and done once for the whole batch.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import tiles, versioning
+from .aggregates import current_batch, refresh_review_stats
+from .models import FoodSpot, Review
+
+
+def _sync(scopes, changes=(), foodspot_ids=()):
+    """Bump `scopes`, log `changes` and refresh the aggregates of `foodspot_ids`"""
+    batch = current_batch()
+    if batch is not None:
+        batch.collect(scopes, changes, foodspot_ids)
+        return
+    versioning.bump(*scopes)
+    if foodspot_ids:
+        refresh_review_stats(foodspot_ids)
+    if changes:
+        tiles.record_changes(changes)
+
+
+@receiver(post_save, sender=FoodSpot)
+def foodspot_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        _sync([versioning.FOODSPOTS])
+        return
+    changes = [(instance.pk, instance.location)]
+    previous = getattr(instance, '_loaded_location', None)
+    if previous is not None and previous != instance.location:
+        changes.append((instance.pk, previous))
+    _sync([versioning.FOODSPOTS], changes)
+    instance._loaded_location = instance.location
+
+
+@receiver(post_delete, sender=FoodSpot)
+def foodspot_deleted(sender, instance, **kwargs):
+    _sync([versioning.FOODSPOTS], [(instance.pk, instance.location)])
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        # Fixture loading; run rebuild_review_stats afterwards
+        return
+    previous = getattr(instance, '_stats_state', None)
+    current = instance.stats_state()
+    if not created and previous == current:
+        # Only non-aggregate fields (comment, name...) changed
+        _sync([versioning.REVIEWS])
+        return
+    affected = {current[0]}
+    if previous:
+        # A reassigned review changes the stats of its old spot too
+        affected.add(previous[0])
+    _sync([versioning.REVIEWS], foodspot_ids=affected)
+    instance._stats_state = current
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    _sync([versioning.REVIEWS], foodspot_ids=[instance.foodspot_id])
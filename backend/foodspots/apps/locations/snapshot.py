@@ -0,0 +1,286 @@
+"""
+In-process spatial engine for `nearest` and `within_radius`.
+
+Each worker keeps a read-only snapshot of active FoodSpots bucketed into a
+uniform lat/lng grid. Queries are answered from memory; Postgres is only
+consulted to compare the 'foodspots' DataVersion stamp, at most once every
+SPATIAL_SNAPSHOT_CHECK_SECONDS, and to reload when it has moved.
+
+Distances are geodesic on the WGS84 spheroid (Vincenty), which is what
+PostGIS computes for geography ST_Distance/ST_DWithin, so results match the
+database path. Enable with SPATIAL_ENGINE=memory.
+"""
+import math
+import threading
+import time
+from array import array
+
+from django.conf import settings
+
+from . import versioning
+from .models import FoodSpot
+from .projection import CUISINE_LABELS
+
+# WGS84
+_A = 6378137.0
+_F = 1 / 298.257223563
+_B = _A * (1 - _F)
+
+# Shortest ground distance covered by one degree of latitude (at the equator)
+_MIN_METERS_PER_DEGREE = 110574.0
+# Longest (one degree of latitude at the poles)
+_MAX_METERS_PER_DEGREE = 111694.0
+
+
+def geodesic_distance(lat1, lng1, lat2, lng2):
+    """Vincenty inverse formula: distance in meters on the WGS84 spheroid"""
+    if lat1 == lat2 and lng1 == lng2:
+        return 0.0
+    L = math.radians(lng2 - lng1)
+    U1 = math.atan((1 - _F) * math.tan(math.radians(lat1)))
+    U2 = math.atan((1 - _F) * math.tan(math.radians(lat2)))
+    sinU1, cosU1 = math.sin(U1), math.cos(U1)
+    sinU2, cosU2 = math.sin(U2), math.cos(U2)
+    lam = L
+    for _ in range(200):
+        sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+        sin_sigma = math.hypot(cosU2 * sin_lam, cosU1 * sinU2 - sinU1 * cosU2 * cos_lam)
+        if sin_sigma == 0:
+            return 0.0
+        cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+        sigma = math.atan2(sin_sigma, cos_sigma)
+        sin_alpha = cosU1 * cosU2 * sin_lam / sin_sigma
+        cos2_alpha = 1 - sin_alpha ** 2
+        cos_2sigma_m = cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha if cos2_alpha else 0.0
+        C = _F / 16 * cos2_alpha * (4 + _F * (4 - 3 * cos2_alpha))
+        lam_prev = lam
+        lam = L + (1 - C) * _F * sin_alpha * (
+            sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+        )
+        if abs(lam - lam_prev) < 1e-12:
+            break
+    else:
+        # Nearly antipodal points: fall back to a spherical estimate
+        return _haversine(lat1, lng1, lat2, lng2)
+    u2 = cos2_alpha * (_A ** 2 - _B ** 2) / _B ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = B * sin_sigma * (
+        cos_2sigma_m + B / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+            - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+        )
+    )
+    return _B * A * (sigma - delta_sigma)
+
+
+def _haversine(lat1, lng1, lat2, lng2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371008.8 * math.asin(min(1.0, math.sqrt(h)))
+
+
+class SpatialSnapshot:
+    """Immutable grid index over the active FoodSpots at one data version"""
+
+    FIELDS = (
+        'id', 'name', 'cuisine_type', 'description', 'address', 'phone',
+        'rating', 'price_range', 'opening_hours', 'location',
+        'review_count', 'average_rating',
+    )
+
+    def __init__(self, rows, version, cell_degrees=0.01):
+        self.version = version
+        self.cell = cell_degrees
+        self.lats = array('d')
+        self.lngs = array('d')
+        self.cuisines = []
+        # Response fields before and after the distance keys (keeps key order
+        # identical to the PostGIS path)
+        self.payloads = []
+        self.tails = []
+        self.grid = {}
+        for row in rows:
+            (pk, name, cuisine_type, description, address, phone, rating,
+             price_range, opening_hours, location, review_count, average_rating) = row
+            index = len(self.payloads)
+            self.lats.append(location.y)
+            self.lngs.append(location.x)
+            self.cuisines.append(cuisine_type)
+            self.payloads.append({
+                'id': pk,
+                'name': name,
+                'cuisine_type': cuisine_type,
+                'cuisine_display': CUISINE_LABELS.get(cuisine_type, cuisine_type),
+                'description': description,
+                'address': address,
+                'phone': phone,
+                'rating': float(rating),
+                'price_range': price_range,
+                'opening_hours': opening_hours,
+                'latitude': location.y,
+                'longitude': location.x,
+            })
+            self.tails.append({
+                'review_count': review_count,
+                'average_rating': float(average_rating) if average_rating else float(rating),
+            })
+            self.grid.setdefault(self._cell_of(location.y, location.x), []).append(index)
+        if self.grid:
+            rows_, cols_ = zip(*self.grid)
+            self.bounds = (min(rows_), min(cols_), max(rows_), max(cols_))
+        else:
+            self.bounds = None
+
+    @classmethod
+    def load(cls):
+        # Read the stamp first: a write landing in between only costs an extra reload
+        version = versioning.current(versioning.FOODSPOTS)
+        rows = FoodSpot.objects.filter(is_active=True).order_by().values_list(*cls.FIELDS)
+        return cls(rows.iterator(chunk_size=5000), version)
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def _cell_of(self, lat, lng):
+        return (math.floor(lat / self.cell), math.floor(lng / self.cell))
+
+    def _result(self, index, distance):
+        return {
+            **self.payloads[index],
+            'distance_meters': round(distance, 2),
+            'distance_km': round(distance / 1000, 2),
+            **self.tails[index],
+        }
+
+    def _ring(self, center, radius):
+        """
+        Grid cells exactly `radius` steps away from `center` (Chebyshev),
+        clipped to the data bounds
+        """
+        row, col = center
+        min_row, min_col, max_row, max_col = self.bounds
+        if radius == 0:
+            yield center
+            return
+        cols = range(max(col - radius, min_col), min(col + radius, max_col) + 1)
+        for r in (row - radius, row + radius):
+            if min_row <= r <= max_row:
+                for c in cols:
+                    yield (r, c)
+        rows = range(max(row - radius + 1, min_row), min(row + radius - 1, max_row) + 1)
+        for c in (col - radius, col + radius):
+            if min_col <= c <= max_col:
+                for r in rows:
+                    yield (r, c)
+
+    def _search_order(self, lat, lng):
+        """
+        Yield (occupied cells, lower bound in meters on the distance to any
+        cell not yet yielded), nearest cells first.
+
+        Rings around the origin's cell start at the first one that reaches
+        the data bounds. Once the walk has visited as many cells as the
+        grid has occupied cells (an origin far from sparse data), the
+        remaining occupied cells are ordered by their distance bound
+        instead, so a query never visits more than about twice the
+        occupied cell count.
+        """
+        row, col = center = self._cell_of(lat, lng)
+        min_row, min_col, max_row, max_col = self.bounds
+        radius = max(0, min_row - row, row - max_row, min_col - col, col - max_col)
+        max_radius = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+        budget = len(self.grid)
+        while radius <= max_radius:
+            cells = []
+            for cell in self._ring(center, radius):
+                budget -= 1
+                if cell in self.grid:
+                    cells.append(cell)
+            yield cells, self._ring_clearance(lat, radius)
+            radius += 1
+            if budget < 0:
+                break
+        else:
+            return
+        # Geodesic triangle inequality over each cell's centre and (padded) half diagonal
+        half_diagonal = self.cell * _MAX_METERS_PER_DEGREE * math.sqrt(2) / 2 * 1.01
+        remaining = sorted(
+            (max(0.0, geodesic_distance(lat, lng, (r + 0.5) * self.cell, (c + 0.5) * self.cell)
+                 - half_diagonal), (r, c))
+            for r, c in self.grid
+            if max(abs(r - row), abs(c - col)) >= radius
+        )
+        for i, (_, cell) in enumerate(remaining):
+            next_bound = remaining[i + 1][0] if i + 1 < len(remaining) else math.inf
+            yield [cell], next_bound
+
+    def _ring_clearance(self, lat, radius):
+        """Lower bound (meters) on the distance to any cell beyond `radius` rings"""
+        max_lat = min(89.9, abs(lat) + (radius + 1) * self.cell)
+        lng_meters = _MIN_METERS_PER_DEGREE * math.cos(math.radians(max_lat))
+        return radius * self.cell * min(_MIN_METERS_PER_DEGREE, lng_meters) * 0.99
+
+    def nearest(self, lat, lng, limit, cuisine_type=None):
+        if not self.bounds or limit <= 0:
+            return []
+        found = []
+        for cells, clearance in self._search_order(lat, lng):
+            for cell in cells:
+                for index in self.grid[cell]:
+                    if cuisine_type and self.cuisines[index] != cuisine_type:
+                        continue
+                    found.append((geodesic_distance(lat, lng, self.lats[index], self.lngs[index]), index))
+            if len(found) >= limit:
+                found.sort()
+                del found[limit:]
+                if found[limit - 1][0] <= clearance:
+                    break
+        found.sort()
+        return [self._result(index, distance) for distance, index in found[:limit]]
+
+    def within_radius(self, lat, lng, radius_meters, cuisine_type=None):
+        if not self.bounds:
+            return []
+        # Degree bounding box of the search circle, padded for spheroid error
+        dlat = radius_meters / _MIN_METERS_PER_DEGREE * 1.01 + self.cell
+        cos_lat = max(math.cos(math.radians(min(89.9, abs(lat) + dlat))), 1e-6)
+        dlng = min(180.0, dlat / cos_lat)
+        min_row, min_col = self._cell_of(lat - dlat, lng - dlng)
+        max_row, max_col = self._cell_of(lat + dlat, lng + dlng)
+        b_min_row, b_min_col, b_max_row, b_max_col = self.bounds
+        found = []
+        for row in range(max(min_row, b_min_row), min(max_row, b_max_row) + 1):
+            for col in range(max(min_col, b_min_col), min(max_col, b_max_col) + 1):
+                for index in self.grid.get((row, col), ()):
+                    if cuisine_type and self.cuisines[index] != cuisine_type:
+                        continue
+                    distance = geodesic_distance(lat, lng, self.lats[index], self.lngs[index])
+                    if distance <= radius_meters:
+                        found.append((distance, index))
+        found.sort()
+        return [self._result(index, distance) for distance, index in found]
+
+
+_snapshot = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def enabled():
+    return getattr(settings, 'SPATIAL_ENGINE', 'postgis') == 'memory'
+
+
+def get_snapshot():
+    """Return this worker's snapshot, reloading it if the data version moved"""
+    global _snapshot, _checked_at
+    interval = getattr(settings, 'SPATIAL_SNAPSHOT_CHECK_SECONDS', 2.0)
+    if _snapshot is not None and time.monotonic() - _checked_at < interval:
+        return _snapshot
+    with _lock:
+        if _snapshot is None or time.monotonic() - _checked_at >= interval:
+            if _snapshot is None or versioning.current(versioning.FOODSPOTS) != _snapshot.version:
+                _snapshot = SpatialSnapshot.load()
+            _checked_at = time.monotonic()
+    return _snapshot
@@ -0,0 +1,217 @@
+"""
+Index-backed spatial query helpers for FoodSpot.
+
+Radius and nearest-neighbour searches run against the geography cast of
+`location`, which is covered by a GiST expression index (see FoodSpot.Meta).
+Keeping the cast expression in one place guarantees the SQL we emit matches
+the indexed expression, so PostgreSQL can use the index.
+"""
+from django.conf import settings
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.measure import D
+from django.db import connections, router
+from django.db.models import ExpressionWrapper, FloatField, Func, Value
+from django.db.models.functions import Cast
+
+from foodspots.db.timeouts import statement_timeout
+
+from .models import FoodSpot
+from .projection import SPATIAL_COLUMNS_SQL
+
+# Same expression as the GiST index in FoodSpot.Meta, for hand-written SQL
+GEOGRAPHY_SQL = 'f.location::geography(POINT,4326)'
+# Largest piece (in vertices) a search area is cut into by within_area
+SUBDIVIDE_VERTICES = 128
+# along_route densifies the route to this segment length, then cuts it
+# into pieces of ROUTE_PIECE_VERTICES vertices (about 2 km)
+ROUTE_SEGMENT_METERS = 250
+ROUTE_PIECE_VERTICES = 8
+
+
+def geography(field='location'):
+    """Cast a geometry column to geography (matches the GiST expression index)"""
+    return Cast(field, output_field=PointField(geography=True, srid=4326))
+
+
+def geography_value(point):
+    """Wrap a GEOS point as a geography literal"""
+    return Value(point, output_field=PointField(geography=True, srid=4326))
+
+
+def distance_meters(point):
+    """Geodesic distance to `point` in meters, as a plain float column"""
+    return ExpressionWrapper(Distance('geog', point), output_field=FloatField())
+
+
+class KNNDistance(Func):
+    """
+    PostGIS `<->` operator. Used in ORDER BY it triggers an index-assisted
+    K-nearest-neighbour scan instead of sorting the whole table.
+    """
+    arg_joiner = ' <-> '
+    template = '%(expressions)s'
+    output_field = FloatField()
+
+
+def nearest(queryset, point):
+    """
+    Order spots by distance to `point`, walked from the KNN index; slice the
+    result to the number of neighbours wanted. `distance` is in meters.
+    """
+    return queryset.alias(
+        geog=geography(),
+    ).annotate(
+        distance=distance_meters(point),
+    ).order_by(
+        KNNDistance('geog', geography_value(point))
+    )
+
+
+def within_radius(queryset, point, radius_meters):
+    """Return spots within `radius_meters` of `point`, ordered by distance (meters)"""
+    return queryset.alias(
+        geog=geography(),
+    ).filter(
+        geog__dwithin=(point, D(m=radius_meters))
+    ).annotate(
+        distance=distance_meters(point),
+    ).order_by('distance')
+
+
+def nearest_batch(origins):
+    """
+    Nearest spots for many origins in one round trip: a LATERAL join runs
+    one KNN index walk per origin. `origins` holds (lat, lng, limit,
+    cuisine_type or None) tuples. Returns, per origin and in input order, a
+    list of (projection.SPATIAL_FIELDS row, distance in meters) pairs. Runs
+    on the read database.
+    """
+    if not origins:
+        return []
+    lats, lngs, limits, cuisines = (list(column) for column in zip(*origins))
+    sql = f"""
+        WITH origins AS (
+            SELECT ord, lim, cuisine,
+                   ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography(POINT,4326) AS geog
+            FROM unnest(%s::float8[], %s::float8[], %s::int[], %s::text[])
+                 WITH ORDINALITY AS o(lat, lng, lim, cuisine, ord)
+        )
+        SELECT o.ord, s.*
+        FROM origins o
+        CROSS JOIN LATERAL (
+            SELECT {', '.join(SPATIAL_COLUMNS_SQL)},
+                   ST_Distance({GEOGRAPHY_SQL}, o.geog) AS distance
+            FROM {FoodSpot._meta.db_table} f
+            WHERE f.is_active
+              AND (o.cuisine IS NULL OR f.cuisine_type = o.cuisine)
+            ORDER BY {GEOGRAPHY_SQL} <-> o.geog
+            LIMIT o.lim
+        ) s
+        ORDER BY o.ord, s.distance, s.id
+    """
+    alias = router.db_for_read(FoodSpot)
+    with statement_timeout(settings.READ_STATEMENT_TIMEOUT_MS, using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(sql, [lats, lngs, limits, cuisines])
+            rows = cursor.fetchall()
+
+    results = [[] for _ in origins]
+    for row in rows:
+        results[row[0] - 1].append((row[1:-1], row[-1]))
+    return results
+
+
+def within_area(area, timeout_ms, open_minute=None):
+    """
+    Active spots inside `area` (a Polygon or MultiPolygon, holes allowed;
+    points on the edge count as inside), as projection.SPATIAL_FIELDS rows
+    ordered like the list endpoint.
+
+    ST_Subdivide cuts the area into pieces of at most SUBDIVIDE_VERTICES
+    vertices. Each piece's bounding box probes the GiST index on
+    `location` (&&), and the exact point-in-polygon test then only runs
+    against that small piece. Large or ragged areas therefore cost about
+    as much as their matching spots. The query runs on the read database
+    and is cancelled after `timeout_ms` (StatementTimeout). With
+    `open_minute` (see hours.py) only spots open at that minute match.
+    """
+    alias = router.db_for_read(FoodSpot)
+    table = FoodSpot._meta.db_table
+    params = [bytes(area.ewkb), SUBDIVIDE_VERTICES]
+    open_filter = ''
+    if open_minute is not None:
+        open_filter = 'AND s.opening_periods @> %s::int4'
+        params.append(int(open_minute))
+    sql = f"""
+        WITH pieces AS MATERIALIZED (
+            SELECT ST_Subdivide(ST_GeomFromEWKB(%s), %s) AS geom
+        )
+        SELECT {', '.join(SPATIAL_COLUMNS_SQL)}
+        FROM {table} f
+        WHERE f.id IN (
+            SELECT s.id
+            FROM pieces p
+            JOIN {table} s ON s.location && p.geom
+            WHERE s.is_active
+              AND ST_Intersects(p.geom, s.location)
+              {open_filter}
+        )
+        ORDER BY f.rating DESC, f.name, f.id
+    """
+    with statement_timeout(timeout_ms, using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+def along_route(route, distance_meters, timeout_ms, cuisine_type=None, open_minute=None):
+    """
+    Active spots within `distance_meters` of the LineString `route`, in
+    the order the route passes them. Returns (projection.SPATIAL_FIELDS
+    row, meters along the route, meters off the route) tuples.
+
+    The route is densified and cut into short pieces; each piece probes
+    the geography index with ST_DWithin, so a long diagonal route does not
+    scan its whole bounding box. ST_LineLocatePoint then places every
+    match on the route (a planar fraction scaled by the geodesic route
+    length, accurate to a few meters at city scale). Runs on the read
+    database and is cancelled after `timeout_ms` (StatementTimeout).
+    """
+    alias = router.db_for_read(FoodSpot)
+    table = FoodSpot._meta.db_table
+    filters = ''
+    params = [bytes(route.ewkb), ROUTE_SEGMENT_METERS, ROUTE_PIECE_VERTICES, distance_meters]
+    if cuisine_type:
+        filters += ' AND f.cuisine_type = %s'
+        params.append(cuisine_type)
+    if open_minute is not None:
+        filters += ' AND f.opening_periods @> %s::int4'
+        params.append(int(open_minute))
+    sql = f"""
+        WITH route AS MATERIALIZED (
+            SELECT geom, ST_Length(geom::geography) AS length
+            FROM (SELECT ST_GeomFromEWKB(%s) AS geom) r
+        ),
+        pieces AS MATERIALIZED (
+            SELECT ST_Subdivide(ST_Segmentize(geom::geography, %s)::geometry, %s)::geography AS geog
+            FROM route
+        ),
+        matches AS (
+            SELECT DISTINCT f.id
+            FROM pieces p
+            JOIN {table} f ON ST_DWithin({GEOGRAPHY_SQL}, p.geog, %s)
+            WHERE f.is_active{filters}
+        )
+        SELECT {', '.join(SPATIAL_COLUMNS_SQL)},
+               ST_LineLocatePoint(r.geom, f.location) * r.length AS along,
+               ST_Distance({GEOGRAPHY_SQL}, r.geom::geography) AS offset_meters
+        FROM matches m
+        JOIN {table} f ON f.id = m.id
+        CROSS JOIN route r
+        ORDER BY along, offset_meters, f.id
+    """
+    with statement_timeout(timeout_ms, using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(row[:-2], row[-2], row[-1]) for row in cursor.fetchall()]
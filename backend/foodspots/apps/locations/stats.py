@@ -0,0 +1,106 @@
+"""
+Dashboard statistics computed in a single pass over FoodSpot.
+
+One GROUPING SETS query yields the overall totals, the per-cuisine and the
+per-price-range groups together. The result is cached under the
+'foodspots' data version, so repeat loads cost one primary-key lookup.
+The query runs on the read database (a replica when the request has one).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router
+
+from foodspots.db.timeouts import statement_timeout
+
+from . import versioning
+from .models import FoodSpot
+
+CACHE_TIMEOUT = 3600
+
+
+def _query():
+    alias = router.db_for_read(FoodSpot)
+    with statement_timeout(settings.READ_STATEMENT_TIMEOUT_MS, using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT GROUPING(cuisine_type) AS by_cuisine,
+                       GROUPING(price_range) AS by_price,
+                       cuisine_type,
+                       price_range,
+                       count(*),
+                       avg(rating),
+                       sum(review_count),
+                       sum(average_rating * review_count),
+                       count(*) FILTER (WHERE rating = 5.0),
+                       count(*) FILTER (WHERE rating >= 4.0 AND rating < 5.0),
+                       count(*) FILTER (WHERE rating >= 3.0 AND rating < 4.0),
+                       count(*) FILTER (WHERE rating < 3.0)
+                FROM {FoodSpot._meta.db_table}
+                WHERE is_active
+                GROUP BY GROUPING SETS ((), (cuisine_type), (price_range))
+                """
+            )
+            return cursor.fetchall()
+
+
+def compute_statistics():
+    totals = None
+    cuisines = []
+    prices = []
+    for (by_cuisine, by_price, cuisine_type, price_range, count, avg_rating,
+         review_count, rating_weight, five, four, three, below) in _query():
+        row = {
+            'count': count,
+            'average_rating': round(float(avg_rating), 2) if avg_rating is not None else 0.0,
+            'review_count': int(review_count or 0),
+            'average_review_rating': (
+                round(float(rating_weight) / int(review_count), 2) if review_count else None
+            ),
+        }
+        if by_cuisine and by_price:
+            totals = dict(row, rating_distribution={
+                '5': five, '4-5': four, '3-4': three, 'below_3': below,
+            })
+        elif not by_cuisine:
+            cuisines.append((cuisine_type, row))
+        else:
+            prices.append((price_range, row))
+
+    if totals is None:
+        # No active spots: GROUPING SETS returns no rows at all
+        totals = {
+            'count': 0, 'average_rating': 0.0,
+            'rating_distribution': {'5': 0, '4-5': 0, '3-4': 0, 'below_3': 0},
+        }
+    cuisines.sort(key=lambda item: -item[1]['count'])
+    prices.sort(key=lambda item: item[0])
+
+    return {
+        'total_spots': totals['count'],
+        'average_rating': totals['average_rating'],
+        'by_cuisine': {cuisine: row['count'] for cuisine, row in cuisines},
+        'by_price_range': {price: row['count'] for price, row in prices},
+        'rating_distribution': totals['rating_distribution'],
+        'cuisine_breakdown': {
+            cuisine: {
+                'average_rating': row['average_rating'],
+                'review_count': row['review_count'],
+                'average_review_rating': row['average_review_rating'],
+            }
+            for cuisine, row in cuisines
+        },
+    }
+
+
+def get_statistics(breakdown=False):
+    """Return the dashboard statistics, served from cache when data is unchanged"""
+    version = versioning.current(versioning.FOODSPOTS)[0]
+    key = f'statistics:{version}'
+    result = cache.get(key)
+    if result is None:
+        result = compute_statistics()
+        cache.set(key, result, CACHE_TIMEOUT)
+    if not breakdown:
+        result = {k: v for k, v in result.items() if k != 'cuisine_breakdown'}
+    return result
@@ -0,0 +1,25 @@
+"""
+Record validation of the bulk import.
+"""
+from django.test import SimpleTestCase
+
+from ..ingest.transform import Rejected, encode_batch, normalize
+
+RECORD = {'ref': '42', 'name': 'Cafe', 'latitude': '53.35', 'longitude': '-6.26'}
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_source_ref_combines_source_and_id(self):
+        self.assertEqual(normalize(RECORD, 'osm')[0], 'osm:42')
+
+    def test_blank_id_is_rejected(self):
+        for ref in ('', '   ', None):
+            with self.subTest(ref=ref), self.assertRaises(Rejected) as raised:
+                normalize({**RECORD, 'ref': ref}, 'osm')
+            self.assertEqual(raised.exception.reason, 'missing id')
+
+    def test_blank_ids_are_counted_not_merged(self):
+        records = [{**RECORD, 'ref': ''}, {**RECORD, 'ref': ''}, RECORD]
+        _, loaded, rejected, consumed = encode_batch(('osm', 0, records))
+        self.assertEqual((loaded, consumed), (1, 3))
+        self.assertEqual(rejected['missing id'], 2)
@@ -0,0 +1,54 @@
+"""
+Hand-written SQL of the read-only actions runs on the replica picked for
+the request, like the ORM queries do.
+"""
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from foodspots.db import replicas
+
+from .. import cells, clusters, spatial, stats
+
+REPLICA = 'replica1'
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        replicas.use(REPLICA)
+        self.addCleanup(replicas.use, None)
+
+    def _patch(self, module):
+        """Fake `module`'s connections and statement_timeout; returns both mocks"""
+        connections = mock.MagicMock()
+        cursor = connections.__getitem__.return_value.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+        timeout = mock.MagicMock()
+        patcher = mock.patch.multiple(module, connections=connections, statement_timeout=timeout)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return connections, timeout
+
+    def assertOnReplica(self, connections, timeout):
+        connections.__getitem__.assert_called_once_with(REPLICA)
+        self.assertEqual(timeout.call_args.kwargs['using'], REPLICA)
+
+    def test_statistics_reads_from_replica(self):
+        connections, timeout = self._patch(stats)
+        stats.compute_statistics()
+        self.assertOnReplica(connections, timeout)
+
+    def test_clusters_read_from_replica(self):
+        connections, timeout = self._patch(clusters)
+        clusters._query_cells(12, (0, 0, 3, 3), None)
+        self.assertOnReplica(connections, timeout)
+
+    def test_heatmap_reads_from_replica(self):
+        connections, timeout = self._patch(cells)
+        list(cells._grouped_cells(18, (0, 0, 3, 3)))
+        self.assertOnReplica(connections, timeout)
+
+    def test_nearest_batch_reads_from_replica(self):
+        connections, timeout = self._patch(spatial)
+        spatial.nearest_batch([(53.35, -6.26, 5, None)])
+        self.assertOnReplica(connections, timeout)
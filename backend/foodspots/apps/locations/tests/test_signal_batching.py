@@ -0,0 +1,46 @@
+"""
+Bulk writes inside batched_signals() do the signal handlers' work once.
+"""
+from decimal import Decimal
+
+from django.contrib.gis.geos import Point
+from django.test import TestCase
+
+from .. import versioning
+from ..aggregates import batched_signals
+from ..models import FoodSpot, Review, SpotChange
+
+
+class SignalBatchingTests(TestCase):
+    def setUp(self):
+        self.spots = [
+            FoodSpot.objects.create(
+                name=f'Spot {i}', address='Dublin', cuisine_type='cafe',
+                location=Point(-6.26 + i / 100, 53.35, srid=4326),
+            )
+            for i in range(3)
+        ]
+        for spot in self.spots:
+            for rating in (2, 4):
+                Review.objects.create(
+                    foodspot=spot, reviewer_name='r', comment='c', rating=Decimal(rating)
+                )
+
+    def test_bulk_delete_bumps_each_scope_once(self):
+        before = versioning.current(versioning.FOODSPOTS, versioning.REVIEWS)
+        changes = SpotChange.objects.count()
+        with batched_signals():
+            FoodSpot.objects.all().delete()
+        after = versioning.current(versioning.FOODSPOTS, versioning.REVIEWS)
+        self.assertEqual(after, (before[0] + 1, before[1] + 1))
+        self.assertEqual(SpotChange.objects.count(), changes + len(self.spots))
+
+    def test_bulk_review_delete_refreshes_stats_at_exit(self):
+        spot = self.spots[0]
+        with batched_signals():
+            Review.objects.filter(foodspot=spot, rating=2).delete()
+            spot.refresh_from_db()
+            self.assertEqual(spot.review_count, 2)
+        spot.refresh_from_db()
+        self.assertEqual(spot.review_count, 1)
+        self.assertEqual(spot.average_rating, Decimal(4))
@@ -0,0 +1,74 @@
+"""
+Parity of the in-memory snapshot engine with the PostGIS queries.
+"""
+import random
+
+from django.contrib.gis.geos import Point
+from django.test import TestCase
+
+from .. import projection, spatial
+from ..benchmarks.synthetic import DUBLIN_BBOX, populate_spots
+from ..models import FoodSpot
+from ..snapshot import SpatialSnapshot
+
+LIMIT = 10
+
+
+class SnapshotParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        populate_spots(500)
+        # A lone spot far from the rest stretches the grid bounds
+        FoodSpot.objects.create(
+            name='Cork outlier', address='Cork', cuisine_type='cafe',
+            location=Point(-8.47, 51.90, srid=4326),
+        )
+
+    def setUp(self):
+        self.snapshot = SpatialSnapshot.load()
+
+    def _postgis_nearest(self, lat, lng, cuisine_type=None):
+        queryset = FoodSpot.objects.filter(is_active=True)
+        if cuisine_type:
+            queryset = queryset.filter(cuisine_type=cuisine_type)
+        return projection.spatial_results(
+            spatial.nearest(queryset, Point(lng, lat, srid=4326)), with_distance=True, limit=LIMIT,
+        )
+
+    def _postgis_radius(self, lat, lng, radius):
+        return projection.spatial_results(
+            spatial.within_radius(FoodSpot.objects.filter(is_active=True), Point(lng, lat, srid=4326), radius),
+            with_distance=True,
+        )
+
+    def assertSameResults(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        # Equidistant spots may swap places; distances must agree to the centimetre
+        for e, a in zip(expected, actual):
+            self.assertAlmostEqual(e['distance_meters'], a['distance_meters'], delta=0.01)
+        self.assertEqual(sorted(r['id'] for r in expected), sorted(r['id'] for r in actual))
+
+    def test_nearest_matches_postgis(self):
+        rng = random.Random(0)
+        min_lng, min_lat, max_lng, max_lat = DUBLIN_BBOX
+        for _ in range(25):
+            lat, lng = rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)
+            with self.subTest(lat=lat, lng=lng):
+                self.assertSameResults(self._postgis_nearest(lat, lng), self.snapshot.nearest(lat, lng, LIMIT))
+
+    def test_nearest_far_from_data_matches_postgis(self):
+        for lat, lng in [(53.35, -9.56), (53.35, -16.26), (0.0, 0.0), (-53.0, 170.0), (89.0, 0.0)]:
+            with self.subTest(lat=lat, lng=lng):
+                self.assertSameResults(self._postgis_nearest(lat, lng), self.snapshot.nearest(lat, lng, LIMIT))
+
+    def test_nearest_with_cuisine_matches_postgis(self):
+        lat, lng = 53.35, -6.26
+        self.assertSameResults(
+            self._postgis_nearest(lat, lng, 'cafe'), self.snapshot.nearest(lat, lng, LIMIT, 'cafe'),
+        )
+
+    def test_within_radius_matches_postgis(self):
+        lat, lng = 53.35, -6.26
+        self.assertSameResults(
+            self._postgis_radius(lat, lng, 750), self.snapshot.within_radius(lat, lng, 750),
+        )
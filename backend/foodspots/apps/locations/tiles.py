@@ -0,0 +1,233 @@
+"""
+Mapbox Vector Tiles for the food spot map layer, with an on-disk cache.
+
+Tiles are rendered by PostGIS (ST_AsMVT) and written to TILE_CACHE_DIR with
+the database snapshot they were rendered in. A cached tile is served as long
+as no SpotChange invisible to that snapshot lies inside the tile extent, so
+editing one spot only re-renders the tiles covering it. Every SpotChange
+row carries the id of the transaction that wrote it (migration 0014), so a
+change committed after the stamp is found even when its id is lower than
+ids that were already visible: sequence values are not handed out in
+commit order.
+
+prune_changes trims the log to a retention window. The newest transaction
+id it pruned is kept as the PRUNED_SCOPE DataVersion: tiles stamped while
+that transaction could still have been running are re-rendered.
+"""
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import DataVersion, FoodSpot, SpotChange
+
+logger = logging.getLogger(__name__)
+
+LAYER_NAME = 'foodspots'
+MAX_ZOOM = 22
+PRUNED_SCOPE = 'spot_changes_pruned_txid'
+PRUNE_BATCH_SIZE = 10_000
+# Tile files start with a format tag and the lengths of the snapshot the
+# tile was last checked against and of its ETag version, followed by both
+_HEADER = struct.Struct('>4sHH')
+_FORMAT = b'MVT3'
+# Transaction ids the snapshot `%s` could not see
+_INVISIBLE_SQL = 'txid >= pg_snapshot_xmin(%s::pg_snapshot) AND NOT pg_visible_in_snapshot(txid, %s::pg_snapshot)'
+
+
+def valid_tile(z, x, y):
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def render_tile(z, x, y):
+    """Render one tile straight from PostGIS, carrying the popup attributes"""
+    cuisine_cases = ' '.join('WHEN %s THEN %s' for _ in FoodSpot.CUISINE_CHOICES)
+    cuisine_params = [v for choice in FoodSpot.CUISINE_CHOICES for v in choice]
+    sql = f"""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+        ),
+        mvtgeom AS (
+            SELECT
+                ST_AsMVTGeom(ST_Transform(f.location, 3857), bounds.geom) AS geom,
+                f.id,
+                f.name,
+                f.cuisine_type,
+                CASE f.cuisine_type {cuisine_cases} ELSE f.cuisine_type END AS cuisine_display,
+                f.address,
+                f.phone,
+                f.rating::float8 AS rating,
+                f.price_range,
+                f.opening_hours,
+                f.review_count,
+                COALESCE(f.average_rating, f.rating)::float8 AS average_rating
+            FROM {FoodSpot._meta.db_table} f, bounds
+            WHERE f.is_active
+              AND f.location && ST_Transform(bounds.geom, 4326)
+        )
+        SELECT ST_AsMVT(mvtgeom.*, %s, 4096, 'geom') FROM mvtgeom
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [z, x, y, *cuisine_params, LAYER_NAME])
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] is not None else b''
+
+
+def _changes_since(stamp, z, x, y):
+    """
+    Return (current snapshot, whether any change the snapshot `stamp` could
+    not see touches the tile). Only changes from transactions at or after
+    the stamp's xmin are scanned. A pruned change that may have been
+    invisible to `stamp` counts as touching: it can no longer be checked.
+    """
+    with connection.cursor() as cursor:
+        # One statement, so the new stamp, the pruned mark and the log are read together
+        cursor.execute(
+            f"""
+            SELECT pg_current_snapshot()::text,
+                   COALESCE(BOOL_OR(location && ST_Transform(ST_TileEnvelope(%s, %s, %s), 4326)), false)
+                   OR COALESCE((
+                       SELECT version::text::xid8 >= pg_snapshot_xmin(%s::pg_snapshot)
+                       FROM {DataVersion._meta.db_table} WHERE scope = %s
+                   ), false)
+            FROM {SpotChange._meta.db_table}
+            WHERE {_INVISIBLE_SQL}
+            """,
+            [z, x, y, stamp, PRUNED_SCOPE, stamp, stamp],
+        )
+        return cursor.fetchone()
+
+
+def _render_stamped(z, x, y):
+    """
+    Render a tile in one REPEATABLE READ snapshot. Returns (snapshot, ETag
+    version, tile): the tile shows exactly the changes the snapshot sees.
+    """
+    nested = connection.in_atomic_block
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if not nested:
+                # Must be the first statement of the transaction
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+            cursor.execute('SELECT pg_current_snapshot()::text')
+            stamp = cursor.fetchone()[0]
+        tile = render_tile(z, x, y)
+    version = hashlib.sha1(stamp.encode()).hexdigest()[:16]
+    return stamp, version, tile
+
+
+def _cache_path(z, x, y):
+    return os.path.join(settings.TILE_CACHE_DIR, str(z), str(x), f'{y}.mvt')
+
+
+def _read_cached(path):
+    """(checked snapshot, ETag version, tile), or Nones for no usable file"""
+    try:
+        with open(path, 'rb') as fh:
+            data = fh.read()
+    except FileNotFoundError:
+        return None, None, None
+    if len(data) < _HEADER.size or not data.startswith(_FORMAT):
+        return None, None, None
+    _, stamp_size, version_size = _HEADER.unpack_from(data)
+    start = _HEADER.size
+    if len(data) < start + stamp_size + version_size:
+        return None, None, None
+    stamp = data[start:start + stamp_size].decode()
+    version = data[start + stamp_size:start + stamp_size + version_size].decode()
+    return stamp, version, data[start + stamp_size + version_size:]
+
+
+def _write_cached(path, stamp, version, tile):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write-then-rename so concurrent workers never read a partial tile
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            stamp, version = stamp.encode(), version.encode()
+            fh.write(_HEADER.pack(_FORMAT, len(stamp), len(version)))
+            fh.write(stamp)
+            fh.write(version)
+            fh.write(tile)
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.exception("Could not cache tile %s", path)
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def get_tile(z, x, y):
+    """
+    Return (version, tile bytes), from the disk cache when still valid.
+    `version` identifies the snapshot the tile was rendered in; it only
+    moves when the tile is re-rendered, so it keys the tile's ETag.
+    """
+    path = _cache_path(z, x, y)
+    stamp, version, tile = _read_cached(path)
+    if tile is not None:
+        latest, touched = _changes_since(stamp, z, x, y)
+        if not touched:
+            if latest != stamp:
+                # Still valid; restamp so the next check scans fewer changes
+                _write_cached(path, latest, version, tile)
+            return version, tile
+    stamp, version, tile = _render_stamped(z, x, y)
+    _write_cached(path, stamp, version, tile)
+    return version, tile
+
+
+def record_changes(changes):
+    """Log (foodspot_id, location) pairs touched by a write"""
+    SpotChange.objects.bulk_create([
+        SpotChange(foodspot_id=pk, location=location)
+        for pk, location in changes
+        if location is not None
+    ])
+
+
+def prune_changes(before, batch_size=PRUNE_BATCH_SIZE):
+    """
+    Delete changes logged before the datetime `before`, batch_size rows per
+    transaction. Yields the number of rows deleted by each batch.
+    """
+    cutoff = (
+        SpotChange.objects.filter(created_at__lt=before)
+        .order_by('-id').values_list('id', flat=True).first()
+    )
+    if cutoff is None:
+        return
+    while True:
+        with transaction.atomic():
+            last = list(
+                SpotChange.objects.filter(id__lte=cutoff)
+                .order_by('id').values_list('id', flat=True)[batch_size - 1:batch_size]
+            )
+            upto = last[0] if last else cutoff
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    WITH gone AS (
+                        DELETE FROM {SpotChange._meta.db_table} WHERE id <= %s RETURNING txid
+                    )
+                    SELECT count(*), max(txid)::text::bigint FROM gone
+                    """,
+                    [upto],
+                )
+                deleted, newest_txid = cursor.fetchone()
+            if deleted:
+                # Raise the mark in the same transaction as the delete
+                updated = DataVersion.objects.filter(
+                    scope=PRUNED_SCOPE, version__lt=newest_txid,
+                ).update(version=newest_txid)
+                if not updated:
+                    DataVersion.objects.get_or_create(scope=PRUNED_SCOPE, defaults={'version': newest_txid})
+        if not deleted:
+            return
+        yield deleted
+        if upto >= cutoff:
+            return
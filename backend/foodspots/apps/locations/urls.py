@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import FoodSpotViewSet, ReviewViewSet
+from . import async_views
+from .views import FoodSpotViewSet, ReviewViewSet, foodspot_tile
 
 # Create router and register viewsets
 router = DefaultRouter()
@@ -8,5 +9,12 @@ router.register(r'foodspots', FoodSpotViewSet, basename='foodspot')
 router.register(r'reviews', ReviewViewSet, basename='review')
 
 urlpatterns = [
+    path('tiles/<int:z>/<int:x>/<int:y>.mvt', foodspot_tile, name='foodspot-tile'),
+    # Async variants of the spatial actions (serve through foodspots.asgi)
+    path('async/foodspots/nearest/', async_views.nearest, name='async-foodspot-nearest'),
+    path('async/foodspots/nearest_batch/', async_views.nearest_batch, name='async-foodspot-nearest-batch'),
+    path('async/foodspots/within_radius/', async_views.within_radius, name='async-foodspot-within-radius'),
+    path('async/foodspots/within_bounds/', async_views.within_bounds, name='async-foodspot-within-bounds'),
+    path('async/foodspots/along_route/', async_views.along_route, name='async-foodspot-along-route'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Cheap, cross-process data version stamps.
+
+Every write path that changes FoodSpot or Review rows bumps the matching
+DataVersion scope. Per-process caches (snapshots, tiles, responses) compare
+stamps instead of re-querying the data itself.
+"""
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DataVersion
+
+FOODSPOTS = 'foodspots'
+REVIEWS = 'reviews'
+
+
+def bump(*scopes):
+    """Increment the version of each scope"""
+    for scope in scopes:
+        updated = DataVersion.objects.filter(scope=scope).update(
+            version=F('version') + 1, updated_at=timezone.now()
+        )
+        if not updated:
+            DataVersion.objects.get_or_create(scope=scope, defaults={'version': 1})
+
+
+def current(*scopes):
+    """Return the versions of `scopes` as a tuple, in the order given"""
+    versions = dict(
+        DataVersion.objects.filter(scope__in=scopes).values_list('scope', 'version')
+    )
+    return tuple(versions.get(scope, 0) for scope in scopes)
+
+
+def stamp(*scopes):
+    """Return (versions, last modified) for `scopes` in a single query"""
+    rows = dict(
+        (scope, (version, updated_at))
+        for scope, version, updated_at in DataVersion.objects.filter(
+            scope__in=scopes
+        ).values_list('scope', 'version', 'updated_at')
+    )
+    versions = tuple(rows.get(scope, (0, None))[0] for scope in scopes)
+    modified = [updated_at for _, updated_at in rows.values() if updated_at]
+    return versions, max(modified) if modified else None
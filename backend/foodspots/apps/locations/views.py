@@ -1,17 +1,42 @@
+from django.conf import settings
 from django.contrib.gis.geos import Point, Polygon
-from django.contrib.gis.measure import D
-from django.contrib.gis.db.models.functions import Distance
-from django.db.models import Q
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+import hashlib
 import logging
+import math
 
+from foodspots.db.timeouts import StatementTimeout
+
+from . import bulk_reviews, cells, hours, params, projection, snapshot, spatial, tiles, versioning
+from .clusters import MAX_CLUSTER_ZOOM, MAX_SPOTS, check_extent, get_clusters
+from .conditional import conditional
+from .export import EXPORT_FORMATS, stream_export
 from .models import FoodSpot, Review
+from .pagination import FoodSpotKeysetPagination, ReviewKeysetPagination
+from .search import search_spots
 from .serializers import FoodSpotListSerializer, ReviewSerializer, ReviewListSerializer
+from .stats import get_statistics
 
 logger = logging.getLogger(__name__)
 
+# Categories only change with a deploy
+CATEGORIES_VERSION = hashlib.sha1(repr(FoodSpot.CUISINE_CHOICES).encode()).hexdigest()[:12]
+
+
+def _parse_bbox(value):
+    """[min_lng, min_lat, max_lng, max_lat] from a 'bbox' query parameter"""
+    bbox = [float(v) for v in value.split(',')]
+    if len(bbox) != 4 or not all(math.isfinite(v) for v in bbox):
+        raise ValueError('bbox must be four finite numbers')
+    return bbox
+
 
 class FoodSpotViewSet(viewsets.ModelViewSet):
     """
@@ -19,6 +44,7 @@ class FoodSpotViewSet(viewsets.ModelViewSet):
     """
     queryset = FoodSpot.objects.filter(is_active=True)
     serializer_class = FoodSpotListSerializer
+    pagination_class = FoodSpotKeysetPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -27,208 +53,279 @@ class FoodSpotViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(cuisine_type=cuisine_type)
         return queryset
     
+    @conditional(versioning.FOODSPOTS)
     def list(self, request, *args, **kwargs):
         """Get all food spots"""
         try:
-            from django.db.models import Count, Avg
+            # Review aggregates are stored on FoodSpot, no join needed
             queryset = self.filter_queryset(self.get_queryset())
-            # Annotate with review counts and average ratings
-            queryset = queryset.annotate(
-                review_count=Count('reviews', filter=Q(reviews__is_approved=True)),
-                average_rating=Avg('reviews__rating', filter=Q(reviews__is_approved=True))
-            )
-            serializer = self.get_serializer(queryset, many=True)
-            logger.info(f"Returning {len(serializer.data)} food spots")
-            return Response(serializer.data)
+            page = self.paginate_queryset(projection.list_values(queryset))
+            results = projection.list_results(page)
+            logger.info("Returning %s food spots", len(results))
+            return self.get_paginated_response(results)
+        except NotFound as e:
+            return Response({'error': str(e.detail)}, status=404)
         except Exception as e:
-            logger.error(f"Error in list: {str(e)}")
+            logger.error("Error in list: %s", e)
             return Response({'error': str(e)}, status=500)
     
     @action(detail=False, methods=['get'])
+    @conditional(static_version=CATEGORIES_VERSION)
     def categories(self, request):
         """Get all cuisine categories"""
         try:
             categories = [{'value': c[0], 'label': c[1]} for c in FoodSpot.CUISINE_CHOICES]
             return Response(categories)
         except Exception as e:
-            logger.error(f"Error in categories: {str(e)}")
+            logger.error("Error in categories: %s", e)
+            return Response({'error': str(e)}, status=500)
+    
+    @action(detail=False, methods=['get'])
+    @conditional(versioning.FOODSPOTS)
+    def export(self, request):
+        """Stream the whole catalogue as NDJSON or a GeoJSON FeatureCollection"""
+        try:
+            export_format = request.query_params.get('output', 'ndjson')
+            if export_format not in EXPORT_FORMATS:
+                return Response({'error': f"output must be one of: {', '.join(EXPORT_FORMATS)}"}, status=400)
+            
+            logger.info("Streaming %s export", export_format)
+            return stream_export(self.get_queryset(), export_format)
+            
+        except Exception as e:
+            logger.error("Error in export: %s", e)
             return Response({'error': str(e)}, status=500)
     
     @action(detail=False, methods=['post'])
     def nearest(self, request):
         """SPATIAL QUERY 1: Find nearest food spots"""
         try:
-            lat = float(request.data.get('latitude'))
-            lng = float(request.data.get('longitude'))
-            limit = int(request.data.get('limit', 10))
+            lat, lng, limit, open_minute = params.nearest(request.data)
             
-            logger.info(f"Finding nearest {limit} spots to ({lat}, {lng})")
+            logger.info("Finding nearest %s spots to (%s, %s)", limit, lat, lng)
             
-            from django.db.models import Count, Avg
-            user_location = Point(lng, lat, srid=4326)
+            # The in-memory snapshot has no opening hours
+            if snapshot.enabled() and open_minute is None:
+                results = snapshot.get_snapshot().nearest(lat, lng, limit)
+                logger.info("Found %s nearest spots (in-memory)", len(results))
+                return Response(results)
             
-            nearest_spots = FoodSpot.objects.filter(is_active=True).annotate(
-                distance=Distance('location', user_location),
-                review_count=Count('reviews', filter=Q(reviews__is_approved=True)),
-                average_rating=Avg('reviews__rating', filter=Q(reviews__is_approved=True))
-            ).order_by('distance')[:limit]
+            user_location = Point(lng, lat, srid=4326)
             
-            results = []
-            for spot in nearest_spots:
-                results.append({
-                    'id': spot.id,
-                    'name': spot.name,
-                    'cuisine_type': spot.cuisine_type,
-                    'cuisine_display': spot.get_cuisine_type_display(),
-                    'description': spot.description,
-                    'address': spot.address,
-                    'phone': spot.phone,
-                    'rating': float(spot.rating),
-                    'price_range': spot.price_range,
-                    'opening_hours': spot.opening_hours,
-                    'latitude': spot.location.y,
-                    'longitude': spot.location.x,
-                    'distance_meters': round(spot.distance.m, 2),
-                    'distance_km': round(spot.distance.km, 2),
-                    'review_count': spot.review_count or 0,
-                    'average_rating': float(spot.average_rating) if spot.average_rating else float(spot.rating)
-                })
+            # KNN walk of the geography index, projected straight to rows
+            results = projection.spatial_results(
+                spatial.nearest(hours.open_at(FoodSpot.objects.filter(is_active=True), open_minute), user_location),
+                with_distance=True,
+                limit=limit,
+            )
             
-            logger.info(f"Found {len(results)} nearest spots")
+            logger.info("Found %s nearest spots", len(results))
             return Response(results)
             
+        except hours.OpenAtError as e:
+            return Response({'error': str(e)}, status=400)
         except (ValueError, TypeError) as e:
-            logger.error(f"Invalid parameters: {str(e)}")
+            logger.error("Invalid parameters: %s", e)
             return Response({'error': 'Invalid latitude or longitude'}, status=400)
         except Exception as e:
-            logger.error(f"Error in nearest: {str(e)}")
+            logger.error("Error in nearest: %s", e)
+            return Response({'error': str(e)}, status=500)
+    
+    @action(detail=False, methods=['post'])
+    def nearest_batch(self, request):
+        """SPATIAL QUERY 1b: Nearest food spots for many origins in one request"""
+        try:
+            origins, parsed = params.nearest_batch(request.data)
+            
+            logger.info("Finding nearest spots for %s origins", len(parsed))
+            
+            if snapshot.enabled():
+                spatial_snapshot = snapshot.get_snapshot()
+                spots = [spatial_snapshot.nearest(*origin) for origin in parsed]
+            else:
+                # One LATERAL KNN query for every origin
+                spots = [
+                    [projection.spatial_result(row, distance) for row, distance in rows]
+                    for rows in spatial.nearest_batch(parsed)
+                ]
+            
+            results = [
+                {
+                    'key': origin.get('key', index),
+                    'latitude': lat,
+                    'longitude': lng,
+                    'results': origin_spots,
+                }
+                for index, (origin, (lat, lng, _, _), origin_spots) in enumerate(zip(origins, parsed, spots))
+            ]
+            return Response({'results': results})
+            
+        except params.ParamError as e:
+            logger.error("Invalid parameters: %s", e)
+            return Response({'error': str(e)}, status=400)
+        except Exception as e:
+            logger.error("Error in nearest_batch: %s", e)
             return Response({'error': str(e)}, status=500)
     
     @action(detail=False, methods=['post'])
     def within_radius(self, request):
         """SPATIAL QUERY 2: Find spots within radius"""
         try:
-            lat = float(request.data.get('latitude'))
-            lng = float(request.data.get('longitude'))
-            radius = float(request.data.get('radius_meters', 1000))
-            cuisine_type = request.data.get('cuisine_type', None)
+            lat, lng, radius, cuisine_type, open_minute = params.within_radius(request.data)
             
-            logger.info(f"Searching within {radius}m of ({lat}, {lng}), cuisine={cuisine_type}")
+            logger.info("Searching within %sm of (%s, %s), cuisine=%s", radius, lat, lng, cuisine_type)
             
-            from django.db.models import Count, Avg
-            user_location = Point(lng, lat, srid=4326)
+            if snapshot.enabled() and open_minute is None:
+                results = snapshot.get_snapshot().within_radius(lat, lng, radius, cuisine_type)
+                logger.info("Found %s spots within radius (in-memory)", len(results))
+                return Response(results)
             
-            # Use buffer distance properly
-            spots = FoodSpot.objects.filter(is_active=True).annotate(
-                distance=Distance('location', user_location),
-                review_count=Count('reviews', filter=Q(reviews__is_approved=True)),
-                average_rating=Avg('reviews__rating', filter=Q(reviews__is_approved=True))
-            ).filter(
-                distance__lte=D(m=radius)
-            ).order_by('distance')
+            user_location = Point(lng, lat, srid=4326)
             
+            queryset = FoodSpot.objects.filter(is_active=True)
             if cuisine_type:
-                spots = spots.filter(cuisine_type=cuisine_type)
+                queryset = queryset.filter(cuisine_type=cuisine_type)
+            queryset = hours.open_at(queryset, open_minute)
             
-            results = []
-            for spot in spots:
-                results.append({
-                    'id': spot.id,
-                    'name': spot.name,
-                    'cuisine_type': spot.cuisine_type,
-                    'cuisine_display': spot.get_cuisine_type_display(),
-                    'description': spot.description,
-                    'address': spot.address,
-                    'phone': spot.phone,
-                    'rating': float(spot.rating),
-                    'price_range': spot.price_range,
-                    'opening_hours': spot.opening_hours,
-                    'latitude': spot.location.y,
-                    'longitude': spot.location.x,
-                    'distance_meters': round(spot.distance.m, 2),
-                    'distance_km': round(spot.distance.km, 2),
-                    'review_count': spot.review_count or 0,
-                    'average_rating': float(spot.average_rating) if spot.average_rating else float(spot.rating)
-                })
+            # ST_DWithin on the indexed geography cast prefilters candidates
+            results = projection.spatial_results(
+                spatial.within_radius(queryset, user_location, radius),
+                with_distance=True,
+            )
             
-            logger.info(f"Found {len(results)} spots within radius")
+            logger.info("Found %s spots within radius", len(results))
             return Response(results)
             
+        except hours.OpenAtError as e:
+            return Response({'error': str(e)}, status=400)
         except (ValueError, TypeError) as e:
-            logger.error(f"Invalid parameters: {str(e)}")
+            logger.error("Invalid parameters: %s", e)
             return Response({'error': 'Invalid parameters'}, status=400)
         except Exception as e:
-            logger.error(f"Error in within_radius: {str(e)}")
+            logger.error("Error in within_radius: %s", e)
             return Response({'error': str(e)}, status=500)
     
     @action(detail=False, methods=['post'])
     def within_bounds(self, request):
-        """SPATIAL QUERY 3: Find spots within polygon bounds"""
+        """SPATIAL QUERY 3: Find spots within a drawn polygon or multipolygon"""
         try:
-            bounds = request.data.get('bounds', [])
+            area, simplified, open_minute = params.within_bounds(request.data)
             
-            if len(bounds) < 4:
-                return Response({'error': 'Need at least 4 points'}, status=400)
+            logger.info("Searching within %s with %s points%s", area.geom_type, area.num_coords,
+                        " (simplified)" if simplified else "")
             
-            logger.info(f"Searching within polygon with {len(bounds)} points")
+            results = [
+                projection.spatial_result(row)
+                for row in spatial.within_area(area, settings.POLYGON_STATEMENT_TIMEOUT_MS, open_minute)
+            ]
             
-            points = [(float(c[1]), float(c[0])) for c in bounds]
-            if points[0] != points[-1]:
-                points.append(points[0])
+            logger.info("Found %s spots within bounds", len(results))
+            return Response(results)
             
-            from django.db.models import Count, Avg
-            polygon = Polygon(points, srid=4326)
-            spots = FoodSpot.objects.filter(is_active=True, location__within=polygon).annotate(
-                review_count=Count('reviews', filter=Q(reviews__is_approved=True)),
-                average_rating=Avg('reviews__rating', filter=Q(reviews__is_approved=True))
-            )
+        except StatementTimeout:
+            logger.warning("Polygon search timed out after %s ms", settings.POLYGON_STATEMENT_TIMEOUT_MS)
+            return Response({'error': 'Search area too complex, draw a simpler or smaller area'}, status=400)
+        except Exception as e:
+            logger.error("Error in within_bounds: %s", e)
+            return Response({'error': str(e)}, status=400)
+    
+    @action(detail=False, methods=['post'])
+    def along_route(self, request):
+        """SPATIAL QUERY 3b: Find spots along a route, in route order"""
+        try:
+            route, simplified, distance, cuisine_type, open_minute = params.along_route(request.data)
+            
+            logger.info("Searching within %sm of a route with %s points%s", distance, route.num_coords,
+                        " (simplified)" if simplified else "")
             
             results = []
-            for spot in spots:
-                results.append({
-                    'id': spot.id,
-                    'name': spot.name,
-                    'cuisine_type': spot.cuisine_type,
-                    'cuisine_display': spot.get_cuisine_type_display(),
-                    'description': spot.description,
-                    'address': spot.address,
-                    'phone': spot.phone,
-                    'rating': float(spot.rating),
-                    'price_range': spot.price_range,
-                    'opening_hours': spot.opening_hours,
-                    'latitude': spot.location.y,
-                    'longitude': spot.location.x,
-                    'review_count': spot.review_count or 0,
-                    'average_rating': float(spot.average_rating) if spot.average_rating else float(spot.rating)
+            for row, along, offset in spatial.along_route(
+                route, distance, settings.ROUTE_STATEMENT_TIMEOUT_MS, cuisine_type, open_minute,
+            ):
+                result = projection.spatial_result(row, offset)
+                result['along_meters'] = round(along, 2)
+                results.append(result)
+            
+            logger.info("Found %s spots along route", len(results))
+            return Response(results)
+            
+        except StatementTimeout:
+            logger.warning("Route search timed out after %s ms", settings.ROUTE_STATEMENT_TIMEOUT_MS)
+            return Response({'error': 'Route too long or complex, try a shorter route'}, status=400)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        except Exception as e:
+            logger.error("Error in along_route: %s", e)
+            return Response({'error': str(e)}, status=500)
+    
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """SPATIAL QUERY 4: Marker clusters for a bounding box and zoom level"""
+        try:
+            bbox = _parse_bbox(request.query_params.get('bbox', ''))
+            zoom = int(request.query_params.get('zoom'))
+            if len(bbox) != 4 or not 0 <= zoom <= 22:
+                return Response({'error': 'bbox (min_lng,min_lat,max_lng,max_lat) and zoom (0-22) required'}, status=400)
+            cuisine_type = request.query_params.get('cuisine_type', None)
+            
+            if zoom >= MAX_CLUSTER_ZOOM:
+                # Close enough to show every spot individually, for a viewport-sized bbox
+                check_extent(bbox, zoom)
+                area = Polygon.from_bbox(bbox)
+                area.srid = 4326
+                spots = self.get_queryset().filter(location__intersects=area)
+                results = projection.list_results(projection.list_values(spots)[:MAX_SPOTS + 1])
+                truncated = len(results) > MAX_SPOTS
+                return Response({
+                    'zoom': zoom, 'clustered': False, 'truncated': truncated, 'results': results[:MAX_SPOTS],
                 })
             
-            logger.info(f"Found {len(results)} spots within bounds")
-            return Response(results)
+            results = get_clusters(bbox, zoom, cuisine_type)
+            logger.info("Returning %s clusters at zoom %s", len(results), zoom)
+            return Response({'zoom': zoom, 'clustered': True, 'results': results})
             
+        except (ValueError, TypeError) as e:
+            logger.error("Invalid parameters: %s", e)
+            return Response({'error': f'Invalid parameters: {str(e)}'}, status=400)
         except Exception as e:
-            logger.error(f"Error in within_bounds: {str(e)}")
-            return Response({'error': str(e)}, status=400)
+            logger.error("Error in clusters: %s", e)
+            return Response({'error': str(e)}, status=500)
+    
+    @action(detail=False, methods=['get'])
+    @conditional(versioning.FOODSPOTS)
+    def heatmap(self, request):
+        """SPATIAL QUERY 5: Spot density and average rating per map cell"""
+        try:
+            bbox = _parse_bbox(request.query_params.get('bbox', ''))
+            zoom = int(request.query_params.get('zoom'))
+            if len(bbox) != 4 or not 0 <= zoom <= 22:
+                return Response({'error': 'bbox (min_lng,min_lat,max_lng,max_lat) and zoom (0-22) required'}, status=400)
+            
+            # Served from the trigger-maintained CellAggregate table up to its finest level
+            level, results = cells.get_heatmap(bbox, zoom)
+            logger.info("Returning %s heatmap cells at zoom %s", len(results), zoom)
+            return Response({'zoom': zoom, 'level': level, 'results': results})
+            
+        except (ValueError, TypeError) as e:
+            logger.error("Invalid parameters: %s", e)
+            return Response({'error': f'Invalid parameters: {str(e)}'}, status=400)
+        except Exception as e:
+            logger.error("Error in heatmap: %s", e)
+            return Response({'error': str(e)}, status=500)
     
     @action(detail=False, methods=['get'])
+    @conditional(versioning.FOODSPOTS, clock=hours.open_now_stamp)
     def search(self, request):
-        """Search food spots by name, cuisine, or description"""
+        """Ranked search of food spots by name, cuisine, description or address"""
         try:
             query = request.query_params.get('q', '').strip()
             if not query:
                 return Response({'error': 'Search query required'}, status=400)
             
-            logger.info(f"Searching for: {query}")
+            logger.info("Searching for: %s", query)
             
             queryset = FoodSpot.objects.filter(is_active=True)
             
-            # Search in name, description, or address
-            from django.db.models import Q
-            queryset = queryset.filter(
-                Q(name__icontains=query) |
-                Q(description__icontains=query) |
-                Q(address__icontains=query)
-            )
-            
             # Optional filters
             cuisine_type = request.query_params.get('cuisine_type', None)
             if cuisine_type:
@@ -245,79 +342,61 @@ class FoodSpotViewSet(viewsets.ModelViewSet):
             if price_range:
                 queryset = queryset.filter(price_range=price_range)
             
-            serializer = self.get_serializer(queryset, many=True)
-            logger.info(f"Found {len(serializer.data)} results for query: {query}")
-            return Response(serializer.data)
+            try:
+                queryset = hours.open_at(queryset, hours.requested_minute(request.query_params))
+            except hours.OpenAtError as e:
+                return Response({'error': str(e)}, status=400)
+            
+            # Optional location to favour nearby matches
+            origin = None
+            lat = request.query_params.get('latitude', None)
+            lng = request.query_params.get('longitude', None)
+            if lat and lng:
+                try:
+                    origin = Point(float(lng), float(lat), srid=4326)
+                except ValueError:
+                    return Response({'error': 'Invalid latitude or longitude'}, status=400)
+            
+            # Ranked full-text + trigram match over name, cuisine, description, address
+            queryset = search_spots(queryset, query, origin)
+            
+            results = projection.list_results(projection.list_values(queryset))
+            logger.info("Found %s results for query: %s", len(results), query)
+            return Response(results)
             
         except Exception as e:
-            logger.error(f"Error in search: {str(e)}")
+            logger.error("Error in search: %s", e)
             return Response({'error': str(e)}, status=500)
     
     @action(detail=False, methods=['get'])
+    @conditional(versioning.FOODSPOTS)
     def statistics(self, request):
-        """Get statistics about food spots"""
+        """Get statistics about food spots (single query, cached per data version)"""
         try:
-            from django.db.models import Count, Avg, Q
-            
-            total = FoodSpot.objects.filter(is_active=True).count()
-            
-            # By cuisine
-            cuisine_stats = FoodSpot.objects.filter(is_active=True).values('cuisine_type').annotate(
-                count=Count('id')
-            ).order_by('-count')
-            
-            cuisine_dict = {}
-            for stat in cuisine_stats:
-                cuisine_dict[stat['cuisine_type']] = stat['count']
-            
-            # By price range
-            price_stats = FoodSpot.objects.filter(is_active=True).values('price_range').annotate(
-                count=Count('id')
-            ).order_by('price_range')
-            
-            price_dict = {}
-            for stat in price_stats:
-                price_dict[stat['price_range']] = stat['count']
-            
-            # Average rating
-            avg_rating = FoodSpot.objects.filter(is_active=True).aggregate(
-                avg_rating=Avg('rating')
-            )['avg_rating'] or 0
-            
-            # Rating distribution
-            rating_dist = {
-                '5': FoodSpot.objects.filter(is_active=True, rating=5.0).count(),
-                '4-5': FoodSpot.objects.filter(is_active=True, rating__gte=4.0, rating__lt=5.0).count(),
-                '3-4': FoodSpot.objects.filter(is_active=True, rating__gte=3.0, rating__lt=4.0).count(),
-                'below_3': FoodSpot.objects.filter(is_active=True, rating__lt=3.0).count(),
-            }
-            
-            return Response({
-                'total_spots': total,
-                'average_rating': round(float(avg_rating), 2),
-                'by_cuisine': cuisine_dict,
-                'by_price_range': price_dict,
-                'rating_distribution': rating_dist
-            })
+            breakdown = request.query_params.get('breakdown', '').lower() in ('1', 'true', 'yes')
+            return Response(get_statistics(breakdown=breakdown))
             
         except Exception as e:
-            logger.error(f"Error in statistics: {str(e)}")
+            logger.error("Error in statistics: %s", e)
             return Response({'error': str(e)}, status=500)
     
     @action(detail=True, methods=['get', 'post'])
+    @conditional(versioning.FOODSPOTS, versioning.REVIEWS)
     def reviews(self, request, pk=None):
         """Get or create reviews for a food spot"""
         try:
             foodspot = self.get_object()
             
             if request.method == 'GET':
-                # Get all approved reviews for this food spot
+                # Get approved reviews for this food spot, newest first
                 reviews = Review.objects.filter(
                     foodspot=foodspot,
                     is_approved=True
-                ).order_by('-created_at')
-                serializer = ReviewListSerializer(reviews, many=True)
-                return Response(serializer.data)
+                )
+                paginator = ReviewKeysetPagination()
+                page = paginator.paginate_queryset(reviews, request, view=self)
+                serializer = ReviewListSerializer(page, many=True)
+                return paginator.get_paginated_response(serializer.data)
             
             elif request.method == 'POST':
                 # Create a new review
@@ -327,15 +406,17 @@ class FoodSpotViewSet(viewsets.ModelViewSet):
                 
                 if serializer.is_valid():
                     serializer.save()
-                    logger.info(f"Review created for {foodspot.name} by {data.get('reviewer_name')}")
+                    logger.info("Review created for %s by %s", foodspot.name, data.get('reviewer_name'))
                     return Response(serializer.data, status=status.HTTP_201_CREATED)
                 else:
                     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
                     
-        except FoodSpot.DoesNotExist:
+        except (FoodSpot.DoesNotExist, Http404):
             return Response({'error': 'Food spot not found'}, status=status.HTTP_404_NOT_FOUND)
+        except NotFound as e:
+            return Response({'error': str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Error in reviews: {str(e)}")
+            logger.error("Error in reviews: %s", e)
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
@@ -357,14 +438,39 @@ class ReviewViewSet(viewsets.ModelViewSet):
             serializer = self.get_serializer(data=request.data)
             if serializer.is_valid():
                 serializer.save(is_approved=True)
-                logger.info(f"Review created: {serializer.data}")
+                logger.info("Review created: %s", serializer.data)
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Error creating review: {str(e)}")
+            logger.error("Error creating review: %s", e)
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create many reviews in one transaction, reporting invalid items by index"""
+        try:
+            items = request.data.get('reviews') if isinstance(request.data, dict) else request.data
+            if not isinstance(items, list) or not items:
+                return Response({'error': 'reviews must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+            if len(items) > bulk_reviews.MAX_ITEMS:
+                return Response({'error': f'At most {bulk_reviews.MAX_ITEMS} reviews per request'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            
+            created, errors = bulk_reviews.ingest(items)
+            logger.info("Bulk review upload: %s created, %s rejected", len(created), len(errors))
+            return Response(
+                {
+                    'created': [{'index': index, 'id': review.pk} for index, review in created],
+                    'errors': [{'index': index, 'errors': item_errors} for index, item_errors in errors],
+                },
+                status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            logger.error("Error in bulk review upload: %s", e)
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['get'])
+    @conditional(versioning.REVIEWS)
     def by_foodspot(self, request):
         """Get reviews for a specific food spot"""
         try:
@@ -375,10 +481,34 @@ class ReviewViewSet(viewsets.ModelViewSet):
             reviews = Review.objects.filter(
                 foodspot_id=foodspot_id,
                 is_approved=True
-            ).order_by('-created_at')
+            )
             
-            serializer = ReviewListSerializer(reviews, many=True)
-            return Response(serializer.data)
+            paginator = ReviewKeysetPagination()
+            page = paginator.paginate_queryset(reviews, request, view=self)
+            serializer = ReviewListSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        except NotFound as e:
+            return Response({'error': str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Error getting reviews by foodspot: {str(e)}")
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            logger.error("Error getting reviews by foodspot: %s", e)
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@require_GET
+def foodspot_tile(request, z, x, y):
+    """Mapbox Vector Tile of active food spots (layer 'foodspots')"""
+    if not tiles.valid_tile(z, x, y):
+        return HttpResponse(status=404)
+    try:
+        version, tile = tiles.get_tile(z, x, y)
+    except Exception as e:
+        logger.error("Error rendering tile %s/%s/%s: %s", z, x, y, e)
+        return HttpResponse(status=500)
+    # The version only moves when the tile is re-rendered
+    etag = quote_etag(f'{z}-{x}-{y}-{version}')
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(tile, content_type='application/vnd.mapbox-vector-tile')
+    response.headers['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
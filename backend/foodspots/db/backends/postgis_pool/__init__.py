@@ -0,0 +1,8 @@
+"""
+PostGIS backend that borrows connections from a per-process pool.
+
+Use ENGINE 'foodspots.db.backends.postgis_pool' with CONN_MAX_AGE 0:
+Django then "closes" its connection at the end of every request, which
+returns it to the pool. Pool options live under DATABASES[alias]['POOL']
+(see pool.ConnectionPool).
+"""
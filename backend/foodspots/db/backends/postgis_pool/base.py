@@ -0,0 +1,30 @@
+import os
+
+from django.contrib.gis.db.backends.postgis.base import DatabaseWrapper as PostGISDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import get_pool
+
+
+class DatabaseWrapper(PostGISDatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        factory = lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)  # noqa: E731
+        self._connection_pool = get_pool(self.alias, factory, self.settings_dict.get('POOL'))
+        connection = self._connection_pool.checkout()
+        # The parent sets this while connecting; reused connections skip that step
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = self._connection_pool
+        if pool.pid != os.getpid():
+            # Inherited across fork: the socket belongs to the parent process
+            return
+        broken = self.errors_occurred and not self.is_usable()
+        with self.wrap_database_errors:
+            pool.checkin(self.connection, broken=broken)
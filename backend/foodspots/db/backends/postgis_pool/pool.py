@@ -0,0 +1,282 @@
+"""
+Thread-safe psycopg2 connection pool with health checks and metrics.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+# Upper bounds (seconds) of the checkout wait-time histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float('inf'))
+
+DEFAULTS = {
+    'MIN_SIZE': 2,
+    'MAX_SIZE': 20,
+    # Seconds to wait for a free connection before giving up
+    'TIMEOUT': 10.0,
+    # Idle connections beyond MIN_SIZE are closed after this many seconds
+    'MAX_IDLE': 300.0,
+    # Connections are recycled after this many seconds
+    'MAX_LIFETIME': 3600.0,
+}
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded pool of raw DB-API connections created by `factory`. Checkout
+    hands out the most recently returned connection (keeping a warm core)
+    and blocks up to TIMEOUT seconds when MAX_SIZE connections are in use.
+    Returned connections are reset to a fresh session (DISCARD ALL) and
+    health-checked again before every reuse.
+    """
+
+    def __init__(self, name, factory, options=None):
+        self.name = name
+        self.factory = factory
+        options = {**DEFAULTS, **(options or {})}
+        self.min_size = int(options['MIN_SIZE'])
+        self.max_size = int(options['MAX_SIZE'])
+        self.timeout = float(options['TIMEOUT'])
+        self.max_idle = float(options['MAX_IDLE'])
+        self.max_lifetime = float(options['MAX_LIFETIME'])
+        self.pid = os.getpid()
+
+        self._condition = threading.Condition()
+        # (connection, created_at, returned_at), most recently returned last
+        self._idle = deque()
+        self._created_at = {}
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self.counters = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'connections_opened': 0,
+            'connections_closed': 0,
+            'health_check_failures': 0,
+        }
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_histogram = [0] * len(WAIT_BUCKETS)
+
+    # Checkout / checkin
+
+    def checkout(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        while True:
+            candidate = None
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"Connection pool '{self.name}' exhausted: {self.max_size} connections "
+                            f"in use for {self.timeout:g}s"
+                        )
+                    waited = True
+                    self._waiting += 1
+                    try:
+                        self._condition.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    candidate = self._idle.pop()
+                else:
+                    self._size += 1
+                self._in_use += 1
+
+            if candidate is not None:
+                connection, created_at, _ = candidate
+                if self._healthy(connection, created_at):
+                    break
+                self._discard(connection, in_use=True)
+                continue
+            try:
+                connection = self.factory()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._created_at[id(connection)] = time.monotonic()
+                self.counters['connections_opened'] += 1
+            break
+
+        self._record_wait(time.monotonic() - start, waited)
+        return connection
+
+    def checkin(self, connection, broken=False):
+        if not broken:
+            broken = not self._reset(connection)
+        now = time.monotonic()
+        created_at = self._created_at.get(id(connection), now)
+        if broken or now - created_at > self.max_lifetime:
+            self._discard(connection, in_use=True)
+            return
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append((connection, created_at, now))
+            self._prune_idle(now)
+            self._condition.notify()
+
+    def prefill(self):
+        """Open connections until MIN_SIZE exist"""
+        while True:
+            with self._condition:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                connection = self.factory()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                raise
+            now = time.monotonic()
+            with self._condition:
+                self._created_at[id(connection)] = now
+                self.counters['connections_opened'] += 1
+                self._idle.append((connection, now, now))
+                self._condition.notify()
+
+    # Internals
+
+    def _healthy(self, connection, created_at):
+        now = time.monotonic()
+        if connection.closed or now - created_at > self.max_lifetime:
+            return False
+        # Even a just-returned connection may have been cut by the server
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except psycopg2.Error:
+            with self._condition:
+                self.counters['health_check_failures'] += 1
+            return False
+
+    def _reset(self, connection):
+        """
+        Leave `connection` idle outside any transaction, with no session state
+        (settings, prepared statements, temp tables, advisory locks) left by
+        the last borrower; False if unusable
+        """
+        if connection.closed:
+            return False
+        try:
+            status = connection.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            # DISCARD ALL cannot run inside a transaction block
+            autocommit = connection.autocommit
+            connection.autocommit = True
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('DISCARD ALL')
+            finally:
+                connection.autocommit = autocommit
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, connection, in_use):
+        with self._condition:
+            self._size -= 1
+            if in_use:
+                self._in_use -= 1
+            self._created_at.pop(id(connection), None)
+            self.counters['connections_closed'] += 1
+            self._condition.notify()
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def _prune_idle(self, now):
+        # Oldest-returned connections sit at the left; keep MIN_SIZE open
+        while self._idle and self._size > self.min_size and now - self._idle[0][2] > self.max_idle:
+            connection, _, _ = self._idle.popleft()
+            self._size -= 1
+            self._created_at.pop(id(connection), None)
+            self.counters['connections_closed'] += 1
+            try:
+                connection.close()
+            except psycopg2.Error:
+                pass
+
+    def _record_wait(self, seconds, waited):
+        with self._condition:
+            self.counters['checkouts'] += 1
+            if waited:
+                self.counters['waits'] += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for index, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_histogram[index] += 1
+                    break
+
+    # Metrics
+
+    def stats(self):
+        with self._condition:
+            return {
+                'name': self.name,
+                'pid': self.pid,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                **self.counters,
+                'wait_seconds_total': round(self.wait_seconds_total, 6),
+                'wait_seconds_max': round(self.wait_seconds_max, 6),
+                'wait_histogram': {
+                    ('+Inf' if bound == float('inf') else str(bound)): count
+                    for bound, count in zip(WAIT_BUCKETS, self.wait_histogram)
+                },
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name, factory, options=None):
+    """Return this process's pool called `name`, creating it on first use"""
+    pool = _pools.get(name)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pools_lock:
+        pool = _pools.get(name)
+        # A forked child must not share the parent's sockets: start afresh
+        if pool is None or pool.pid != os.getpid():
+            pool = ConnectionPool(name, factory, options)
+            _pools[name] = pool
+            created = True
+        else:
+            created = False
+    if created:
+        pool.prefill()
+    return pool
+
+
+def all_stats():
+    """Stats of every pool in this process"""
+    return [pool.stats() for pool in list(_pools.values()) if pool.pid == os.getpid()]
@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+from . import replicas
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Serve the read-only views named in REPLICA_READ_VIEWS from a healthy
+    read replica.
+
+    A successful write through any other view sets a short-lived cookie
+    that pins the client to the primary for REPLICA_PIN_SECONDS, so a user
+    who just posted a review reads it back even while replicas catch up.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        alias = None
+        if request.resolver_match.view_name in settings.REPLICA_READ_VIEWS and not self._pinned(request):
+            alias = replicas.choose()
+        replicas.use(alias)
+
+    def process_response(self, request, response):
+        alias = replicas.current()
+        if alias is not None:
+            connection = connections[alias]
+            # Views turn query errors into 500 responses, so look at the connection
+            if connection.errors_occurred and (connection.connection is None or not connection.is_usable()):
+                replicas.mark_down(alias)
+            replicas.use(None)
+        elif (
+            replicas.aliases()
+            and request.method not in ('GET', 'HEAD', 'OPTIONS')
+            and response.status_code < 400
+            and request.resolver_match is not None
+            and request.resolver_match.view_name not in settings.REPLICA_READ_VIEWS
+        ):
+            pin = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, str(int(time.time() + pin)), max_age=pin,
+                secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def _pinned(self, request):
+        try:
+            return float(request.COOKIES.get(settings.REPLICA_PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,117 @@
+"""
+Read-replica selection and health tracking.
+
+The request's read alias lives in a context variable, set by
+ReplicaRoutingMiddleware and consumed by ReplicaRouter. Each process
+checks its replicas at most every REPLICA_CHECK_INTERVAL seconds (reachable
+and not lagging more than REPLICA_MAX_LAG seconds behind the primary) and
+round-robins reads over the healthy ones.
+"""
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the last replayed transaction; 0 on a standby that has
+# replayed everything it received, or on a server that is not a standby
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_read_alias = ContextVar('foodspots_read_alias', default=None)
+
+_lock = threading.Lock()
+# alias -> (healthy, checked at)
+_state = {}
+_turn = itertools.count()
+
+
+def aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def current():
+    """Alias reads should use, or None for the primary"""
+    return _read_alias.get()
+
+
+def use(alias):
+    """Route this context's reads to `alias` (None for the primary)"""
+    _read_alias.set(alias)
+
+
+def _check(alias):
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            (lag,) = cursor.fetchone()
+    except DatabaseError as e:
+        logger.warning("Replica %s unreachable: %s", alias, str(e).strip())
+        try:
+            connection.close()
+        except DatabaseError:
+            pass
+        return False
+    if float(lag) > settings.REPLICA_MAX_LAG:
+        logger.warning("Replica %s lagging %.1fs behind the primary", alias, float(lag))
+        return False
+    return True
+
+
+def _refresh(replicas):
+    now = time.monotonic()
+    due = [
+        alias for alias in replicas
+        if now - _state.get(alias, (False, float('-inf')))[1] >= settings.REPLICA_CHECK_INTERVAL
+    ]
+    # One thread checks; the others keep using the last known state meanwhile
+    if not due or not _lock.acquire(blocking=False):
+        return
+    try:
+        for alias in due:
+            healthy = _check(alias)
+            previous = _state.get(alias)
+            if previous is not None and previous[0] != healthy:
+                logger.info("Replica %s %s rotation", alias, 'back in' if healthy else 'out of')
+            _state[alias] = (healthy, time.monotonic())
+    finally:
+        _lock.release()
+
+
+def healthy():
+    """Replica aliases currently in rotation"""
+    replicas = aliases()
+    if replicas:
+        _refresh(replicas)
+    return [alias for alias in replicas if _state.get(alias, (False, None))[0]]
+
+
+def choose():
+    """Next healthy replica in round-robin order, or None for the primary"""
+    replicas = healthy()
+    if not replicas:
+        return None
+    return replicas[next(_turn) % len(replicas)]
+
+
+def mark_down(alias):
+    """Take `alias` out of rotation until its next health check"""
+    with _lock:
+        _state[alias] = (False, time.monotonic())
+    logger.warning("Replica %s out of rotation after a failed query", alias)
+
+
+def status():
+    """{alias: healthy or None if not checked yet} for this process"""
+    return {alias: _state.get(alias, (None, None))[0] for alias in aliases()}
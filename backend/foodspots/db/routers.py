@@ -0,0 +1,18 @@
+from . import replicas
+
+
+class ReplicaRouter:
+    """
+    Send reads to the replica picked for the current request, if any
+    (see ReplicaRoutingMiddleware). Writes always go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return replicas.current()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas are copies of the primary, so any two objects can relate
+        return True
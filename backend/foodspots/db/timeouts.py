@@ -0,0 +1,43 @@
+"""
+Per-block statement timeouts that never leak into other requests.
+"""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+# SQLSTATE of a statement cancelled by statement_timeout
+QUERY_CANCELED = '57014'
+
+
+class StatementTimeout(OperationalError):
+    """A statement ran longer than its statement_timeout"""
+
+
+@contextmanager
+def statement_timeout(milliseconds, using=DEFAULT_DB_ALIAS):
+    """
+    Run the block in a transaction whose statements are cancelled after
+    `milliseconds`. The setting is transaction-local (SET LOCAL), so the
+    connection goes back to the pool with its default timeout; inside an
+    outer transaction the previous timeout is restored after the block.
+    Raises StatementTimeout when a statement is cancelled.
+    """
+    connection = connections[using]
+    nested = connection.in_atomic_block
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT current_setting('statement_timeout'), set_config('statement_timeout', %s, true)",
+                [f'{int(milliseconds)}ms'],
+            )
+            previous = cursor.fetchone()[0]
+        try:
+            yield
+        except OperationalError as e:
+            if getattr(e.__cause__, 'pgcode', None) == QUERY_CANCELED:
+                raise StatementTimeout(f'Statement cancelled after {milliseconds} ms') from e
+            raise
+        if nested:
+            # A released savepoint keeps SET LOCAL until the outer transaction ends
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
@@ -0,0 +1,16 @@
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
+
+from . import replicas
+from .backends.postgis_pool.pool import all_stats
+
+
+@require_GET
+def pool_metrics(request):
+    """
+    Connection pool usage and wait times, and replica health, as seen by
+    the process serving the request. Staff only: other users get a 404.
+    """
+    if not request.user.is_staff:
+        raise Http404
+    return JsonResponse({'pools': all_stats(), 'replicas': replicas.status()})
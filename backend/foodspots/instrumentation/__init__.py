@@ -0,0 +1,5 @@
+"""
+Request instrumentation: per-request timing breakdowns (Server-Timing) and
+Prometheus metrics. Everything is opt-in through settings and stays out of
+the request path when disabled.
+"""
@@ -0,0 +1,186 @@
+"""
+Non-blocking logging.
+
+`configure` is used as Django's LOGGING_CONFIG. It applies settings.LOGGING
+with dictConfig and then, if LOGGING has a 'background' section, moves
+each logger's handlers behind a BackgroundHandler. A request thread that
+logs only enqueues the record. Formatting and the console/file writes
+happen on one writer thread per handler set. When the bounded queue is
+full, records are dropped and counted instead of blocking the request.
+
+An optional 'sampling' section ({logger prefix: fraction}) keeps only a
+fraction of the DEBUG/INFO records of high-frequency loggers. Warnings
+and errors are always kept. Sampling runs before enqueueing, so dropped
+records cost one random() call. A record that propagates to several
+queues is kept or dropped by the first one, and counted once.
+
+Log with lazy %-style arguments (`logger.info('Found %s spots', n)`): the
+message is only built if a handler accepts the record, on the writer
+thread. Arguments are formatted after the call returns, so do not mutate
+them afterwards.
+"""
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import weakref
+
+DEFAULT_QUEUE_SIZE = 10_000
+
+_handlers = weakref.WeakSet()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of below-WARNING records, by logger name prefix"""
+
+    def __init__(self, rates):
+        super().__init__()
+        # Longest prefix wins
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._resolved = {}
+        self.sampled_out = 0
+
+    def rate(self, name):
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = next(
+                (rate for prefix, rate in self.rates if name == prefix or name.startswith(prefix + '.')),
+                1.0,
+            )
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        kept = getattr(record, '_sampled_in', None)
+        if kept is None:
+            rate = self.rate(record.name)
+            kept = rate >= 1 or random.random() < rate
+            record._sampled_in = kept
+            if not kept:
+                self.sampled_out += 1
+        return kept
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room: the sentinel must not be dropped like a record
+        self.queue.put(self._sentinel)
+
+
+class BackgroundHandler(logging.handlers.QueueHandler):
+    """Queue in front of `targets`, drained by a writer thread"""
+
+    def __init__(self, targets, queue_size=DEFAULT_QUEUE_SIZE):
+        super().__init__(queue.Queue(queue_size))
+        self.targets = list(targets)
+        for target in self.targets:
+            if not any(isinstance(f, _FlushMarkerFilter) for f in target.filters):
+                # First, so no other filter rejects the marker before it is seen
+                target.filters.insert(0, _FlushMarkerFilter())
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._listener = None
+        self.start()
+        _handlers.add(self)
+
+    def start(self):
+        self._listener = _Listener(self.queue, *self.targets, respect_handler_level=True)
+        self._listener.start()
+
+    def prepare(self, record):
+        # Formatting is left to the target handlers, on the writer thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Wait until every queued record has been written"""
+        if self._listener is None:
+            return
+        done = threading.Event()
+        # Passes the targets' level checks, then is swallowed by _FlushMarkerFilter
+        marker = logging.makeLogRecord({'msg': '', 'levelno': logging.CRITICAL})
+        marker.flushed = done
+        self.queue.put(marker)
+        done.wait(5)
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        super().close()
+
+    def _after_fork(self):
+        # The writer thread does not survive fork; the queue's locks may be held
+        self.queue = queue.Queue(self.queue_size)
+        self.start()
+
+    def stats(self):
+        return {
+            'name': self.name or 'background',
+            'queued': self.queue.qsize(),
+            'dropped': self.dropped,
+            'sampled_out': sum(getattr(f, 'sampled_out', 0) for f in self.filters),
+        }
+
+
+class _FlushMarkerFilter(logging.Filter):
+    """Lets BackgroundHandler.flush() know its marker reached the writer"""
+
+    def filter(self, record):
+        flushed = getattr(record, 'flushed', None)
+        if flushed is not None:
+            flushed.set()
+            return False
+        return True
+
+
+def _after_fork_in_child():
+    for handler in list(_handlers):
+        handler._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def configure(config):
+    """LOGGING_CONFIG callable: dictConfig, then queue the configured handlers"""
+    logging.config.dictConfig(config)
+    background = config.get('background')
+    if background is None:
+        return
+    sampling = config.get('sampling')
+
+    loggers = [logging.getLogger()] + [logging.getLogger(name) for name in config.get('loggers', {})]
+    # Loggers sharing a handler set share one queue and writer thread
+    queued = {}
+    for logger in loggers:
+        if not logger.handlers:
+            continue
+        key = tuple(id(handler) for handler in logger.handlers)
+        handler = queued.get(key)
+        if handler is None:
+            handler = BackgroundHandler(
+                logger.handlers, queue_size=background.get('queue_size', DEFAULT_QUEUE_SIZE),
+            )
+            handler.name = 'background-' + '+'.join(target.name or type(target).__name__ for target in logger.handlers)
+            if sampling:
+                # One filter per queue, so each reports only the records it dropped
+                handler.addFilter(SamplingFilter(sampling))
+            queued[key] = handler
+        logger.handlers = [handler]
+
+
+def stats():
+    """Queue depth, drops and sampled-out counts of this process's background handlers"""
+    return [handler.stats() for handler in list(_handlers)]
@@ -0,0 +1,112 @@
+"""
+Minimal in-process Prometheus registry.
+
+Metrics are per process, like the connection pool stats: with several
+workers, let Prometheus scrape each one or aggregate behind the scrape
+target. Rendering follows the text exposition format 0.0.4.
+"""
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; request phases range from sub-millisecond to multi-second
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def labelset(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} counter'
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f'{self.name}{labelset(self.labels, labels)} {_number(value)}'
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            yield from histogram_lines(self.name, self.labels, labels, self.buckets, counts, total)
+
+
+def histogram_lines(name, label_names, label_values, bounds, counts, total):
+    """Exposition lines for one histogram series from per-bucket (not cumulative) counts"""
+    cumulative = 0
+    for bound, count in zip(tuple(bounds) + (float('inf'),), counts):
+        cumulative += count
+        yield f"{name}_bucket{labelset(label_names, label_values, [('le', _number(bound))])} {cumulative}"
+    yield f'{name}_sum{labelset(label_names, label_values)} {_number(float(total))}'
+    yield f'{name}_count{labelset(label_names, label_values)} {cumulative}'
+
+
+REQUEST_LABELS = ('handler', 'method')
+
+REQUESTS = Counter(
+    'foodspots_requests_total', 'Requests served, by handler, method and status class',
+    labels=REQUEST_LABELS + ('status',),
+)
+REQUEST_SECONDS = Histogram(
+    'foodspots_request_duration_seconds', 'Total request time', labels=REQUEST_LABELS,
+)
+PHASE_SECONDS = Histogram(
+    'foodspots_request_phase_seconds',
+    'Request time by phase: db (SQL), render (response serialization), log (log handlers), app (the rest)',
+    labels=REQUEST_LABELS + ('phase',),
+)
+REQUEST_QUERIES = Histogram(
+    'foodspots_request_queries', 'SQL statements per request', labels=REQUEST_LABELS, buckets=QUERY_BUCKETS,
+)
+
+REGISTRY = [REQUESTS, REQUEST_SECONDS, PHASE_SECONDS, REQUEST_QUERIES]
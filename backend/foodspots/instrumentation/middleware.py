@@ -0,0 +1,136 @@
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics
+
+_current = ContextVar('foodspots_request_timings', default=None)
+
+
+class RequestTimings:
+    """Time and query counters of one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.handler = None
+        self.view_finished = None
+        self.db = 0.0
+        self.queries = 0
+        self.log = 0.0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+    def phases(self, finished):
+        """(total, {phase: seconds}) with the phases adding up to the total"""
+        total = finished - self.started
+        # Template responses (DRF's Response) are rendered after the view returns
+        render = finished - self.view_finished if self.view_finished is not None else 0.0
+        app = max(0.0, total - self.db - render - self.log)
+        return total, {'db': self.db, 'render': render, 'log': self.log, 'app': app}
+
+
+def current():
+    """Timings of the request being served, or None"""
+    return _current.get()
+
+
+def handler_name(request, view_func):
+    """'basename.action' for viewset routes, else the URL name"""
+    actions = getattr(view_func, 'actions', None)
+    if actions:
+        action = actions.get(request.method.lower())
+        basename = getattr(view_func, 'initkwargs', {}).get('basename')
+        if action and basename:
+            return f'{basename}.{action}'
+    match = request.resolver_match
+    return match.view_name if match and match.view_name else 'unmatched'
+
+
+def _timed_handle(handle):
+    def wrapper(record):
+        timings = _current.get()
+        if timings is None:
+            return handle(record)
+        start = time.perf_counter()
+        try:
+            return handle(record)
+        finally:
+            timings.log += time.perf_counter() - start
+    wrapper.timed = True
+    return wrapper
+
+
+def _time_log_handlers():
+    """Charge time spent in logging handlers to the request that logged"""
+    loggers = [logging.getLogger()] + [
+        logger for logger in logging.Logger.manager.loggerDict.values() if isinstance(logger, logging.Logger)
+    ]
+    for logger in loggers:
+        for handler in logger.handlers:
+            if not getattr(handler.handle, 'timed', False):
+                handler.handle = _timed_handle(handler.handle)
+
+
+class RequestMetricsMiddleware:
+    """
+    Per-request SQL, render, logging and total time, sent back as a
+    Server-Timing header and recorded in the Prometheus histograms served
+    at /metrics, labelled with the viewset action.
+
+    Enabled by REQUEST_METRICS; otherwise Django drops the middleware at
+    startup. Keep it last in MIDDLEWARE so `render` covers only response
+    rendering.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _time_log_handlers()
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timings.execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        total, phases = timings.phases(time.perf_counter())
+        labels = (timings.handler or handler_name(request, None), request.method)
+        metrics.REQUESTS.inc(labels + (f'{response.status_code // 100}xx',))
+        metrics.REQUEST_SECONDS.observe(labels, total)
+        metrics.REQUEST_QUERIES.observe(labels, timings.queries)
+        for phase, seconds in phases.items():
+            metrics.PHASE_SECONDS.observe(labels + (phase,), seconds)
+
+        entries = [f'{phase};dur={seconds * 1000:.2f}' for phase, seconds in phases.items()]
+        entries.insert(1, f'queries;desc="{timings.queries} SQL statements"')
+        entries.append(f'total;dur={total * 1000:.2f}')
+        response['Server-Timing'] = ', '.join(entries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = _current.get()
+        if timings is not None:
+            timings.handler = handler_name(request, view_func)
+
+    def process_template_response(self, request, response):
+        timings = _current.get()
+        if timings is not None:
+            timings.view_finished = time.perf_counter()
+        return response
@@ -0,0 +1,233 @@
+"""
+Sampling profiler for slow or explicitly requested requests.
+
+While a request runs, a background thread samples its call stack every
+PROFILING_INTERVAL_MS. Requests slower than PROFILING_SLOW_MS, or carrying
+a valid signed X-Profile-Token header (see `make_token`), have their
+samples written to PROFILING_DIR:
+
+- `<name>.folded`: collapsed stacks ("frame;frame;frame count"), readable
+  by flamegraph.pl, speedscope and inferno. The root frame is the view
+  action, so profiles of the same action can be concatenated.
+- `<name>.json`: request, timing and SQL summary.
+
+Only the newest PROFILING_MAX_FILES profiles are kept. Stacks are those of
+the thread running the request, so async views show up as waiting on the
+event loop; profile them through their sync counterparts.
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .middleware import handler_name
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'X-Profile-Token'
+TOKEN_SALT = 'foodspots.instrumentation.profiling'
+SQL_SUMMARY_SIZE = 10
+
+
+def make_token():
+    """Signed header value that makes a request get profiled"""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def token_valid(token):
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+_labels = {}
+
+
+def _label(code):
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if 'site-packages' in filename:
+            filename = filename.split('site-packages' + os.sep, 1)[-1]
+        elif filename.startswith(str(settings.BASE_DIR)):
+            filename = os.path.relpath(filename, settings.BASE_DIR)
+        label = _labels[code] = f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+    return label
+
+
+def fold(frame):
+    """Collapsed stack of `frame`, outermost call first"""
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """One daemon thread per process sampling the stacks of registered threads"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+
+    def start(self, thread_id):
+        with self._lock:
+            if self._pid != os.getpid():
+                # First use, or inherited across fork without its thread
+                self._pid = os.getpid()
+                self._samples = {}
+                threading.Thread(target=self._run, name='request-profiler', daemon=True).start()
+            self._samples[thread_id] = Counter()
+        self._wake.set()
+
+    def stop(self, thread_id):
+        with self._lock:
+            return self._samples.pop(thread_id, Counter())
+
+    def _run(self):
+        while True:
+            if not self._samples:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                targets = list(self._samples.items())
+            for thread_id, counts in targets:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    counts[fold(frame)] += 1
+
+
+class _SQLSummary:
+    def __init__(self):
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            key = ' '.join(sql.split())[:300]
+            entry = self.statements.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+
+    def summary(self):
+        top = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            'statements': sum(count for count, _ in self.statements.values()),
+            'seconds': round(sum(seconds for _, seconds in self.statements.values()), 6),
+            'top': [
+                {'sql': sql, 'count': count, 'seconds': round(seconds, 6)}
+                for sql, (count, seconds) in top[:SQL_SUMMARY_SIZE]
+            ],
+        }
+
+
+_write_lock = threading.Lock()
+
+
+def _rotate(directory, keep):
+    profiles = sorted(directory.glob('*.folded'), key=lambda path: path.stat().st_mtime)
+    for path in profiles[:max(0, len(profiles) - keep)]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.json').unlink(missing_ok=True)
+
+
+def write_profile(samples, info):
+    """Write a profile pair to PROFILING_DIR and return the .folded path"""
+    directory = Path(settings.PROFILING_DIR)
+    started_at = info['started_at']
+    stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(started_at)) + f'.{int(started_at * 1000) % 1000:03d}'
+    handler = re.sub(r'[^\w.-]', '_', info['handler'])
+    name = f"{stamp}-{handler}-{info['elapsed_ms']:.0f}ms-{os.getpid()}-{threading.get_ident()}"
+    root = info['handler'].replace(';', ':')
+    with _write_lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        folded = directory / f'{name}.folded'
+        with open(folded, 'w') as fh:
+            for stack, count in samples.most_common():
+                fh.write(f'{root};{stack} {count}\n')
+        with open(directory / f'{name}.json', 'w') as fh:
+            json.dump(info, fh, indent=2)
+        _rotate(directory, settings.PROFILING_MAX_FILES)
+    return folded
+
+
+class SlowRequestProfilingMiddleware:
+    """
+    Profile requests slower than PROFILING_SLOW_MS (0 disables the
+    threshold) or carrying a signed X-Profile-Token header. Enabled by
+    PROFILING; otherwise Django drops the middleware at startup.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+
+    def __call__(self, request):
+        requested = TOKEN_HEADER in request.headers and token_valid(request.headers[TOKEN_HEADER])
+        if not requested and not settings.PROFILING_SLOW_MS:
+            return self.get_response(request)
+
+        thread_id = threading.get_ident()
+        sql = _SQLSummary()
+        started_at = time.time()
+        start = time.perf_counter()
+        self.sampler.start(thread_id)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(sql))
+                response = self.get_response(request)
+        finally:
+            samples = self.sampler.stop(thread_id)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if requested or elapsed_ms >= settings.PROFILING_SLOW_MS:
+            info = {
+                'handler': getattr(request, '_profile_handler', None) or handler_name(request, None),
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'trigger': 'header' if requested else 'threshold',
+                'started_at': started_at,
+                'elapsed_ms': round(elapsed_ms, 3),
+                'interval_ms': settings.PROFILING_INTERVAL_MS,
+                'samples': sum(samples.values()),
+                'sql': sql.summary(),
+            }
+            try:
+                path = write_profile(samples, info)
+                logger.warning(
+                    "Profiled %s (%s %s) %.0f ms, %s SQL statements (%.0f ms): %s",
+                    info['handler'], request.method, request.path, elapsed_ms,
+                    info['sql']['statements'], info['sql']['seconds'] * 1000, path.name,
+                )
+            except OSError as e:
+                logger.error("Could not write profile: %s", e)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._profile_handler = handler_name(request, view_func)
@@ -0,0 +1,101 @@
+import ipaddress
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from foodspots.db import replicas
+from foodspots.db.backends.postgis_pool.pool import WAIT_BUCKETS, all_stats
+
+from . import log_pipeline
+from .metrics import CONTENT_TYPE, REGISTRY, histogram_lines, labelset
+
+# Pool stat -> (metric name, type, help)
+POOL_METRICS = {
+    'size': ('foodspots_db_pool_connections', 'gauge', 'Open connections'),
+    'in_use': ('foodspots_db_pool_connections_in_use', 'gauge', 'Connections checked out'),
+    'idle': ('foodspots_db_pool_connections_idle', 'gauge', 'Connections waiting in the pool'),
+    'waiting': ('foodspots_db_pool_waiting', 'gauge', 'Threads waiting for a connection'),
+    'max_size': ('foodspots_db_pool_max_size', 'gauge', 'Pool size limit'),
+    'checkouts': ('foodspots_db_pool_checkouts_total', 'counter', 'Connections handed out'),
+    'waits': ('foodspots_db_pool_waits_total', 'counter', 'Checkouts that had to wait'),
+    'timeouts': ('foodspots_db_pool_timeouts_total', 'counter', 'Checkouts that timed out'),
+    'connections_opened': ('foodspots_db_pool_opened_total', 'counter', 'Connections opened'),
+    'connections_closed': ('foodspots_db_pool_closed_total', 'counter', 'Connections closed'),
+    'health_check_failures': ('foodspots_db_pool_health_check_failures_total', 'counter', 'Failed health checks'),
+}
+
+
+def _pool_lines():
+    pools = all_stats()
+    for key, (name, kind, documentation) in POOL_METRICS.items():
+        yield f'# HELP {name} {documentation}'
+        yield f'# TYPE {name} {kind}'
+        for pool in pools:
+            yield f"{name}{labelset(('alias',), (pool['name'],))} {pool[key]}"
+    name = 'foodspots_db_pool_wait_seconds'
+    yield f'# HELP {name} Time to check out a connection'
+    yield f'# TYPE {name} histogram'
+    for pool in pools:
+        counts = list(pool['wait_histogram'].values())
+        yield from histogram_lines(
+            name, ('alias',), (pool['name'],), WAIT_BUCKETS[:-1], counts, pool['wait_seconds_total'],
+        )
+
+
+def _replica_lines():
+    status = replicas.status()
+    if not status:
+        return
+    yield '# HELP foodspots_db_replica_up Replica in rotation (1) or not (0)'
+    yield '# TYPE foodspots_db_replica_up gauge'
+    for alias, healthy in status.items():
+        yield f"foodspots_db_replica_up{labelset(('alias',), (alias,))} {1 if healthy else 0}"
+
+
+# Background log handler stat -> (metric name, type, help)
+LOG_METRICS = {
+    'queued': ('foodspots_log_queue_depth', 'gauge', 'Log records waiting for the writer thread'),
+    'dropped': ('foodspots_log_records_dropped_total', 'counter', 'Log records dropped on a full queue'),
+    'sampled_out': ('foodspots_log_records_sampled_out_total', 'counter', 'Log records skipped by sampling'),
+}
+
+
+def _log_lines():
+    handlers = log_pipeline.stats()
+    for key, (name, kind, documentation) in LOG_METRICS.items():
+        yield f'# HELP {name} {documentation}'
+        yield f'# TYPE {name} {kind}'
+        for handler in handlers:
+            yield f"{name}{labelset(('handler',), (handler['name'],))} {handler[key]}"
+
+
+def _allowed(request):
+    """Staff users and clients inside METRICS_ALLOWED_IPS"""
+    if request.user.is_staff:
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in settings.METRICS_ALLOWED_IPS
+    )
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus metrics of the process serving the request. Mounted only with
+    METRICS_ENDPOINT; clients outside METRICS_ALLOWED_IPS get a 404.
+    """
+    if not _allowed(request):
+        raise Http404
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(_pool_lines())
+    lines.extend(_replica_lines())
+    lines.extend(_log_lines())
+    return HttpResponse('\n'.join(lines) + '\n', content_type=CONTENT_TYPE)
@@ -22,13 +22,16 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.gis',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_gis',
     'corsheaders',
-    'foodspots.apps.locations',
+    'foodspots.apps.locations.app.LocationsConfig',
 ]
 
 MIDDLEWARE = [
+    # Outermost, so profiles cover the whole middleware stack
+    'foodspots.instrumentation.profiling.SlowRequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -37,8 +40,26 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'foodspots.db.middleware.ReplicaRoutingMiddleware',
+    # Innermost, so its render timing excludes other middleware
+    'foodspots.instrumentation.middleware.RequestMetricsMiddleware',
 ]
 
+# Server-Timing headers and request histograms on /metrics (foodspots/instrumentation)
+REQUEST_METRICS = config('REQUEST_METRICS', default=False, cast=bool)
+# The /metrics endpoint is only mounted when enabled, and then answers only
+# these client addresses or networks (and staff users)
+METRICS_ENDPOINT = config('METRICS_ENDPOINT', default=False, cast=bool)
+METRICS_ALLOWED_IPS = [ip.strip() for ip in config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1').split(',') if ip.strip()]
+
+# Sampling profiles of slow requests, or of requests with a signed X-Profile-Token
+# header (`manage.py profile_token`), written to logs/profiles (foodspots/instrumentation/profiling.py)
+PROFILING = config('PROFILING', default=False, cast=bool)
+PROFILING_SLOW_MS = config('PROFILING_SLOW_MS', default=1000, cast=int)  # 0: header-triggered only
+PROFILING_INTERVAL_MS = config('PROFILING_INTERVAL_MS', default=5, cast=int)
+PROFILING_MAX_FILES = config('PROFILING_MAX_FILES', default=200, cast=int)
+PROFILING_TOKEN_MAX_AGE = config('PROFILING_TOKEN_MAX_AGE', default=3600, cast=int)
+
 ROOT_URLCONF = 'foodspots.urls'
 
 TEMPLATES = [
@@ -58,17 +79,71 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'foodspots.wsgi.application'
+ASGI_APPLICATION = 'foodspots.asgi.application'
 
 # Database
+# With DB_POOL each process keeps a bounded, health-checked connection pool
+# (foodspots/db/backends/postgis_pool); Django hands its connection back to
+# the pool after every request, so CONN_MAX_AGE must be 0. Opt-in: the reset
+# and health check add two round trips to every request.
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.contrib.gis.db.backends.postgis',
+        'ENGINE': 'foodspots.db.backends.postgis_pool' if DB_POOL else 'django.contrib.gis.db.backends.postgis',
         'NAME': config('DB_NAME', default='foodspots_db'),
         'USER': config('DB_USER', default='postgres'),
         'PASSWORD': config('DB_PASSWORD', default='postgres123'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
-        'CONN_MAX_AGE': 600,  # Connection pooling
+        # Persistent connections without the pool; set DB_CONN_MAX_AGE=0 when serving through ASGI
+        'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'POOL': {
+            'MIN_SIZE': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'MAX_SIZE': config('DB_POOL_MAX_SIZE', default=20, cast=int),
+            'TIMEOUT': config('DB_POOL_TIMEOUT', default=10.0, cast=float),
+            'MAX_IDLE': config('DB_POOL_MAX_IDLE', default=300.0, cast=float),
+            'MAX_LIFETIME': config('DB_POOL_MAX_LIFETIME', default=3600.0, cast=float),
+        },
+    }
+}
+
+# Read replicas: comma-separated host[:port] list, same credentials as the primary.
+# The views in REPLICA_READ_VIEWS read from healthy replicas (foodspots/db/replicas.py).
+DATABASE_REPLICAS = []
+for index, address in enumerate(filter(None, config('DB_REPLICAS', default='').split(',')), start=1):
+    host, _, port = address.strip().partition(':')
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        # Fail fast so an unreachable replica drops out of rotation quickly
+        'OPTIONS': {'connect_timeout': config('DB_REPLICA_CONNECT_TIMEOUT', default=2, cast=int)},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['foodspots.db.routers.ReplicaRouter']
+REPLICA_READ_VIEWS = {
+    'foodspot-list', 'foodspot-nearest', 'foodspot-nearest-batch', 'foodspot-within-radius',
+    'foodspot-within-bounds', 'foodspot-along-route', 'foodspot-clusters', 'foodspot-heatmap', 'foodspot-search',
+    'foodspot-statistics', 'async-foodspot-nearest', 'async-foodspot-nearest-batch',
+    'async-foodspot-within-radius', 'async-foodspot-within-bounds', 'async-foodspot-along-route',
+}
+# Replicas further behind the primary, or unreachable, leave the rotation
+REPLICA_MAX_LAG = config('DB_REPLICA_MAX_LAG', default=5.0, cast=float)
+REPLICA_CHECK_INTERVAL = config('DB_REPLICA_CHECK_INTERVAL', default=5.0, cast=float)
+# After a write the client reads from the primary this long (keep above the max lag)
+REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=15, cast=int)
+REPLICA_PIN_COOKIE = 'db_primary_until'
+
+# Cache (per-process; point at a shared backend such as Redis when scaling out)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'foodspots',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
     }
 }
 
@@ -110,7 +185,7 @@ CORS_ALLOWED_ORIGINS = [
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'foodspots.apps.locations.renderers.FastJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -121,11 +196,31 @@ REST_FRAMEWORK = {
         'rest_framework.throttling.UserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '100/hour',
-        'user': '1000/hour'
+        'anon': config('API_ANON_RATE', default='100/hour'),
+        'user': config('API_USER_RATE', default='1000/hour')
     }
 }
 
+# Spatial engine for nearest/within_radius: 'postgis' or 'memory'
+# ('memory' keeps a per-worker grid snapshot, reloaded when data changes)
+SPATIAL_ENGINE = config('SPATIAL_ENGINE', default='postgis')
+SPATIAL_SNAPSHOT_CHECK_SECONDS = config('SPATIAL_SNAPSHOT_CHECK_SECONDS', default=2.0, cast=float)
+
+# Polygon searches (within_bounds) are cancelled after this long (see locations/spatial.py)
+POLYGON_STATEMENT_TIMEOUT_MS = config('POLYGON_STATEMENT_TIMEOUT_MS', default=2000, cast=int)
+# Route corridor searches (along_route) likewise
+ROUTE_STATEMENT_TIMEOUT_MS = config('ROUTE_STATEMENT_TIMEOUT_MS', default=2000, cast=int)
+# Hand-written SQL of statistics, clusters, heatmap and nearest_batch, on the read database
+READ_STATEMENT_TIMEOUT_MS = config('READ_STATEMENT_TIMEOUT_MS', default=5000, cast=int)
+
+# Local time of the spots' opening hours, for open_now / open_at filters (see locations/hours.py)
+OPENING_HOURS_TIME_ZONE = config('OPENING_HOURS_TIME_ZONE', default='Europe/Dublin')
+
+# Vector tile cache (see locations/tiles.py)
+TILE_CACHE_DIR = config('TILE_CACHE_DIR', default=str(BASE_DIR / 'tile_cache'))
+# Days of SpotChange log kept by prune_tile_changes
+TILE_CHANGE_RETENTION_DAYS = config('TILE_CHANGE_RETENTION_DAYS', default=7, cast=int)
+
 # Security Settings (Production)
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -139,6 +234,16 @@ if not DEBUG:
     SECURE_HSTS_PRELOAD = True
 
 # Logging
+# Handlers sit behind a queue drained by a writer thread (foodspots/instrumentation/log_pipeline.py).
+# Every worker process appends to the same file, so none of them may rotate it: an external
+# logrotate (see docker/logrotate.conf) moves it and WatchedFileHandler reopens the new file.
+LOG_FILE_HANDLER = {
+    'class': 'logging.handlers.WatchedFileHandler',
+    'formatter': 'verbose',
+    'filename': BASE_DIR / 'logs' / 'django.log',
+}
+
+LOGGING_CONFIG = 'foodspots.instrumentation.log_pipeline.configure'
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -153,11 +258,16 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
-        'file': {
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'logs' / 'django.log',
-            'formatter': 'verbose',
-        },
+        'file': LOG_FILE_HANDLER,
+    },
+    'background': {
+        'queue_size': config('LOG_QUEUE_SIZE', default=10000, cast=int),
+    },
+    # Fraction of DEBUG/INFO records kept per logger, e.g.
+    # LOG_SAMPLING=foodspots.apps.locations.views=0.1,foodspots.apps.locations.async_views=0.1
+    'sampling': {
+        name.strip(): float(rate)
+        for name, _, rate in (item.partition('=') for item in config('LOG_SAMPLING', default='').split(',') if item)
     },
     'root': {
         'handlers': ['console', 'file'],
@@ -177,5 +287,7 @@ LOGGING = {
     },
 }
 
+PROFILING_DIR = BASE_DIR / 'logs' / 'profiles'
+
 # Create logs directory
 os.makedirs(BASE_DIR / 'logs', exist_ok=True)
\ No newline at end of file
@@ -7,12 +7,20 @@ from django.views.generic import TemplateView
 from django.conf import settings
 from django.conf.urls.static import static
 
+from foodspots.db.views import pool_metrics
+from foodspots.instrumentation.views import metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/metrics/db-pool/', pool_metrics, name='db-pool-metrics'),
     path('api/', include('foodspots.apps.locations.urls')),
     path('', TemplateView.as_view(template_name='index.html'), name='home'),
 ]
 
+# Prometheus scrape endpoint, only when enabled (see instrumentation/views.py)
+if settings.METRICS_ENDPOINT:
+    urlpatterns.insert(1, path('metrics', metrics, name='metrics'))
+
 # Serve static files in development
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -9,8 +9,10 @@ let distanceLines = [];
 let favorites = new Set();
 let currentSpots = [];
 let sortOrder = 'default';
+let nextSpotsUrl = null;
 
 const API_BASE = '/api';
+const SPOTS_PAGE_SIZE = 100;
 const STORAGE_KEY_FAVORITES = 'foodspots_favorites';
 const STORAGE_KEY_DARKMODE = 'foodspots_darkmode';
 
@@ -75,20 +77,19 @@ async function loadAllFoodSpots() {
     try {
         console.log('🔍 Loading all food spots...');
         const cuisineFilter = document.getElementById('cuisineFilter').value;
-        let url = `${API_BASE}/foodspots/`;
-        if (cuisineFilter) url += `?cuisine_type=${cuisineFilter}`;
+        let url = `${API_BASE}/foodspots/?page_size=${SPOTS_PAGE_SIZE}`;
+        if (cuisineFilter) url += `&cuisine_type=${cuisineFilter}`;
         
-        const response = await fetch(url);
-        if (!response.ok) throw new Error(`HTTP ${response.status}`);
-        
-        const spots = await response.json();
-        console.log(`✅ Loaded ${spots.length} food spots`);
+        // Only the first page; the rest is fetched on demand by loadMoreFoodSpots
+        const page = await fetchPage(url);
+        console.log(`✅ Loaded ${page.results.length} food spots`);
         
-        currentSpots = spots;
+        currentSpots = page.results;
+        setNextSpotsUrl(page.next);
         applyFilters();
         
-        if (Array.isArray(spots) && spots.length > 0) {
-            document.getElementById('totalSpots').textContent = spots.length;
+        if (currentSpots.length > 0) {
+            document.getElementById('totalSpots').textContent = currentSpots.length;
         } else {
             updateResultsInfo('No food spots available');
         }
@@ -100,6 +101,38 @@ async function loadAllFoodSpots() {
     }
 }
 
+async function loadMoreFoodSpots() {
+    if (!nextSpotsUrl) return;
+    const button = document.getElementById('moreSpotsBtn');
+    button.disabled = true;
+    try {
+        const page = await fetchPage(nextSpotsUrl);
+        console.log(`✅ Loaded ${page.results.length} more food spots`);
+        currentSpots = currentSpots.concat(page.results);
+        setNextSpotsUrl(page.next);
+        applyFilters();
+        document.getElementById('totalSpots').textContent = currentSpots.length;
+    } catch (error) {
+        console.error('❌ Error loading more food spots:', error);
+        showToast('Failed to load more food spots', 'error');
+    } finally {
+        button.disabled = false;
+    }
+}
+
+// One page of a cursor-paginated list
+async function fetchPage(url) {
+    const response = await fetch(url);
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return response.json();
+}
+
+// Remember the cursor of the browse list; searches replace the list and pass null
+function setNextSpotsUrl(url) {
+    nextSpotsUrl = url;
+    document.getElementById('moreSpotsBtn').classList.toggle('d-none', !url);
+}
+
 // ============================================
 // Search Functions
 // ============================================
@@ -134,6 +167,7 @@ async function searchByName() {
         console.log(`✅ Found ${results.length} results`);
         
         currentSpots = results;
+        setNextSpotsUrl(null);
         applyFilters();
         
         if (results.length === 0) {
@@ -388,6 +422,7 @@ async function findNearest() {
         console.log(`✅ Found ${results.length} nearest spots`);
         
         currentSpots = results;
+        setNextSpotsUrl(null);
         applyFilters();
         
         if (Array.isArray(results) && results.length > 0) {
@@ -464,6 +499,7 @@ async function searchWithinRadius() {
         }).addTo(map);
         
         currentSpots = results;
+        setNextSpotsUrl(null);
         applyFilters();
         
         if (Array.isArray(results) && results.length > 0) {
@@ -565,6 +601,7 @@ async function searchWithinBounds() {
         console.log(`✅ Found ${results.length} spots within bounds`);
         
         currentSpots = results;
+        setNextSpotsUrl(null);
         applyFilters();
         
         if (Array.isArray(results) && results.length > 0) {
@@ -960,6 +997,8 @@ function initEventListeners() {
         if (e.key === 'Enter') searchByName();
     });
     
+    document.getElementById('moreSpotsBtn').addEventListener('click', loadMoreFoodSpots);
+    
     // Filters
     document.getElementById('cuisineFilter').addEventListener('change', () => {
         if (userLocation) {
@@ -1031,10 +1070,11 @@ async function showReviews(foodspotId, foodspotName) {
     modal.show();
     
     try {
-        // Load reviews
+        // Load the first page of reviews
         const response = await fetch(`${API_BASE}/foodspots/${foodspotId}/reviews/`);
         if (!response.ok) throw new Error('Failed to load reviews');
-        const reviews = await response.json();
+        const page = await response.json();
+        const reviews = page.results;
         
         // Build reviews HTML
         let reviewsHTML = '';
@@ -1042,24 +1082,13 @@ async function showReviews(foodspotId, foodspotName) {
         if (reviews.length === 0) {
             reviewsHTML = '<p class="text-muted text-center py-3">No reviews yet. Be the first to review!</p>';
         } else {
-            reviewsHTML = reviews.map(review => `
-                <div class="card mb-3">
-                    <div class="card-body">
-                        <div class="d-flex justify-content-between align-items-start mb-2">
-                            <div>
-                                <h6 class="card-title mb-0">${review.reviewer_name}</h6>
-                                <small class="text-muted">${formatDate(review.created_at)}</small>
-                            </div>
-                            <div class="text-warning">
-                                ${generateStars(review.rating)}
-                            </div>
-                        </div>
-                        <p class="card-text">${escapeHtml(review.comment)}</p>
-                    </div>
-                </div>
-            `).join('');
+            reviewsHTML = reviews.map(renderReview).join('');
         }
         
+        const moreHTML = page.next
+            ? `<button type="button" class="btn btn-outline-secondary btn-sm w-100" id="moreReviewsBtn">Load more reviews</button>`
+            : '';
+        
         // Add review form
         const formHTML = `
             <hr class="my-4">
@@ -1103,9 +1132,29 @@ async function showReviews(foodspotId, foodspotName) {
             <div id="reviewsList">
                 ${reviewsHTML}
             </div>
+            ${moreHTML}
             ${formHTML}
         `;
         
+        if (page.next) {
+            let nextUrl = page.next;
+            const moreBtn = document.getElementById('moreReviewsBtn');
+            moreBtn.addEventListener('click', async function() {
+                try {
+                    const moreResponse = await fetch(nextUrl);
+                    if (!moreResponse.ok) throw new Error('Failed to load reviews');
+                    const morePage = await moreResponse.json();
+                    document.getElementById('reviewsList')
+                        .insertAdjacentHTML('beforeend', morePage.results.map(renderReview).join(''));
+                    nextUrl = morePage.next;
+                    if (!nextUrl) moreBtn.remove();
+                } catch (error) {
+                    console.error('❌ Error loading more reviews:', error);
+                    showToast('Failed to load more reviews', 'error');
+                }
+            });
+        }
+        
         // Character counter
         document.getElementById('reviewComment').addEventListener('input', function() {
             document.getElementById('charCount').textContent = this.value.length;
@@ -1117,6 +1166,25 @@ async function showReviews(foodspotId, foodspotName) {
     }
 }
 
+function renderReview(review) {
+    return `
+        <div class="card mb-3">
+            <div class="card-body">
+                <div class="d-flex justify-content-between align-items-start mb-2">
+                    <div>
+                        <h6 class="card-title mb-0">${review.reviewer_name}</h6>
+                        <small class="text-muted">${formatDate(review.created_at)}</small>
+                    </div>
+                    <div class="text-warning">
+                        ${generateStars(review.rating)}
+                    </div>
+                </div>
+                <p class="card-text">${escapeHtml(review.comment)}</p>
+            </div>
+        </div>
+    `;
+}
+
 async function submitReview(event, foodspotId) {
     event.preventDefault();
     
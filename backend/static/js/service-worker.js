@@ -1,6 +1,6 @@
 // Service Worker for Food Spots Finder PWA
 const CACHE_NAME = 'foodspots-v1.0.0';
-const RUNTIME_CACHE = 'foodspots-runtime-v1.0.0';
+const RUNTIME_CACHE = 'foodspots-runtime-v1.1.0';
 
 // Assets to cache on install
 const STATIC_ASSETS = [
@@ -72,6 +72,11 @@ self.addEventListener('fetch', (event) => {
     return;
   }
 
+  // Bulk exports stream straight to the caller, never through the cache
+  if (url.pathname.startsWith('/api/foodspots/export/')) {
+    return;
+  }
+
   // Strategy: Cache First for static assets, Network First for API
   if (request.url.includes('/static/') || request.url.includes('/media/')) {
     // Static assets - Cache First
@@ -92,6 +97,40 @@ self.addEventListener('fetch', (event) => {
           });
         })
     );
+  } else if (url.pathname.startsWith('/api/') && request.method === 'GET') {
+    // Read-only API endpoints - revalidate the cached copy with its ETag,
+    // so unchanged data costs a 304 instead of a full download
+    event.respondWith(
+      caches.open(RUNTIME_CACHE).then((cache) => {
+        return cache.match(request).then((cached) => {
+          const headers = new Headers(request.headers);
+          const etag = cached && cached.headers.get('ETag');
+          if (etag) {
+            headers.set('If-None-Match', etag);
+          }
+          return fetch(request.url, { headers: headers, credentials: request.credentials })
+            .then((response) => {
+              if (response.status === 304 && cached) {
+                return cached;
+              }
+              if (response.status === 200) {
+                cache.put(request, response.clone());
+              }
+              return response;
+            })
+            .catch(() => {
+              // Network failed, serve the cached copy
+              return cached || new Response(
+                JSON.stringify({ error: 'Offline - No cached data available' }),
+                {
+                  status: 503,
+                  headers: { 'Content-Type': 'application/json' }
+                }
+              );
+            });
+        });
+      })
+    );
   } else if (url.pathname.startsWith('/api/')) {
     // API endpoints - Network First with cache fallback
     event.respondWith(